@@ -3,7 +3,13 @@
 Benchmark con pyperplan para el Ejercicio 1.3.
 
 Ejecuta pyperplan con distintas combinaciones de algoritmos y heurísticas,
-midiendo tiempos y recogiendo resultados. Genera tablas en formato Markdown.
+midiendo tiempos y recogiendo resultados. Cada ejecución se guarda en el
+almacén de resultados (planificador/runs.py, benchmark "P1-Ej3") y las tablas
+en formato Markdown de summary.txt son consultas sobre esa sesión. Las
+estadísticas de búsqueda de la salida de pyperplan (searchstats.py: nodos
+expandidos, nodos/s, tiempo de instanciación y de búsqueda) van en cada tabla.
+Cada plan válido se guarda también como serie anytime (anytime.py: un solo
+plan) y la tabla de la Parte 2 añade su score frente al plan más corto.
 
 Algoritmos de pyperplan:
     - bfs: Breadth First Search
@@ -26,11 +32,10 @@ Uso:
     python3 benchmark.py
 """
 
+import re
 import subprocess
-import time
 import os
 import sys
-from pathlib import Path
 
 # ─── Configuración ───────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -44,9 +49,19 @@ SUMMARY_FILE = os.path.join(RESULTS_DIR, "summary.txt")
 # Ruta a pyperplan (puede estar en ~/.local/bin)
 PYPERPLAN = os.path.expanduser("~/planutils-venv/bin/pyperplan")
 
+# Validador de planes del planificador propio
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "planificador"))
+import anytime
+import searchstats
+from runs import Store, run_command
+from validate import validate_plan
+
 # Buffer para el resumen
 summary_lines = []
 
+# Sesión del almacén de resultados (se abre en main)
+store = None
+
 
 def log(text=""):
     """Imprime en consola y guarda en el buffer de resumen."""
@@ -61,6 +76,11 @@ def save_summary():
     print(f"\n📄 Resumen guardado en: {SUMMARY_FILE}")
 
 
+def config_name(search, heuristic=None):
+    """Configuración de pyperplan tal como se guarda en el almacén."""
+    return f"{search}+{heuristic}" if heuristic else search
+
+
 def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save_plan_to=None):
     """
     Ejecuta pyperplan y devuelve un diccionario con los resultados.
@@ -73,8 +93,34 @@ def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save
         timeout: tiempo máximo en segundos
         save_plan_to: ruta donde guardar el archivo de plan (opcional)
     
-    Returns: {solved, time, plan_length, stdout, stderr}
+    Returns: {solved, valid, time, plan_length, stdout, stderr}
+    Un problema solo cuenta como resuelto si el plan es válido (validate.py).
+    La ejecución queda en el almacén (store) con su CPU y pico de memoria.
     """
+    result = _run_pyperplan(domain, problem, search, heuristic, timeout, save_plan_to)
+    if store is not None:
+        size = re.search(r"size(\d+)", os.path.basename(problem))
+        if result["solved"]:
+            status = "ok"
+        elif result["plan_length"] > 0:
+            status = "inválido"
+        else:
+            status = "tiempo" if result["stderr"] == "TIMEOUT" else "sin plan"
+        # pyperplan escribe su registro (nodos, tiempos) en stderr
+        stats, series = {}, []
+        if "cpu" in result:
+            output = result["stdout"] + result["stderr"]
+            stats = searchstats.parse("pyperplan", output, result["time"])
+            if result["solved"]:
+                series = anytime.pyperplan(output, result["time"])
+        store.add("pyperplan", config_name(search, heuristic), problem, status,
+                  {"size": int(size.group(1))} if size else None, wall=result["time"],
+                  cpu=result.get("cpu"), rss=result.get("rss"), length=result["plan_length"] or None,
+                  stats=stats, series=series)
+    return result
+
+
+def _run_pyperplan(domain, problem, search, heuristic, timeout, save_plan_to):
     # Construir comando
     cmd = [PYPERPLAN]
     
@@ -94,16 +140,15 @@ def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save
         except:
             pass
 
-    start = time.time()
     try:
-        result = subprocess.run(
+        result = run_command(
             cmd,
-            capture_output=True,
-            text=True,
             timeout=timeout,
             cwd=os.path.dirname(problem)  # Ejecutar en el directorio del problema
         )
-        elapsed = time.time() - start
+        if result["timeout"]:
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        elapsed = result["wall"]
 
         # Leer el plan generado
         plan_length = 0
@@ -133,15 +178,19 @@ def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save
             except:
                 pass
 
-        # Comprobar si se resolvió
-        solved = plan_length > 0
+        # Comprobar si se resolvió con un plan válido
+        valid = plan_length > 0 and validate_plan(domain, problem, plan_lines)["valid"]
+        solved = valid
 
         return {
             "solved": solved,
+            "valid": valid,
             "time": round(elapsed, 3),
             "plan_length": plan_length,
-            "stdout": result.stdout,
-            "stderr": result.stderr
+            "stdout": result["stdout"],
+            "stderr": result["stderr"],
+            "cpu": result["cpu"],
+            "rss": result["rss"]
         }
 
     except subprocess.TimeoutExpired:
@@ -153,6 +202,7 @@ def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save
                 pass
         return {
             "solved": False,
+            "valid": False,
             "time": timeout,
             "plan_length": 0,
             "stdout": "",
@@ -161,6 +211,7 @@ def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save
     except Exception as e:
         return {
             "solved": False,
+            "valid": False,
             "time": 0,
             "plan_length": 0,
             "stdout": "",
@@ -192,17 +243,35 @@ def find_max_solvable(domain, sizes, search, heuristic, label, timeout=TIMEOUT,
         result = run_pyperplan(domain, problem, search, heuristic, timeout, save_plan_to)
 
         if result["solved"]:
-            print(f"✅ {result['time']}s, plan={result['plan_length']} acciones")
+            print(f"✅ {result['time']}s, plan={result['plan_length']} acciones, VALID")
             max_size = size
             max_result = result
         else:
-            reason = "TIMEOUT" if result["time"] >= timeout else "FALLO"
+            if result["plan_length"] > 0:
+                reason = "INVALID"
+            else:
+                reason = "TIMEOUT" if result["time"] >= timeout else "FALLO"
             print(f"❌ {reason} ({result['time']}s)")
             break  # Si no resuelve este tamaño, los mayores tampoco
 
     return max_size, max_result
 
 
+def status_cell(run):
+    """Tiempo de una ejecución del almacén, o el motivo si no se resolvió."""
+    if run["status"] == "ok":
+        return round(run["wall"], 3)
+    return {"inválido": "INVALID", "tiempo": "TIMEOUT"}.get(run["status"], "FALLO")
+
+
+def anytime_scores(runs):
+    """Score anytime (anytime.py) de cada ejecución frente al plan más corto de la tabla."""
+    lengths = [run["length"] for run in runs if run["status"] == "ok"]
+    reference = min(lengths) if lengths else None
+    return [f"{anytime.profile(run['extra'].get('series', []), TIMEOUT, reference)['score']:.3f}"
+            if run["status"] == "ok" else "-" for run in runs]
+
+
 def print_markdown_table(headers, rows):
     """Imprime una tabla en formato Markdown y la guarda en el resumen."""
     col_widths = [len(h) for h in headers]
@@ -256,18 +325,22 @@ def parte1(sizes):
         
         max_size, result = find_max_solvable(DOMAIN, sizes, search, heuristic, label, output_dir=output_dir)
 
-        if result:
-            rows.append([label, max_size, result["time"], result["plan_length"], optimal])
-        else:
-            rows.append([label, 0, "-", "-", optimal])
-
         results_p1[label] = (max_size, result)
 
+    # La tabla se consulta en el almacén: mayor tamaño resuelto de cada configuración
+    for search, heuristic, label, optimal, _ in configs:
+        run = store.largest(config_name(search, heuristic))
+        if run:
+            rows.append([label, run["params"]["size"], round(run["wall"], 3), run["length"], optimal]
+                        + searchstats.cells(run["extra"].get("stats")))
+        else:
+            rows.append([label, 0, "-", "-", optimal] + searchstats.cells(None))
+
     log(f"\n{'─' * 70}")
     log("TABLA PARTE 1: Mayor tamaño resuelto en < 1 minuto")
     log(f"{'─' * 70}")
     print_markdown_table(
-        ["Algoritmo", "Max Tamaño", "Tiempo (s)", "Acciones Plan", "Óptimo"],
+        ["Algoritmo", "Max Tamaño", "Tiempo (s)", "Acciones Plan", "Óptimo"] + searchstats.CELL_HEADERS,
         rows
     )
     print(f"\n📁 Planes guardados en: {parte1_dir}")
@@ -315,6 +388,7 @@ def parte2(sizes, results_p1):
     ]
 
     rows = []
+    runs = []
     for search, heuristic, label, folder_name in configs:
         print(f"  {label}...", end=" ", flush=True)
 
@@ -326,19 +400,22 @@ def parte2(sizes, results_p1):
 
         result = run_pyperplan(DOMAIN, problem_file, search, heuristic, save_plan_to=save_plan_to)
 
+        run = store.last(config_name(search, heuristic))
         if result["solved"]:
-            print(f"✅ {result['time']}s, plan={result['plan_length']}")
-            rows.append([label, result["time"], result["plan_length"]])
+            print(f"✅ {result['time']}s, plan={result['plan_length']}, VALID")
         else:
-            reason = "TIMEOUT" if result["time"] >= TIMEOUT else "FALLO"
-            print(f"❌ {reason}")
-            rows.append([label, reason, "-"])
+            print(f"❌ {status_cell(run)}")
+        rows.append([label, status_cell(run), run["length"] if run["status"] == "ok" else "-"]
+                    + searchstats.cells(run["extra"].get("stats")))
+        runs.append(run)
+    for row, score in zip(rows, anytime_scores(runs)):
+        row.append(score)
 
     log(f"\n{'─' * 70}")
     log(f"TABLA PARTE 2: Algoritmos satisficing en problema tamaño {gbfs_max}")
     log(f"{'─' * 70}")
     print_markdown_table(
-        ["Algoritmo+Heurística", "Tiempo (s)", "Acciones Plan"],
+        ["Algoritmo+Heurística", "Tiempo (s)", "Acciones Plan"] + searchstats.CELL_HEADERS + ["Score"],
         rows
     )
     print(f"\n📁 Planes guardados en: {parte2_dir}")
@@ -459,19 +536,20 @@ def parte3(sizes, results_p1):
 
         result = run_pyperplan(DOMAIN, problem_file, search, heuristic, save_plan_to=save_plan_to)
 
+        run = store.last(config_name(search, heuristic))
         if result["solved"]:
-            print(f"✅ {result['time']}s, plan={result['plan_length']} acciones")
-            rows.append([label, result["time"], result["plan_length"], "Sí"])
+            print(f"✅ {result['time']}s, plan={result['plan_length']} acciones, VALID")
         else:
-            reason = "TIMEOUT" if result["time"] >= TIMEOUT else "FALLO"
-            print(f"❌ {reason}")
-            rows.append([label, reason, "-", "-"])
+            print(f"❌ {status_cell(run)}")
+        solved = run["status"] == "ok"
+        rows.append([label, status_cell(run), run["length"] if solved else "-", "Sí" if solved else "-"]
+                    + searchstats.cells(run["extra"].get("stats")))
 
     log(f"\n{'─' * 70}")
     log(f"TABLA PARTE 3: Algoritmos óptimos en problema tamaño {astar_max}")
     log(f"{'─' * 70}")
     print_markdown_table(
-        ["Algoritmo", "Tiempo (s)", "Acciones Plan", "Solución Óptima"],
+        ["Algoritmo", "Tiempo (s)", "Acciones Plan", "Solución Óptima"] + searchstats.CELL_HEADERS,
         rows
     )
     print(f"\n📁 Planes guardados en: {parte3_dir}")
@@ -522,6 +600,7 @@ def check_pyperplan():
 
 
 def main():
+    global store
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
     # Verificar pyperplan
@@ -544,9 +623,11 @@ def main():
     print(f"Timeout: {TIMEOUT}s\n")
 
     # Ejecutar las 3 partes
-    results_p1 = parte1(sizes)
-    parte2(sizes, results_p1)
-    parte3(sizes, results_p1)
+    with Store("P1-Ej3") as store:
+        results_p1 = parte1(sizes)
+        parte2(sizes, results_p1)
+        parte3(sizes, results_p1)
+    print(f"🗄  Ejecuciones guardadas en la sesión {store.session} del almacén de resultados")
 
     # Guardar resumen en archivo
     save_summary()
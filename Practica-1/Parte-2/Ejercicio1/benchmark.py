@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
+import re
 import subprocess
-import time
 import os
 import sys
 
@@ -12,7 +12,14 @@ TIMEOUT = 60
 SUMMARY_FILE = os.path.join(RESULTS_DIR, "summary.txt")
 PYPERPLAN= "pyperplan"
 #PYPERPLAN = os.path.expanduser("~/planutils-venv/bin/pyperplan")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "planificador"))
+import anytime
+import searchstats
+from runs import Store, run_command
+from validate import validate_plan
 summary_lines = []
+# Sesión del almacén de resultados (benchmark "P2-Ej1"); las tablas son consultas sobre ella
+store = None
 
 def log(text=""):
     print(text)
@@ -23,7 +30,29 @@ def save_summary():
         f.write("\n".join(summary_lines))
     print(f"\n Resumen guardado en: {SUMMARY_FILE}")
 
+def config_name(search, heuristic=None):
+    return f"{search}+{heuristic}" if heuristic else search
+
+def status_cell(run):
+    if run["status"] == "ok": return round(run["wall"], 3)
+    return {"inválido": "INVALID", "tiempo": "TIMEOUT"}.get(run["status"], "FALLO")
+
 def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save_plan_to=None):
+    res = _run_pyperplan(domain, problem, search, heuristic, timeout, save_plan_to)
+    if store is not None:
+        size = re.search(r"size(\d+)", os.path.basename(problem))
+        status = "ok" if res["solved"] else "inválido" if res["plan_length"] > 0 else res.get("status", "sin plan")
+        # Nodos y tiempos del registro de pyperplan (stderr)
+        stats = searchstats.parse("pyperplan", res["output"], res["time"]) if "output" in res else {}
+        # Un solo plan como serie anytime (anytime.py), para el score de la Parte 2
+        series = anytime.pyperplan(res["output"], res["time"]) if res["solved"] and "output" in res else []
+        store.add("pyperplan", config_name(search, heuristic), problem, status,
+                  {"size": int(size.group(1))} if size else None, wall=res["time"],
+                  cpu=res.get("cpu"), rss=res.get("rss"), length=res["plan_length"] or None, stats=stats,
+                  series=series)
+    return res
+
+def _run_pyperplan(domain, problem, search, heuristic, timeout, save_plan_to):
     cmd = [PYPERPLAN]
     if heuristic: cmd.extend(["-H", heuristic])
     cmd.extend(["-s", search, domain, problem])
@@ -32,11 +61,12 @@ def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save
         try: os.remove(plan_file)
         except OSError: pass
 
-    start = time.time()
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, cwd=os.path.dirname(problem))
-        elapsed = time.time() - start
+        result = run_command(cmd, timeout=timeout, cwd=os.path.dirname(problem))
+        if result["timeout"]: raise subprocess.TimeoutExpired(cmd, timeout)
+        elapsed = result["wall"]
         plan_length = 0
+        plan_lines = []
         
         if os.path.exists(plan_file):
             with open(plan_file) as f:
@@ -51,14 +81,17 @@ def run_pyperplan(domain, problem, search, heuristic=None, timeout=TIMEOUT, save
                         f.write(f"( {action} )\n")
             try: os.remove(plan_file)
             except OSError: pass
-        return {"solved": plan_length > 0, "time": round(elapsed, 3), "plan_length": plan_length}
+        # Solo cuenta como resuelto si el plan es válido
+        valid = plan_length > 0 and validate_plan(domain, problem, plan_lines)["valid"]
+        return {"solved": valid, "valid": valid, "time": round(elapsed, 3), "plan_length": plan_length,
+                "cpu": result["cpu"], "rss": result["rss"], "output": result["stdout"] + result["stderr"]}
     except subprocess.TimeoutExpired:
         if os.path.exists(plan_file):
             try: os.remove(plan_file)
             except OSError: pass
-        return {"solved": False, "time": timeout, "plan_length": 0}
+        return {"solved": False, "valid": False, "time": timeout, "plan_length": 0, "status": "tiempo"}
     except Exception as e:
-        return {"solved": False, "time": 0, "plan_length": 0}
+        return {"solved": False, "valid": False, "time": 0, "plan_length": 0, "status": "error"}
 
 def find_max_solvable(domain, sizes, search, heuristic, timeout=TIMEOUT):
     max_size = 0
@@ -70,6 +103,13 @@ def find_max_solvable(domain, sizes, search, heuristic, timeout=TIMEOUT):
         else: break
     return max_size
 
+def anytime_scores(runs):
+    """Score anytime (anytime.py) de cada ejecución frente al plan más corto de la tabla."""
+    lengths = [run["length"] for run in runs if run["status"] == "ok"]
+    reference = min(lengths) if lengths else None
+    return [f"{anytime.profile(run['extra'].get('series', []), TIMEOUT, reference)['score']:.3f}"
+            if run["status"] == "ok" else "-" for run in runs]
+
 def print_markdown_table(headers, rows):
     col_widths = [len(h) for h in headers]
     for row in rows:
@@ -95,19 +135,24 @@ def parte2(sizes, gbfs_max):
         ("ehs", "hff", "EHC+hFF", "EHC_hFF"), ("ehs", "landmark", "EHC+Landmark", "EHC_Landmark"),
     ]
     rows = []
+    runs = []
     for search, heuristic, label, folder_name in configs:
         print(f"  {label}...", end=" ", flush=True)
         output_dir = os.path.join(parte2_dir, folder_name)
         os.makedirs(output_dir, exist_ok=True)
         res = run_pyperplan(DOMAIN, problem_file, search, heuristic, save_plan_to=os.path.join(output_dir, f"problem_size{gbfs_max}.pddl.plan"))
+        run = store.last(config_name(search, heuristic))
         if res["solved"]:
-            print(f" {res['time']}s, plan={res['plan_length']}")
-            rows.append([label, res["time"], res["plan_length"]])
+            print(f" {res['time']}s, plan={res['plan_length']}, VALID")
         else:
-            reason = "TIMEOUT" if res["time"] >= TIMEOUT else "FALLO"
-            print(f" {reason}")
-            rows.append([label, reason, "-"])
-    print_markdown_table(["Algoritmo+Heurística", "Tiempo (s)", "Acciones Plan"], rows)
+            print(f" {status_cell(run)}")
+        rows.append([label, status_cell(run), run["length"] if run["status"] == "ok" else "-"]
+                    + searchstats.cells(run["extra"].get("stats")))
+        runs.append(run)
+    for row, score in zip(rows, anytime_scores(runs)):
+        row.append(score)
+    print_markdown_table(["Algoritmo+Heurística", "Tiempo (s)", "Acciones Plan"] + searchstats.CELL_HEADERS + ["Score"],
+                         rows)
 
 def parte3(sizes, astar_max):
     log(f"\n\n{'=' * 70}\nPARTE 3 (Ej 1.3.3): Heurísticas para planificadores óptimos\n{'=' * 70}")
@@ -126,26 +171,30 @@ def parte3(sizes, astar_max):
         output_dir = os.path.join(parte3_dir, folder_name)
         os.makedirs(output_dir, exist_ok=True)
         res = run_pyperplan(DOMAIN, problem_file, search, heuristic, save_plan_to=os.path.join(output_dir, f"problem_size{astar_max}.pddl.plan"))
+        run = store.last(config_name(search, heuristic))
         if res["solved"]:
-            print(f" {res['time']}s")
-            rows.append([label, res["time"], res["plan_length"], "Sí"])
+            print(f" {res['time']}s, VALID")
         else:
-            print(f" FALLO/TIMEOUT")
-            rows.append([label, "TIMEOUT", "-", "-"])
-    print_markdown_table(["Algoritmo", "Tiempo (s)", "Acciones Plan", "Solución Óptima"], rows)
+            print(f" {status_cell(run)}")
+        solved = run["status"] == "ok"
+        rows.append([label, status_cell(run), run["length"] if solved else "-", "Sí" if solved else "-"]
+                    + searchstats.cells(run["extra"].get("stats")))
+    print_markdown_table(["Algoritmo", "Tiempo (s)", "Acciones Plan", "Solución Óptima"] + searchstats.CELL_HEADERS, rows)
 
 def main():
+    global store
     os.makedirs(RESULTS_DIR, exist_ok=True)
     sizes = list(range(1, 31))
 
-    print("Calculando topes máximos")
-    gbfs_max = find_max_solvable(DOMAIN, sizes, "gbf", "hmax")
-    astar_max = find_max_solvable(DOMAIN, sizes, "astar", "hmax")
-    gbfs_max = max(1, gbfs_max)
-    astar_max = max(1, astar_max)
+    with Store("P2-Ej1") as store:
+        print("Calculando topes máximos")
+        gbfs_max = find_max_solvable(DOMAIN, sizes, "gbf", "hmax")
+        astar_max = find_max_solvable(DOMAIN, sizes, "astar", "hmax")
+        gbfs_max = max(1, gbfs_max)
+        astar_max = max(1, astar_max)
 
-    parte2(sizes, gbfs_max)
-    parte3(sizes, astar_max)
+        parte2(sizes, gbfs_max)
+        parte3(sizes, astar_max)
     save_summary()
     print(" Benchmark completado.")
 
@@ -1,19 +1,44 @@
 #!/usr/bin/env python3
 import subprocess
 import os
+import re
+import shutil
+import sys
+import tempfile
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "planificador"))
+import anytime
+import searchstats
+from runs import Store, run_command
+from validate import validate_plan
+
 # --- CONFIGURACIÓN ---
 PLANNER_EXE = "./downward.sif"
 DOMAIN = "domainemergencias_costs.pddl"
 PROBLEMS_DIR = "problems2" 
 TIMEOUT = 60
 OUTPUT_FILE = "resultados_benchmark.txt"
+# Sesión del almacén de resultados (benchmark "P2-Ej2"); la tabla es una consulta sobre ella
+store = None
 
 ALIA_SAT = ["metric-ff", "lama-first", "seq-sat-fdss-2", "seq-sat-fd-autotune-2"]
 ALIA_OPT = ["seq-opt-lmcut", "seq-opt-bjolp", "seq-opt-fdss-2"]
 
 def run_planner(problem_path, alias):
+    """Ejecuta alias sobre el problema, guarda la ejecución en store y devuelve (resuelto, coste)."""
+    run = {}
+    success, cost = _run_planner(problem_path, alias, run)
+    if store is not None:
+        size = re.search(r"size(\d+)", os.path.basename(problem_path))
+        status = "ok" if success else {"TIMEOUT": "tiempo", "INVALID": "inválido", "ERROR": "error"}.get(cost, "sin plan")
+        store.add("metric-ff" if alias == "metric-ff" else "fast-downward", alias, problem_path, status,
+                  {"size": int(size.group(1))} if size else None, wall=run.get("wall"), cpu=run.get("cpu"),
+                  rss=run.get("rss"), length=run.get("length"), cost=float(cost) if success else None,
+                  series=run.get("series", []), stats=run.get("stats", {}))
+    return success, cost
+
+def _run_planner(problem_path, alias, run):
     abs_problem = os.path.abspath(problem_path)
     abs_domain = os.path.abspath(DOMAIN)
 
@@ -23,12 +48,29 @@ def run_planner(problem_path, alias):
         cmd = f"planutils run metric-ff {abs_domain} {abs_problem}"
     else:
         # Usamos tu ejecutable .sif para los alias de Downward
-        cmd = f"{PLANNER_EXE} --alias {alias} --overall-time-limit {TIMEOUT}s {abs_domain} {abs_problem}"
+        cmd = f"{os.path.abspath(PLANNER_EXE)} --alias {alias} --overall-time-limit {TIMEOUT}s {abs_domain} {abs_problem}"
     
+    # 2. Ejecutamos capturando TODO (salida estándar y errores). FD deja
+    # sas_plan (o sas_plan.N en los alias anytime) en el directorio de trabajo
+    workdir = tempfile.mkdtemp(prefix="benchmark2_")
     try:
-        # 2. Ejecutamos capturando TODO (salida estándar y errores)
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=TIMEOUT + 10)
-        output = (result.stdout or "") + (result.stderr or "")
+        start = time.time()
+        result = run_command(cmd, shell=True, timeout=TIMEOUT + 10, cwd=workdir)
+        run.update(wall=result["wall"], cpu=result["cpu"], rss=result["rss"])
+        if result["timeout"]:
+            raise subprocess.TimeoutExpired(cmd, TIMEOUT + 10)
+        output = result["stdout"] + result["stderr"]
+        plan_lines = read_plan_lines(alias, output, workdir)
+        run["stats"] = searchstats.parse("metric-ff" if alias == "metric-ff" else "fast-downward", output, result["wall"])
+
+        # Todas las soluciones (instante, coste, longitud), no solo la última
+        if alias == "metric-ff":
+            run["series"] = anytime.metric_ff(output)
+        else:
+            def measure(lines):
+                check = validate_plan(abs_domain, abs_problem, lines)
+                return (check["cost"], check["length"]) if check["valid"] else None
+            run["series"] = anytime.fast_downward(output, workdir, start, measure)
         
         success = False
         cost = "n/a"
@@ -45,6 +87,13 @@ def run_planner(problem_path, alias):
                 success = True
                 if "Plan cost: " in output:
                     cost = output.split("Plan cost: ")[1].split("\n")[0].strip()
+
+        # 4. Solo cuenta como resuelto si el plan es válido; el coste es el recalculado
+        if success:
+            check = validate_plan(abs_domain, abs_problem, plan_lines)
+            success = check["valid"]
+            run["length"] = check["length"]
+            cost = f"{check['cost']:g}" if success else "INVALID"
         
         return success, cost
 
@@ -52,6 +101,22 @@ def run_planner(problem_path, alias):
         return False, "TIMEOUT"
     except Exception:
         return False, "ERROR"
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def read_plan_lines(alias, output, workdir):
+    """Líneas del plan devuelto: stdout de Metric-FF o el último sas_plan de FD."""
+    if alias == "metric-ff":
+        if "found legal plan" not in output:
+            return []
+        body = output.split("found legal plan", 1)[1]
+        return [l for l in body.splitlines() if re.match(r"^\s*(step)?\s*\d+:", l)]
+    plans = sorted((p for p in os.listdir(workdir) if p.startswith("sas_plan")),
+                   key=lambda p: int(p.rsplit(".", 1)[1]) if "." in p else 0)
+    if not plans:
+        return []
+    with open(os.path.join(workdir, plans[-1])) as f:
+        return f.read().splitlines()
 
 def benchmark(title, aliases, file_handle):
     header = f"\n--- {title} ---\n"
@@ -62,28 +127,70 @@ def benchmark(title, aliases, file_handle):
     file_handle.write(header + table_header + separator)
     
     for alias in aliases:
-        best_size = 0
-        last_cost = "n/a"
-        
         for size in range(1, 31):
             prob_file = os.path.join(PROBLEMS_DIR, f"problem_size{size}.pddl")
             if not os.path.exists(prob_file): break
             
             success, cost = run_planner(prob_file, alias)
-            if success:
-                best_size = size
-                last_cost = cost
-            else:
+            if not success:
                 break
         
+        # Mayor tamaño resuelto y su coste, consultados en el almacén
+        run = store.largest(alias)
+        best_size = run["params"]["size"] if run else 0
+        last_cost = f"{run['cost']:g}" if run else "n/a"
         line = f"{alias:<25} | {best_size:<5} | {last_cost:<10}\n"
         print(line, end="")
         file_handle.write(line)
 
+def anytime_profiles(aliases, file_handle):
+    """Perfil anytime de cada alias en su mayor problema resuelto (anytime.py)."""
+    header = "\n--- PERFIL ANYTIME (mayor tamaño resuelto; referencia: mejor coste de la sesión) ---\n"
+    table_header = (f"{'Alias':<25} | {'Size':<5} | {'#Sol':>4} | {'T 1º(s)':>8} | {'Coste 1º':>8} | "
+                    f"{'Mejor':>6} | {f'T {anytime.WITHIN:.0%}(s)':>9} | {'Score':>6}\n")
+    print(header + table_header + "-" * len(table_header) + "\n", end="")
+    file_handle.write(header + table_header + "-" * len(table_header) + "\n")
+    for alias in aliases:
+        run = store.largest(alias)
+        if run is None:
+            line = f"{alias:<25} | {'-':<5} | {'-':>4} | {'-':>8} | {'-':>8} | {'-':>6} | {'-':>9} | {'-':>6}\n"
+        else:
+            series = run["extra"].get("series", [])
+            others = store.query("problem_hash = ? AND status = 'ok'", run["problem_hash"])
+            reference = min([r["cost"] for r in others] + [cost for _, cost, _ in series])
+            p = anytime.profile(series, TIMEOUT, reference)
+            fmt = lambda v, spec: "-" if v is None else format(v, spec)
+            line = (f"{alias:<25} | {run['params']['size']:<5} | {p['solutions']:>4} | {fmt(p['first'], '.2f'):>8} | "
+                    f"{fmt(p['first_cost'], 'g'):>8} | {fmt(p['best'], 'g'):>6} | {fmt(p['within'], '.2f'):>9} | "
+                    f"{p['score']:>6.3f}\n")
+        print(line, end="")
+        file_handle.write(line)
+
+def search_statistics(aliases, file_handle):
+    """Estadísticas de búsqueda (searchstats.py) de cada alias en su mayor problema resuelto."""
+    header = "\n--- ESTADÍSTICAS DE BÚSQUEDA (mayor tamaño resuelto) ---\n"
+    table_header = (f"{'Alias':<25} | {'Size':<5} | {'Operadores':>10} | {'Expandidos':>10} | {'Evaluados':>10} | "
+                    f"{'Nodos/s':>9} | {'Evals/s':>9} | {'T trad.(s)':>10} | {'T búsq.(s)':>10}\n")
+    print(header + table_header + "-" * len(table_header) + "\n", end="")
+    file_handle.write(header + table_header + "-" * len(table_header) + "\n")
+    fmt = lambda v, spec: "-" if v is None else format(v, spec)
+    for alias in aliases:
+        run = store.largest(alias)
+        stats = run["extra"].get("stats", {}) if run else {}
+        size = run["params"]["size"] if run else "-"
+        line = (f"{alias:<25} | {size:<5} | {fmt(stats.get('operators'), 'd'):>10} | "
+                f"{fmt(stats.get('expanded'), 'd'):>10} | {fmt(stats.get('evaluated'), 'd'):>10} | "
+                f"{fmt(stats.get('nodes_per_s'), '.0f'):>9} | {fmt(stats.get('evals_per_s'), '.0f'):>9} | "
+                f"{fmt(stats.get('translate_time'), '.3f'):>10} | {fmt(stats.get('search_time'), '.3f'):>10}\n")
+        print(line, end="")
+        file_handle.write(line)
+
 if __name__ == "__main__":
-    with open(OUTPUT_FILE, "w") as f:
+    with open(OUTPUT_FILE, "w") as f, Store("P2-Ej2") as store:
         f.write(f"BENCHMARK PDDL - {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
         benchmark("EJERCICIO 9: SATISFACCIÓN", ALIA_SAT, f)
         benchmark("EJERCICIO 10: ÓPTIMOS", ALIA_OPT, f)
+        anytime_profiles(ALIA_SAT + ALIA_OPT, f)
+        search_statistics(ALIA_SAT + ALIA_OPT, f)
     
     print(f"\n✅ Resultados guardados en: {OUTPUT_FILE}")
\ No newline at end of file
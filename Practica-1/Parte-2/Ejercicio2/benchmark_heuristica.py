@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la heurística de dominio "emergencias" frente a lmcut.
+
+Para cada configuración busca el mayor problema de problems2 que se resuelve
+en TIMEOUT segundos (igual que benchmark2.py) y guarda coste, tiempo y nodos
+expandidos del último problema resuelto.
+
+Configuraciones:
+    - A*+emergencias:   motor propio (planificador/planner.py)
+    - A*+hMAX:          motor propio, misma búsqueda con hMAX
+    - seq-opt-lmcut:    Fast Downward (downward.sif), la referencia de benchmark2.py
+
+Uso:
+    python3 benchmark_heuristica.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PLANNER = os.path.join(BASE_DIR, "..", "..", "planificador", "planner.py")
+PLANNER_EXE = os.path.join(BASE_DIR, "downward.sif")
+DOMAIN = os.path.join(BASE_DIR, "domainemergencias_costs.pddl")
+PROBLEMS_DIR = os.path.join(BASE_DIR, "problems2")
+TIMEOUT = 60
+OUTPUT_FILE = os.path.join(BASE_DIR, "resultados_heuristica.txt")
+
+CONFIGS = [
+    ("A*+emergencias", "propio", "emergencias"),
+    ("A*+hMAX", "propio", "hmax"),
+    ("seq-opt-lmcut", "downward", "seq-opt-lmcut"),
+]
+
+
+def run_propio(problem, heuristic):
+    """Ejecuta planner.py con A* y la heurística indicada."""
+    cmd = [sys.executable, PLANNER, "-s", "astar", "-H", heuristic, DOMAIN, problem]
+    start = time.time()
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"solved": False, "time": TIMEOUT, "cost": "TIMEOUT", "expanded": "-"}
+    finally:
+        if os.path.exists(problem + ".soln"):
+            os.remove(problem + ".soln")
+    elapsed = round(time.time() - start, 3)
+    cost = re.search(r"Plan cost: ([\d.]+)", result.stdout)
+    expanded = re.search(r"(\d+) Nodes expanded", result.stdout)
+    return {
+        "solved": cost is not None,
+        "time": elapsed,
+        "cost": cost.group(1) if cost else "n/a",
+        "expanded": expanded.group(1) if expanded else "-",
+    }
+
+
+def run_downward(problem, alias):
+    """Ejecuta Fast Downward con un alias (mismo comando que benchmark2.py)."""
+    cmd = f"{PLANNER_EXE} --alias {alias} --overall-time-limit {TIMEOUT}s {DOMAIN} {problem}"
+    start = time.time()
+    try:
+        result = subprocess.run(cmd, shell=True, capture_output=True, text=True,
+                                timeout=TIMEOUT + 10, cwd=BASE_DIR)
+    except subprocess.TimeoutExpired:
+        return {"solved": False, "time": TIMEOUT, "cost": "TIMEOUT", "expanded": "-"}
+    elapsed = round(time.time() - start, 3)
+    output = (result.stdout or "") + (result.stderr or "")
+    cost = re.search(r"Plan cost: ([\d.]+)", output)
+    expanded = re.findall(r"Expanded (\d+) state", output)
+    return {
+        "solved": cost is not None,
+        "time": elapsed,
+        "cost": cost.group(1) if cost else "n/a",
+        "expanded": expanded[-1] if expanded else "-",
+    }
+
+
+def benchmark(file_handle):
+    header = f"{'Config':<18} | {'Size':<5} | {'Coste':<8} | {'Tiempo (s)':<10} | {'Expandidos':<10}\n"
+    separator = "-" * 63 + "\n"
+    print(header + separator, end="")
+    file_handle.write(header + separator)
+
+    for label, engine, arg in CONFIGS:
+        if engine == "downward" and not os.path.exists(PLANNER_EXE):
+            line = f"{label:<18} | {'-':<5} | {'n/a':<8} | {'-':<10} | {'-':<10}  (sin downward.sif)\n"
+            print(line, end="")
+            file_handle.write(line)
+            continue
+
+        best_size, last = 0, None
+        for size in range(1, 31):
+            prob_file = os.path.join(PROBLEMS_DIR, f"problem_size{size}.pddl")
+            if not os.path.exists(prob_file):
+                break
+            result = run_propio(prob_file, arg) if engine == "propio" else run_downward(prob_file, arg)
+            if not result["solved"]:
+                break
+            best_size, last = size, result
+
+        if last is None:
+            line = f"{label:<18} | {0:<5} | {'n/a':<8} | {'-':<10} | {'-':<10}\n"
+        else:
+            line = (f"{label:<18} | {best_size:<5} | {last['cost']:<8} | "
+                    f"{last['time']:<10} | {last['expanded']:<10}\n")
+        print(line, end="")
+        file_handle.write(line)
+
+
+if __name__ == "__main__":
+    with open(OUTPUT_FILE, "w") as f:
+        f.write(f"BENCHMARK HEURÍSTICA EMERGENCIAS - {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Dominio: {os.path.basename(DOMAIN)} | Timeout: {TIMEOUT}s\n\n")
+        benchmark(f)
+
+    print(f"\n✅ Resultados guardados en: {OUTPUT_FILE}")
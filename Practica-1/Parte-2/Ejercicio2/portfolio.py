@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Portfolio paralelo de planificadores.
+
+Lanza a la vez varios planificadores sobre el mismo problema, cada uno en su
+propio directorio temporal (FD escribe sas_plan en el directorio de trabajo y
+nuestro planner.py escribe <problema>.soln junto al problema).
+
+Modos:
+    first: en cuanto un miembro deja un plan válido se cancela el resto. Los
+           directorios se revisan también mientras los miembros siguen en
+           marcha: los alias anytime de FD escriben sas_plan.1, sas_plan.2...
+           mucho antes de terminar.
+    best:  se espera hasta el plazo (o a que terminen todos) y se queda el plan
+           válido más barato, incluidos los planes intermedios de los alias
+           anytime de FD.
+
+Al llegar al plazo se recogen en los dos modos los planes que ya estén en
+disco. El instante de cada plan es la fecha de modificación de su fichero.
+
+Los planes se validan con el validador de planificador/validate.py, y el coste
+que se registra es el recalculado, no el que imprime el planificador. Cada
+ejecución se añade a portfolio_log.txt con el ganador para poder ajustar el
+portfolio con el tiempo.
+
+Uso:
+    python3 portfolio.py [--mode first|best] [--deadline 60] [--members a,b,c] problema.pddl
+"""
+
+import argparse
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "planificador"))
+from validate import get_validator, parse_plan
+
+PLANNER_EXE = os.path.join(BASE_DIR, "downward.sif")
+OWN_PLANNER = os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "planificador", "planner.py")
+DOMAIN = os.path.join(BASE_DIR, "domainemergencias_costs.pddl")
+LOG_FILE = os.path.join(BASE_DIR, "portfolio_log.txt")
+DEADLINE = 60
+
+FD_ALIASES = ["lama-first", "seq-sat-fdss-2", "seq-sat-fd-autotune-2"]
+OWN_CONFIGS = {
+    "propio-gbfs": ["-s", "gbfs", "-H", "emergencias"],
+    "propio-wastar": ["-s", "wastar", "-H", "emergencias", "-w", "3"],
+    "propio-astar": ["-s", "astar", "-H", "emergencias"],
+}
+DEFAULT_MEMBERS = ["metric-ff"] + FD_ALIASES + list(OWN_CONFIGS)
+
+
+def member_command(name, domain, problem, deadline):
+    """Comando del miembro name, o None si su ejecutable no está disponible."""
+    if name == "metric-ff":
+        if shutil.which("planutils") is None:
+            return None
+        return ["planutils", "run", "metric-ff", domain, problem]
+    if name in OWN_CONFIGS:
+        return [sys.executable, OWN_PLANNER] + OWN_CONFIGS[name] + [domain, problem]
+    if not os.path.exists(PLANNER_EXE):
+        return None
+    return [PLANNER_EXE, "--alias", name, "--overall-time-limit", f"{int(deadline)}s", domain, problem]
+
+
+def parse_plan_lines(lines):
+    """Extrae las acciones de un plan (formato FD, .soln o salida de Metric-FF)."""
+    steps = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(";"):
+            continue
+        ff = re.match(r"^(?:step)?\s*\d+:\s*(.+)$", line)
+        if ff:
+            line = ff.group(1)
+        if line.startswith("("):
+            steps.append(line)
+        elif ff:
+            steps.append(f"({line.lower()})")
+    return steps
+
+
+def collect_plans(name, workdir, problem):
+    """Todos los planes que ha dejado el miembro en su directorio: [(ruta, fecha, acciones)]."""
+    plans = []
+    if name == "metric-ff":
+        path = os.path.join(workdir, "stdout.txt")
+        if os.path.exists(path):
+            mtime = os.path.getmtime(path)
+            with open(path, errors="replace") as f:
+                text = f.read()
+            if "found legal plan" in text:
+                body = text.split("found legal plan", 1)[1]
+                steps = parse_plan_lines(l for l in body.splitlines() if re.match(r"^\s*(step)?\s*\d+:", l))
+                plans.append((path, mtime, steps))
+        return plans
+    if name in OWN_CONFIGS:
+        candidates = [problem + ".soln"]
+    else:
+        candidates = sorted(
+            (p for p in os.listdir(workdir) if p.startswith("sas_plan")),
+            key=lambda p: int(p.rsplit(".", 1)[1]) if "." in p else 0,
+        )
+        candidates = [os.path.join(workdir, p) for p in candidates]
+    for path in candidates:
+        if os.path.exists(path):
+            mtime = os.path.getmtime(path)
+            with open(path, errors="replace") as f:
+                plans.append((path, mtime, parse_plan_lines(f)))
+    return plans
+
+
+def validate(validator, steps):
+    """Valida el plan. Devuelve su coste o None si no es válido."""
+    result = validator.validate(parse_plan(steps))
+    return result["cost"] if result["valid"] else None
+
+
+def _kill(proc):
+    if proc.poll() is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+
+
+def run_portfolio(problem, members=None, mode="first", deadline=DEADLINE, domain=DOMAIN):
+    """
+    Ejecuta el portfolio sobre un problema.
+    Returns: {solved, winner, plan, cost, time, members: {nombre: estado}}
+    """
+    members = members or DEFAULT_MEMBERS
+    domain = os.path.abspath(domain)
+    validator = get_validator(domain, os.path.abspath(problem))
+    start = time.time()
+
+    running = {}
+    status = {}
+    for name in members:
+        workdir = tempfile.mkdtemp(prefix=f"portfolio_{name}_")
+        local_problem = os.path.join(workdir, os.path.basename(problem))
+        shutil.copy(problem, local_problem)
+        cmd = member_command(name, domain, local_problem, deadline)
+        if cmd is None:
+            status[name] = "no disponible"
+            shutil.rmtree(workdir, ignore_errors=True)
+            continue
+        out = open(os.path.join(workdir, "stdout.txt"), "w")
+        proc = subprocess.Popen(cmd, cwd=workdir, stdout=out, stderr=subprocess.STDOUT, start_new_session=True)
+        running[name] = (proc, workdir, local_problem, out)
+
+    best = None   # (coste, tiempo, nombre, plan)
+    # first se queda con el plan más temprano y best con el más barato
+    rank = (lambda c, t: (t, c)) if mode == "first" else (lambda c, t: (c, t))
+    checked = {name: {} for name in running}   # ruta -> fecha del plan ya validado
+    member_best = {}
+
+    def harvest(name):
+        """Valida los planes nuevos o reescritos del miembro (aunque siga en marcha)."""
+        nonlocal best
+        _, workdir, local_problem, _ = running[name]
+        for path, mtime, steps in collect_plans(name, workdir, local_problem):
+            if checked[name].get(path) == mtime:
+                continue
+            checked[name][path] = mtime
+            cost = validate(validator, steps)
+            if cost is None:
+                if name not in member_best:
+                    status[name] = "plan INVÁLIDO"
+                continue
+            elapsed = round(max(0.0, mtime - start), 3)
+            if name not in member_best or cost < member_best[name]:
+                member_best[name] = cost
+                status[name] = f"coste {cost} ({elapsed}s)"
+            if best is None or rank(cost, elapsed) < rank(best[0], best[1]):
+                best = (cost, elapsed, name, steps)
+
+    pending = set(running)
+    while pending and time.time() - start < deadline:
+        for name in sorted(pending):
+            # poll antes de revisar: lo que escribió antes de terminar ya está en disco
+            finished = running[name][0].poll() is not None
+            harvest(name)
+            if finished:
+                pending.discard(name)
+                if name not in status:
+                    status[name] = "sin plan"
+            if mode == "first" and best is not None:
+                break
+        if mode == "first" and best is not None:
+            break
+        time.sleep(0.05)
+
+    for name in pending:
+        alive = running[name][0].poll() is None
+        _kill(running[name][0])
+        harvest(name)
+        if name in member_best and alive:
+            status[name] += " [cortado]"
+        elif name not in status:
+            status[name] = "cancelado" if mode == "first" and best is not None else "TIMEOUT"
+    for proc, workdir, _, out in running.values():
+        out.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {
+        "solved": best is not None,
+        "winner": best[2] if best else None,
+        "plan": best[3] if best else None,
+        "cost": best[0] if best else None,
+        "time": round(time.time() - start, 3),
+        "members": status,
+    }
+    log_run(problem, mode, deadline, result)
+    return result
+
+
+def log_run(problem, mode, deadline, result):
+    """Añade una línea por ejecución al log del portfolio."""
+    members = "; ".join(f"{name}: {state}" for name, state in sorted(result["members"].items()))
+    line = (f"{time.strftime('%Y-%m-%d %H:%M:%S')} | {os.path.basename(problem):<22} | {mode:<5} | "
+            f"{deadline:>4}s | ganador {result['winner'] or '-':<22} | coste {result['cost'] if result['solved'] else '-':<6} | "
+            f"{result['time']:>8}s | {members}\n")
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("problem")
+    parser.add_argument("--domain", default=DOMAIN)
+    parser.add_argument("--mode", default="first", choices=["first", "best"])
+    parser.add_argument("--deadline", type=float, default=DEADLINE)
+    parser.add_argument("--members", default=",".join(DEFAULT_MEMBERS), help="lista separada por comas")
+    args = parser.parse_args()
+
+    result = run_portfolio(args.problem, args.members.split(","), args.mode, args.deadline, args.domain)
+    for name, state in sorted(result["members"].items()):
+        print(f"  {name:<24} {state}")
+    if not result["solved"]:
+        print(f"❌ Ningún plan válido en {result['time']}s")
+        sys.exit(1)
+    with open(args.problem + ".soln", "w") as f:
+        for step in result["plan"]:
+            f.write(step + "\n")
+    print(f"✅ Ganador: {result['winner']} | Plan cost: {result['cost']} | Tiempo: {result['time']}s")
+
+
+if __name__ == "__main__":
+    main()
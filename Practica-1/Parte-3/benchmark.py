@@ -5,7 +5,12 @@ Benchmark para Optic: modo anytime.
 Para cada numero de drones/transportadores (1..5), genera problemas de tamano
 creciente (incrementando goals de 1 en 1) y encuentra el mayor que Optic
 resuelve en <= 1 minuto. Para cada problema resuelto, extrae la primera y la
-ultima solucion encontrada en ese minuto y compara pasos y duracion.
+ultima solucion encontrada en ese minuto y compara pasos y duracion. Los
+estados evaluados hasta la ultima solucion y su ritmo salen de la salida de
+Optic (searchstats.py). Con todas las soluciones (anytime.optic) se calcula
+ademas el perfil anytime del mayor problema resuelto con cada numero de
+drones: instante y metrica de la primera, mejor metrica, cuando se llega a
+menos de un 10% de ella y el score (anytime.profile).
 """
 
 import os
@@ -16,7 +21,11 @@ import glob
 import shutil
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "planificador"))
 from generate_problem_temporal import generate_problem
+import anytime
+import searchstats
+from validate import validate_plan
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OPTIC = os.path.join(BASE_DIR, "optic-clp")
@@ -33,16 +42,9 @@ def parse_optic_solutions(output):
 
     solutions = []
 
-    # Patron para detectar bloques de solucion de Optic
+    # Bloques de solucion de Optic (el mismo patron que los perfiles de anytime.py)
     # Formato: ; Time X.XX seguido de lineas de acciones T.TTT: (ACTION) [D.DDD]
-    plan_pattern = re.compile(
-        r"; (?:Plan found with metric|Cost:)\s+([\d.]+).*?"
-        r"; (?:Time)\s+([\d.]+)\s*\n"
-        r"((?:\d+\.\d+:\s+\(.+?\)\s+\[\d+\.\d+\]\s*\n)+)",
-        re.DOTALL
-    )
-
-    for m in plan_pattern.finditer(output):
+    for m in anytime.OPTIC_RE.finditer(output):
         metric = float(m.group(1))
         cpu_time = float(m.group(2))
         actions_block = m.group(3).strip()
@@ -111,18 +113,26 @@ def run_optic(domain_file, problem_file, timeout=60, n_drones=1):
             f.write(f"; Actions: {last['actions']}, Duration: {last['duration']}\n\n")
             f.write(last["plan"] + "\n")
 
+    # Validar ambos planes (condiciones, duraciones y objetivos)
+    first_valid = validate_plan(domain_file, problem_file, first["plan"].splitlines())["valid"]
+    last_valid = validate_plan(domain_file, problem_file, last["plan"].splitlines())["valid"]
+
     return {
         "solved": True,
         "num_solutions": len(solutions),
+        "stats": searchstats.parse("optic", output),
+        "series": anytime.optic(output),
         "first": {
             "cpu_time": first["cpu_time"],
             "actions": first["actions"],
             "duration": first["duration"],
+            "valid": first_valid,
         },
         "last": {
             "cpu_time": last["cpu_time"],
             "actions": last["actions"],
             "duration": last["duration"],
+            "valid": last_valid,
         }
     }
 
@@ -182,6 +192,38 @@ def find_max_solvable(num_drones, max_timeout=TIMEOUT):
     return all_results
 
 
+def search_cells(stats):
+    """Estados evaluados y evaluaciones por segundo ("-" si Optic no los da)."""
+    evaluated = stats.get("evaluated")
+    rate = stats.get("evals_per_s")
+    return f"{'-' if evaluated is None else evaluated:>9} | {'-' if rate is None else f'{rate:.0f}':>8}"
+
+
+def anytime_lines(all_data):
+    """Perfil anytime del mayor problema resuelto con cada numero de drones."""
+    header = (f"{'Drones':>6} | {'Goals':>5} | {'#Sol':>4} | {'T 1a(s)':>8} | {'Metrica 1a':>10} | "
+              f"{'Mejor':>8} | {f'T {anytime.WITHIN:.0%}(s)':>9} | {'Score':>6}")
+    lines = [header, "-" * len(header)]
+    fmt = lambda v, spec: "-" if v is None else format(v, spec)
+    for drone_data in all_data:
+        d = drone_data["drones"]
+        if not drone_data["results"]:
+            lines.append(f"{d:>6} | {'N/A':>5} | {'N/A':>4} | {'N/A':>8} | {'N/A':>10} | "
+                         f"{'N/A':>8} | {'N/A':>9} | {'N/A':>6}")
+            continue
+        entry = drone_data["results"][-1]
+        p = anytime.profile(entry["result"]["series"], TIMEOUT)
+        lines.append(f"{d:>6} | {entry['goals']:>5} | {p['solutions']:>4} | {fmt(p['first'], '.2f'):>8} | "
+                     f"{fmt(p['first_cost'], 'g'):>10} | {fmt(p['best'], 'g'):>8} | {fmt(p['within'], '.2f'):>9} | "
+                     f"{p['score']:>6.3f}")
+    return lines
+
+
+def validity(first, last):
+    """Estado de validación de la primera y la última solución ("VALID/VALID")."""
+    return "/".join("VALID" if sol["valid"] else "INVALID" for sol in (first, last))
+
+
 def main():
     os.makedirs(RESULTS_DIR, exist_ok=True)
 
@@ -216,7 +258,8 @@ def main():
 
     header = (f"{'Drones':>6} | {'Goals':>5} | {'#Sol':>4} | "
               f"{'Pasos 1a':>8} | {'Dur. 1a':>8} | {'T. 1a(s)':>9} | "
-              f"{'Pasos Ult':>9} | {'Dur. Ult':>8} | {'T. Ult(s)':>10}")
+              f"{'Pasos Ult':>9} | {'Dur. Ult':>8} | {'T. Ult(s)':>10} | {'Validez':>15} | "
+              f"{'Evaluados':>9} | {'Evals/s':>8}")
     separator = "-" * len(header)
     print(header)
     print(separator)
@@ -226,7 +269,7 @@ def main():
         if not drone_data["results"]:
             print(f"{d:>6} | {'N/A':>5} | {'N/A':>4} | "
                   f"{'N/A':>8} | {'N/A':>8} | {'N/A':>9} | "
-                  f"{'N/A':>9} | {'N/A':>8} | {'N/A':>10}")
+                  f"{'N/A':>9} | {'N/A':>8} | {'N/A':>10} | {'N/A':>15} | {'N/A':>9} | {'N/A':>8}")
             continue
 
         for entry in drone_data["results"]:
@@ -237,7 +280,13 @@ def main():
             fl = r["last"]
             print(f"{d:>6} | {g:>5} | {nsol:>4} | "
                   f"{f1['actions']:>8} | {f1['duration']:>8.1f} | {f1['cpu_time']:>9.2f} | "
-                  f"{fl['actions']:>9} | {fl['duration']:>8.1f} | {fl['cpu_time']:>10.2f}")
+                  f"{fl['actions']:>9} | {fl['duration']:>8.1f} | {fl['cpu_time']:>10.2f} | "
+                  f"{validity(f1, fl):>15} | {search_cells(r['stats'])}")
+
+    # Perfil anytime (referencia: la mejor metrica de cada problema)
+    profile = anytime_lines(all_data)
+    print("\n--- PERFIL ANYTIME (mayor problema resuelto por numero de drones) ---")
+    print("\n".join(profile))
 
     # Guardar resultados en archivo
     results_file = os.path.join(RESULTS_DIR, "benchmark_results.txt")
@@ -252,7 +301,7 @@ def main():
             if not drone_data["results"]:
                 f.write(f"{d:>6} | {'N/A':>5} | {'N/A':>4} | "
                         f"{'N/A':>8} | {'N/A':>8} | {'N/A':>9} | "
-                        f"{'N/A':>9} | {'N/A':>8} | {'N/A':>10}\n")
+                        f"{'N/A':>9} | {'N/A':>8} | {'N/A':>10} | {'N/A':>15} | {'N/A':>9} | {'N/A':>8}\n")
                 continue
 
             for entry in drone_data["results"]:
@@ -263,7 +312,11 @@ def main():
                 fl = r["last"]
                 f.write(f"{d:>6} | {g:>5} | {nsol:>4} | "
                         f"{f1['actions']:>8} | {f1['duration']:>8.1f} | {f1['cpu_time']:>9.2f} | "
-                        f"{fl['actions']:>9} | {fl['duration']:>8.1f} | {fl['cpu_time']:>10.2f}\n")
+                        f"{fl['actions']:>9} | {fl['duration']:>8.1f} | {fl['cpu_time']:>10.2f} | "
+                        f"{validity(f1, fl):>15} | {search_cells(r['stats'])}\n")
+
+        f.write("\n--- PERFIL ANYTIME (mayor problema resuelto por numero de drones) ---\n")
+        f.write("\n".join(profile) + "\n")
 
     print(f"\nResultados guardados en: {results_file}")
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Perfiles anytime: las soluciones de cada planificador como serie temporal.
+
+Solo el benchmark de OPTIC distinguía la primera solución de la última;
+LAMA (lama-first, seq-sat-*), las configuraciones anytime de Fast Downward,
+Metric-FF, el RWA* propio y best.py (HTN) también informan de soluciones
+intermedias. Aquí la salida de cada uno se convierte en una lista de
+(instante en s, coste, longitud o None), ordenada por instante:
+
+    - Fast Downward: los sas_plan / sas_plan.N que deja en el directorio de
+      trabajo, con el instante de su fecha de modificación desde el
+      arranque y el coste y la longitud de validate.py (vale igual para los
+      portfolios, cuyas componentes tienen cada una su propio reloj). Sin
+      ficheros, las líneas "Plan cost" del log con la marca [t=...s]
+      anterior.
+    - Metric-FF: un solo plan ("found legal plan", "plan cost", pasos y
+      "seconds total time").
+    - pyperplan: un solo plan ("Plan length"; sin costes, el coste es la
+      longitud) en el tiempo de pared medido o, sin él, en "Wall-clock
+      search time".
+    - OPTIC: cada bloque "; Plan found with metric M ... ; Time T" y sus
+      acciones.
+    - planner.py: las líneas "Solution found: cost C (w = W, Ts)" de rwastar.
+    - JSHOP2: "Plan cost" y "Time Used" del primer plan.
+
+Métricas de un perfil (profile), frente a un coste de referencia (el mejor
+de todos los planificadores en ese problema, o el propio):
+
+    - first / first_cost: instante y coste del primer plan.
+    - best / best_time: mejor coste y cuándo llegó.
+    - within: primer instante con coste <= referencia * (1 + WITHIN).
+    - score: área bajo la curva de calidad q(t) = referencia / coste(t) (0
+      antes del primer plan) en [0, límite], dividida por el límite: 1 es
+      el plan de referencia en el instante 0, como la puntuación anytime
+      del IPC.
+"""
+
+import os
+import re
+
+WITHIN = 0.10
+
+TIMESTAMP_RE = re.compile(r"\[t=([\d.]+)s")
+FD_COST_RE = re.compile(r"Plan cost:\s*([\d.]+)")
+FD_LENGTH_RE = re.compile(r"Plan length:\s*(\d+)")
+FF_STEP_RE = re.compile(r"^\s*(?:step)?\s*\d+:", re.MULTILINE)
+FF_COST_RE = re.compile(r"plan cost:\s*([\d.]+)")
+FF_TIME_RE = re.compile(r"([\d.]+)\s+seconds total time")
+# Bloque de plan de OPTIC; Parte-3/benchmark.py usa este mismo patrón
+OPTIC_RE = re.compile(r"; (?:Plan found with metric|Cost:)\s+([\d.]+).*?; (?:Time)\s+([\d.]+)\s*\n"
+                      r"((?:\d+\.\d+:\s+\(.+?\)\s+\[\d+\.\d+\]\s*\n)+)", re.DOTALL)
+OWN_RE = re.compile(r"Solution found: cost ([\d.]+) \(w = [^,]+, ([\d.]+)s\)")
+PYPERPLAN_LENGTH_RE = re.compile(r"Plan length: (\d+)")
+PYPERPLAN_TIME_RE = re.compile(r"Wall-clock search time: ([\d.]+)")
+JSHOP_COST_RE = re.compile(r"Plan cost:\s*([\d.]+)")
+JSHOP_TIME_RE = re.compile(r"Time Used\s*=\s*([\d.]+)")
+
+
+def _plan_files(workdir):
+    names = [n for n in os.listdir(workdir) if n == "sas_plan" or n.startswith("sas_plan.")]
+    return sorted(names, key=lambda n: int(n.rsplit(".", 1)[1]) if "." in n else 0)
+
+
+def fast_downward(output, workdir=None, start=None, check=None):
+    """
+    Serie de Fast Downward. Con workdir, start (time.time() del arranque) y
+    check(líneas) -> (coste, longitud) o None, se usan los ficheros de plan.
+    """
+    if workdir and start is not None and check:
+        series = []
+        for name in _plan_files(workdir):
+            path = os.path.join(workdir, name)
+            with open(path) as f:
+                measured = check(f.read().splitlines())
+            if measured:
+                series.append((round(os.path.getmtime(path) - start, 3),) + tuple(measured))
+        if series:
+            return sorted(series)
+    series = []
+    stamp, length = 0.0, None
+    for line in output.splitlines():
+        found = TIMESTAMP_RE.search(line)
+        if found:
+            stamp = float(found.group(1))
+        found = FD_LENGTH_RE.search(line)
+        if found:
+            length = int(found.group(1))
+        found = FD_COST_RE.search(line)
+        if found:
+            series.append((stamp, float(found.group(1)), length))
+            length = None
+    return series
+
+
+def metric_ff(output):
+    if "found legal plan" not in output:
+        return []
+    body = output.split("found legal plan", 1)[1]
+    cost = FF_COST_RE.search(body)
+    elapsed = FF_TIME_RE.search(body)
+    length = len(FF_STEP_RE.findall(body))
+    return [(float(elapsed.group(1)) if elapsed else 0.0, float(cost.group(1)) if cost else float(length), length)]
+
+
+def pyperplan(output, wall=None):
+    length = PYPERPLAN_LENGTH_RE.search(output)
+    if not length:
+        return []
+    if wall is None:
+        elapsed = PYPERPLAN_TIME_RE.search(output)
+        wall = float(elapsed.group(1)) if elapsed else 0.0
+    return [(wall, float(length.group(1)), int(length.group(1)))]
+
+
+def optic(output):
+    return [(float(m.group(2)), float(m.group(1)), len(m.group(3).strip().splitlines()))
+            for m in OPTIC_RE.finditer(output)]
+
+
+def own_planner(output):
+    return [(float(m.group(2)), float(m.group(1)), None) for m in OWN_RE.finditer(output)]
+
+
+def jshop(output):
+    first = output.split("Plan #2:", 1)[0]
+    cost = JSHOP_COST_RE.search(first)
+    if not cost:
+        return []
+    elapsed = JSHOP_TIME_RE.search(output)
+    length = sum(1 for line in first.splitlines() if line.startswith("(!"))
+    return [(float(elapsed.group(1)) if elapsed else 0.0, float(cost.group(1)), length)]
+
+
+def improving(series):
+    """Solo las soluciones que mejoran a todas las anteriores."""
+    result = []
+    for solution in sorted(series, key=lambda s: s[0]):
+        if not result or solution[1] < result[-1][1]:
+            result.append(solution)
+    return result
+
+
+def profile(series, limit, reference=None, within=WITHIN):
+    """
+    Métricas de una serie hasta limit segundos.
+    Returns: {solutions, first, first_cost, best, best_time, within, score} (None sin planes)
+    """
+    series = improving(s for s in series if s[0] <= limit)
+    if not series:
+        return {"solutions": 0, "first": None, "first_cost": None, "best": None, "best_time": None,
+                "within": None, "score": 0.0}
+    reference = series[-1][1] if reference is None else reference
+    target = next((t for t, cost, _ in series if cost <= reference * (1 + within)), None)
+    area = 0.0
+    for (t, cost, _), following in zip(series, [s[0] for s in series[1:]] + [limit]):
+        area += (following - t) * (min(1.0, reference / cost) if cost else 1.0)
+    return {"solutions": len(series), "first": series[0][0], "first_cost": series[0][1], "best": series[-1][1],
+            "best_time": series[-1][0], "within": target, "score": round(area / limit, 4) if limit else 0.0}
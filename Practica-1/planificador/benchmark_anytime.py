@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark de Restarting Weighted A* (search.rwastar) en el dominio de costes.
+
+Para cada problema de Parte-2/Ejercicio2 se lanza la búsqueda anytime con un
+límite de tiempo y se anota la traza de planes que mejoran (coste, peso y
+segundo en que aparecen), junto al coste óptimo cuando la última iteración
+(peso 1) termina. El perfil anytime (anytime.py) añade el instante en que
+el coste queda a menos de un 10% del mejor y la puntuación tipo IPC en
+[0, deadline].
+
+Uso:
+    python3 benchmark_anytime.py [deadline] [tamaño_min] [tamaño_max]
+"""
+
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+import anytime
+from grounding import load_task
+from heuristics import HEURISTICS
+from search import restarting_weighted_astar_search
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "anytime.txt")
+DIRECTORY = os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2")
+DOMAIN = os.path.join(DIRECTORY, "domainemergencias_costs.pddl")
+
+
+def main():
+    deadline = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    low = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    high = int(sys.argv[3]) if len(sys.argv) > 3 else 11
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Tamaño':>6} | {'Primer plan':>15} | {'Mejor plan':>15} | {'Óptimo':>6} | {'Expandidos':>10} | "
+              f"{f'T {anytime.WITHIN:.0%}(s)':>9} | {'Score':>6} | Traza")
+    lines = [f"BENCHMARK RWA* - {time.strftime('%Y-%m-%d %H:%M:%S')} (deadline {deadline}s, "
+             f"heurística emergencias)", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    for size in range(low, high + 1):
+        problem = os.path.join(DIRECTORY, "problems2", f"problem_size{size}.pddl")
+        task = load_task(DOMAIN, problem)
+        result = restarting_weighted_astar_search(task, HEURISTICS["emergencias"](task), deadline=deadline)
+        trace = " ".join(f"{cost}@{elapsed}s(w={weight})" for cost, weight, elapsed in result["solutions"])
+        if result["solutions"]:
+            first_cost, _, first_time = result["solutions"][0]
+            first = f"{first_cost} ({first_time}s)"
+            best = f"{result['cost']} ({result['solutions'][-1][2]}s)"
+        else:
+            first = best = "-"
+        p = anytime.profile([(elapsed, cost, None) for cost, _, elapsed in result["solutions"]], deadline)
+        within = "-" if p["within"] is None else f"{p['within']:.3f}"
+        line = (f"{size:>6} | {first:>15} | {best:>15} | {'sí' if result['optimal'] else 'no':>6} | "
+                f"{result['expanded']:>10} | {within:>9} | {p['score']:>6.3f} | {trace or '-'}")
+        print(line)
+        lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
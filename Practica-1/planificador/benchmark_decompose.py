@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la descomposición por objetivos (decompose.py).
+
+Problemas generados con generate_problem_temporal.py (N drones y N
+transportadores en el depósito) resueltos por grupos en paralelo y como un
+único problema con el mismo motor. Se anotan makespan y coste del plan
+unido, del monolítico y la diferencia de makespan.
+
+Uso:
+    python3 benchmark_decompose.py [timeout_monolítico]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(PRACTICA_DIR, "Parte-3"))
+from decompose import TEMPORAL_DOMAIN, decompose, monolithic
+from generate_problem_temporal import generate_problem
+from validate import validate_plan
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "decompose.txt")
+
+# (motor, drones = transportadores, refugios, personas, objetivos)
+PROBLEMS = [
+    ("gbfs", 2, 4, 4, 6),
+    ("gbfs", 3, 6, 10, 12),
+    ("gbfs", 4, 8, 12, 20),
+    ("gbfs", 5, 10, 20, 30),
+    ("vrp", 3, 6, 10, 12),
+    ("vrp", 5, 10, 20, 30),
+    ("vrp", 5, 20, 40, 80),
+    ("vrp", 10, 50, 100, 200),
+    ("vrp", 20, 100, 300, 600),
+]
+
+
+def main():
+    timeout = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Problema':<32} | {'Motor':<5} | {'Makespan':>9} | {'Coste':>6} | {'T(s)':>7} | "
+              f"{'Mono mk':>9} | {'Mono c.':>7} | {'Mono T(s)':>9} | {'Dif.':>7} | {'Válido':>6}")
+    lines = [f"BENCHMARK DESCOMPOSICIÓN - {time.strftime('%Y-%m-%d %H:%M:%S')} (cpu_count={os.cpu_count()}, "
+             f"timeout monolítico {timeout}s)", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend, drones, locations, persons, goals in PROBLEMS:
+            name, text = generate_problem(drones, drones, locations, persons, 2 * goals, goals, 4, seed=1)
+            problem = os.path.join(tmp, name + ".pddl")
+            with open(problem, "w") as f:
+                f.write(text)
+            result = decompose(problem, backend)
+            mono = monolithic(problem, backend, timeout)
+            valid = result["solved"] and validate_plan(TEMPORAL_DOMAIN, problem, result["plan"])["valid"]
+            if result["solved"]:
+                part = f"{result['makespan']:>9} | {result['cost']:>6} | {result['time']:>7}"
+            else:
+                part = f"{'-':>9} | {'-':>6} | {result['time']:>7}"
+            if mono["solved"]:
+                mono_part = f"{mono['makespan']:>9} | {mono['cost']:>7} | {mono['time']:>9}"
+            else:
+                mono_part = f"{'TIMEOUT':>9} | {'-':>7} | {mono['time']:>9}"
+            gap = "-"
+            if result["solved"] and mono["solved"]:
+                gap = f"{100 * (result['makespan'] - mono['makespan']) / mono['makespan']:+.1f}%"
+            line = f"{name:<32} | {backend:<5} | {part} | {mono_part} | {gap:>7} | {'sí' if valid else 'NO':>6}"
+            print(line)
+            lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
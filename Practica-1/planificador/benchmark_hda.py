@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escalado fuerte de HDA* (hda.py).
+
+Resuelve los problemas más grandes que A* secuencial resolvía en los
+benchmarks anteriores con 1, 2, 4, ... hasta os.cpu_count() procesos y
+mide tiempo, aceleración respecto al A* secuencial de planner.py y nodos
+expandidos (el sobrecoste de búsqueda de HDA* frente a A*). Al final
+resume la mejor aceleración con más de un worker y cuántos nodos de más
+expanden respecto a 1 worker: en una máquina con un solo núcleo los
+workers se reparten la CPU y HDA* no acelera nada, y el resumen lo dice en
+lugar de presentarlo como una mejora.
+
+Uso:
+    python3 benchmark_hda.py [max_workers]
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+PLANNER = os.path.join(BASE_DIR, "planner.py")
+HDA = os.path.join(BASE_DIR, "hda.py")
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "hda.txt")
+TIMEOUT = 600
+
+# (etiqueta, directorio, dominio, problema, heurística): los mayores problemas
+# que resolvía A*+hMAX con pyperplan y los mayores que resuelve A*+emergencias
+PROBLEMS = [
+    ("P1-Ej3 size5", os.path.join(PRACTICA_DIR, "Parte-1", "Ejercicio3"), "domainemergencias.pddl",
+     "problems/problem_size5.pddl", "hmax"),
+    ("P2-Ej1 size4", os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio1"), "domainemergencias.pddl",
+     "problems/problem_size4.pddl", "hmax"),
+    ("P1-Ej3 size7", os.path.join(PRACTICA_DIR, "Parte-1", "Ejercicio3"), "domainemergencias.pddl",
+     "problems/problem_size7.pddl", "emergencias"),
+    ("P2-Ej2 size6", os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2"), "domainemergencias_costs.pddl",
+     "problems2/problem_size6.pddl", "emergencias"),
+]
+
+
+def run(cmd, problem):
+    """Ejecuta un planificador y devuelve {solved, time, expanded, cost}."""
+    start = time.time()
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"solved": False, "time": TIMEOUT, "expanded": None, "cost": None}
+    finally:
+        if os.path.exists(problem + ".soln"):
+            os.remove(problem + ".soln")
+    elapsed = round(time.time() - start, 3)
+    cost = re.search(r"Plan cost: ([\d.]+)", result.stdout)
+    expanded = re.search(r"(\d+) Nodes expanded", result.stdout)
+    return {
+        "solved": cost is not None,
+        "time": elapsed,
+        "expanded": int(expanded.group(1)) if expanded else None,
+        "cost": cost.group(1) if cost else None,
+    }
+
+
+def worker_counts(limit):
+    counts = [1]
+    while counts[-1] * 2 <= limit:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != limit:
+        counts.append(limit)
+    return counts
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Problema':<13} | {'Heurística':<11} | {'Workers':>7} | {'Tiempo(s)':>9} | "
+              f"{'Speedup':>7} | {'Expandidos':>10} | {'Coste':>5}")
+    lines = [f"BENCHMARK HDA* - {time.strftime('%Y-%m-%d %H:%M:%S')} (cpu_count={os.cpu_count()}, "
+             f"timeout {TIMEOUT}s)", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    speedups = []   # aceleración de cada ejecución con más de un worker
+    overheads = []  # expandidos con más de un worker / expandidos con 1
+    for label, directory, domain_name, problem_name, heuristic in PROBLEMS:
+        domain = os.path.join(directory, domain_name)
+        problem = os.path.join(directory, problem_name)
+        base = run([sys.executable, PLANNER, "-s", "astar", "-H", heuristic, domain, problem], problem)
+        rows = [("A*", base)]
+        for n in worker_counts(limit):
+            rows.append((str(n), run([sys.executable, HDA, "-n", str(n), "-H", heuristic, domain, problem],
+                                     problem)))
+        for workers, r in rows:
+            if r["solved"]:
+                speedup = f"x{base['time'] / max(0.001, r['time']):.2f}" if base["solved"] else "-"
+                line = (f"{label:<13} | {heuristic:<11} | {workers:>7} | {r['time']:>9} | "
+                        f"{speedup:>7} | {r['expanded']:>10} | {r['cost']:>5}")
+            else:
+                line = (f"{label:<13} | {heuristic:<11} | {workers:>7} | {'TIMEOUT':>9} | "
+                        f"{'-':>7} | {'-':>10} | {'-':>5}")
+            print(line)
+            lines.append(line)
+        single = rows[1][1]
+        for workers, r in rows[2:]:
+            if r["solved"] and base["solved"]:
+                speedups.append(base["time"] / max(0.001, r["time"]))
+            if r["solved"] and single["solved"] and single["expanded"]:
+                overheads.append(r["expanded"] / single["expanded"])
+
+    if speedups:
+        summary = [f"Con más de 1 worker: aceleración x{min(speedups):.2f}-x{max(speedups):.2f}, "
+                   f"expandidos x{min(overheads):.2f}-x{max(overheads):.2f} respecto a 1 worker."]
+        if (os.cpu_count() or 1) == 1 or max(speedups) < 1.5:
+            summary.append(f"HDA* no acelera en esta máquina (cpu_count={os.cpu_count()}): los workers se "
+                           f"reparten la CPU y las diferencias son ruido o sobrecoste de búsqueda.")
+        print("\n" + "\n".join(summary))
+        lines += [""] + summary
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark del parser PDDL (pddl.py).
+
+Compara el parser en streaming sobre mmap (parse_problem, y con dense=True
+la matriz fly-cost de NumPy) con la lectura anterior: todo el texto a
+memoria, lista de tokens y árbol completo (tokenize + parse_sexpr).
+
+    1. Los cuatro dialectos del repositorio (STRIPS de Parte-1/Ejercicio3,
+       Parte-2/Ejercicio1 con transportadores, :action-costs de
+       Parte-2/Ejercicio2 y :durative-actions de Parte-3): dominio y todos
+       sus problemas, comprobando que el resultado es el mismo.
+    2. Problemas grandes generados con generate_problem_temporal.py: la
+       matriz fly-cost crece con el cuadrado de las localizaciones (1700
+       refugios son ~100 MB). La lectura anterior se omite por encima de
+       TREE_MAX_MB.
+
+Uso:
+    python3 benchmark_parser.py
+"""
+
+import gc
+import glob
+import multiprocessing as mp
+import os
+import resource
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, os.path.join(PRACTICA_DIR, "Parte-3"))
+from generate_problem_temporal import generate_problem
+from pddl import np, parse_domain, parse_problem, parse_sexpr, tokenize
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "parser.txt")
+
+DIALECTS = [
+    ("STRIPS (P1-Ej3)", "Parte-1/Ejercicio3/domainemergencias.pddl", "Parte-1/Ejercicio3/problems/*.pddl"),
+    ("Transport. (P2-Ej1)", "Parte-2/Ejercicio1/domainemergencias.pddl", "Parte-2/Ejercicio1/problems/*.pddl"),
+    ("Costes (P2-Ej2)", "Parte-2/Ejercicio2/domainemergencias_costs.pddl", "Parte-2/Ejercicio2/problems2/*.pddl"),
+    ("Temporal (P3)", "Parte-3/domainemergencias_temporal.pddl", "Parte-3/problems/*/*.pddl"),
+]
+# Localizaciones de los problemas generados (fly-cost tiene n * (n + 1) valores)
+LOCATIONS = [50, 200, 500, 1000, 1700]
+TREE_MAX_MB = 50
+
+
+def parse_problem_tree(path):
+    """Lectura anterior: texto completo, tokens y árbol, y después las secciones."""
+    with open(path, encoding="utf-8") as f:
+        expr = parse_sexpr(tokenize(f.read()))[0]
+    init, numeric = set(), {}
+    for section in expr[1:]:
+        if section[0] == ":init":
+            for fact in section[1:]:
+                if fact[0] == "=":
+                    numeric[tuple(fact[1])] = float(fact[2])
+                else:
+                    init.add(tuple(fact))
+    return init, numeric
+
+
+def timed(fn, *args, **kwargs):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _measure(fn, args, kwargs):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    _, elapsed = timed(fn, *args, **kwargs)
+    return elapsed, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024
+
+
+def measure(fn, *args, **kwargs):
+    """Tiempo y pico de memoria (MB) de fn en un proceso nuevo."""
+    with mp.get_context("fork").Pool(1) as pool:
+        return pool.apply(_measure, (fn, args, kwargs))
+
+
+def dialects(lines):
+    header = f"{'Dialecto':<20} | {'Ficheros':>8} | {'MB':>6} | {'Árbol(s)':>9} | {'Stream(s)':>9} | {'Acel.':>6} | {'Igual':>5}"
+    lines += [header, "-" * len(header)]
+    print("\n".join(lines[-2:]))
+    for label, domain, pattern in DIALECTS:
+        files = sorted(glob.glob(os.path.join(PRACTICA_DIR, pattern)))
+        size = sum(os.path.getsize(f) for f in files) / 1e6
+        parse_domain(os.path.join(PRACTICA_DIR, domain))
+        tree_time = stream_time = 0.0
+        same = True
+        for path in files:
+            (init, numeric), t = timed(parse_problem_tree, path)
+            tree_time += t
+            problem, t = timed(parse_problem, path)
+            stream_time += t
+            same &= problem["init"] == init and problem["numeric"] == numeric
+        line = (f"{label:<20} | {len(files):>8} | {size:>6.2f} | {tree_time:>9.3f} | {stream_time:>9.3f} | "
+                f"{tree_time / stream_time:>5.2f}x | {'sí' if same else 'NO':>5}")
+        print(line)
+        lines.append(line)
+
+
+def same_result(path, size):
+    """Compara (fuera de las medidas) el resultado con la lectura anterior y la matriz."""
+    problem = parse_problem(path)
+    same = size > TREE_MAX_MB or parse_problem_tree(path) == (problem["init"], problem["numeric"])
+    if np is not None:
+        numeric = {k: v for k, v in problem["numeric"].items() if k[0] == "fly-cost"}
+        del problem
+        index, matrix = parse_problem(path, dense=True)["matrices"]["fly-cost"]
+        same &= len(numeric) == int((~np.isnan(matrix)).sum()) and all(
+            matrix[index[k[1]], index[k[2]]] == v for k, v in numeric.items())
+    return same
+
+
+def large(lines):
+    header = (f"{'Localizaciones':>14} | {'MB':>6} | {'Líneas':>8} | {'Árbol(s)':>8} | {'Pico MB':>7} | "
+              f"{'Stream(s)':>9} | {'MB/s':>5} | {'Pico MB':>7} | {'Denso(s)':>8} | {'Pico MB':>7} | {'Igual':>5}")
+    lines += ["", header, "-" * len(header)]
+    print("\n" + "\n".join(lines[-2:]))
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in LOCATIONS:
+            _, text = generate_problem(2, 2, n, n, 2 * n, n, 4, seed=n)
+            path = os.path.join(tmp, f"loc{n}.pddl")
+            with open(path, "w") as f:
+                f.write(text)
+            size = os.path.getsize(path) / 1e6
+            count = text.count("\n") + 1
+            del text
+
+            tree = f"{'-':>8} | {'-':>7}"
+            if size <= TREE_MAX_MB:
+                tree_time, tree_peak = measure(parse_problem_tree, path)
+                tree = f"{tree_time:>8.3f} | {tree_peak:>7.0f}"
+            stream_time, stream_peak = measure(parse_problem, path)
+            dense = f"{'sin NumPy':>8} | {'-':>7}"
+            if np is not None:
+                dense_time, dense_peak = measure(parse_problem, path, dense=True)
+                dense = f"{dense_time:>8.3f} | {dense_peak:>7.0f}"
+            same = "sí" if same_result(path, size) else "NO"
+            line = (f"{n:>14} | {size:>6.1f} | {count:>8} | {tree} | {stream_time:>9.3f} | "
+                    f"{size / stream_time:>5.1f} | {stream_peak:>7.0f} | {dense} | {same:>5}")
+            print(line)
+            lines.append(line)
+
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    lines = [f"BENCHMARK PARSER PDDL - {time.strftime('%Y-%m-%d %H:%M:%S')}", ""]
+    print("\n".join(lines))
+    dialects(lines)
+    large(lines)
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
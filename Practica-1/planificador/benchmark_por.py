@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la reducción de orden parcial (stubborn.py).
+
+Ejecuta A*+emergencias con y sin --por sobre:
+    - los problemas de Parte-3 con 1..5 drones (versión secuencial: dominio
+      con costes de Parte-2/Ejercicio2), donde las acciones de drones
+      distintos podrían conmutar;
+    - los problemas de dos garras de Parte-1/Ejercicio3, donde el orden de
+      los pick podría ser irrelevante.
+Se comparan nodos expandidos, generados y tiempo.
+
+Uso:
+    python3 benchmark_por.py
+"""
+
+import glob
+import os
+import re
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+PLANNER = os.path.join(BASE_DIR, "planner.py")
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "por.txt")
+TIMEOUT = 60
+
+COSTS_DOMAIN = os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2", "domainemergencias_costs.pddl")
+EJ3_DIR = os.path.join(PRACTICA_DIR, "Parte-1", "Ejercicio3")
+
+
+def problem_sets():
+    """Lista de (conjunto, dominio, problema) en orden de dificultad."""
+    result = []
+    for drones in range(1, 6):
+        pattern = os.path.join(PRACTICA_DIR, "Parte-3", "problems", f"{drones}_drones", "*.pddl")
+        files = sorted(glob.glob(pattern), key=lambda p: int(re.search(r"_p(\d+)_", p).group(1)))
+        for problem in files:
+            result.append((f"P3-{drones}d", COSTS_DOMAIN, problem))
+    for size in range(1, 31):
+        problem = os.path.join(EJ3_DIR, "problems", f"problem_size{size}.pddl")
+        if os.path.exists(problem):
+            result.append(("P1-Ej3", os.path.join(EJ3_DIR, "domainemergencias.pddl"), problem))
+    return result
+
+
+def run(domain, problem, por):
+    """Ejecuta planner.py y devuelve {solved, time, expanded, generated, cost}."""
+    cmd = [sys.executable, PLANNER, "-s", "astar", "-H", "emergencias"] + (["--por"] if por else []) + [domain, problem]
+    start = time.time()
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"solved": False, "time": TIMEOUT, "expanded": None, "generated": None, "cost": None}
+    finally:
+        if os.path.exists(problem + ".soln"):
+            os.remove(problem + ".soln")
+    elapsed = round(time.time() - start, 3)
+    cost = re.search(r"Plan cost: ([\d.]+)", result.stdout)
+    expanded = re.search(r"(\d+) Nodes expanded", result.stdout)
+    generated = re.search(r"(\d+) Nodes generated", result.stdout)
+    return {
+        "solved": cost is not None,
+        "time": elapsed,
+        "expanded": int(expanded.group(1)) if expanded else None,
+        "generated": int(generated.group(1)) if generated else None,
+        "cost": cost.group(1) if cost else None,
+    }
+
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Conjunto':<8} | {'Problema':<24} | {'Exp. sin':>9} | {'Exp. POR':>9} | {'Gen. sin':>9} | "
+              f"{'Gen. POR':>9} | {'T. sin(s)':>9} | {'T. POR(s)':>9} | {'Coste':>5}")
+    lines = [f"BENCHMARK STUBBORN SETS - {time.strftime('%Y-%m-%d %H:%M:%S')} (timeout {TIMEOUT}s)", "",
+             header, "-" * len(header)]
+    print("\n".join(lines))
+
+    dead = set()
+    both = []   # (generados sin, generados POR, T. sin, T. POR) de los resueltos por las dos
+    for set_name, domain, problem in problem_sets():
+        if set_name in dead:
+            continue
+        plain = run(domain, problem, False)
+        pruned = run(domain, problem, True)
+        if not plain["solved"] and not pruned["solved"]:
+            dead.add(set_name)
+            continue
+
+        def fmt(r, field):
+            return r[field] if r["solved"] else "TIMEOUT"
+
+        cost = pruned["cost"] if pruned["solved"] else plain["cost"]
+        name = os.path.basename(problem).replace(".pddl", "")
+        line = (f"{set_name:<8} | {name:<24} | {fmt(plain, 'expanded'):>9} | {fmt(pruned, 'expanded'):>9} | "
+                f"{fmt(plain, 'generated'):>9} | {fmt(pruned, 'generated'):>9} | {plain['time']:>9} | "
+                f"{pruned['time']:>9} | {cost:>5}")
+        print(line)
+        lines.append(line)
+        if plain["solved"] and pruned["solved"]:
+            both.append((plain["generated"], pruned["generated"], plain["time"], pruned["time"]))
+
+    if both:
+        removed = sum(g - p for g, p, _, _ in both)
+        ratios = sorted(tp / ts for _, _, ts, tp in both if ts > 0)
+        lines += ["", f"Sucesores podados: {removed} de {sum(g for g, _, _, _ in both)} generados en {len(both)} "
+                  f"problemas | T. POR / T. sin: {ratios[0]:.2f}-{ratios[-1]:.2f} "
+                  f"(mediana {ratios[len(ratios) // 2]:.2f})"]
+        if removed == 0:
+            lines.append("--por no poda nada en estos dominios y solo añade el coste del cierre: "
+                         "queda desactivado por defecto.")
+        print("\n".join(lines[-2:]))
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
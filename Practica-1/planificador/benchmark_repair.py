@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la reparación de planes (repair.py) frente a replanificar.
+
+Para cada problema de costes de Parte-2/Ejercicio2 (problems2) se obtiene
+un plan con planner.py (GBFS + emergencias), se ejecuta la mitad y cambian
+los objetivos:
+
+    - cambio: se retira un objetivo pendiente (person-has p c) y llega otro
+      del mismo contenido para una persona que no lo tenía pedido, así que la
+      caja que sobraba sirve para la necesidad nueva.
+    - retirada: solo se retira el objetivo pendiente.
+
+Se compara la latencia y el coste del resto del plan de repair.py con los de
+buscar desde cero en el estado actual con la misma configuración. La
+instanciación se hace una vez por problema y no entra en ninguno de los
+tiempos.
+
+Uso:
+    python3 benchmark_repair.py [tamaño máximo]
+"""
+
+import os
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+from pddl import str_to_atom
+from planner import solve
+from repair import get_repairer
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "repair.txt")
+DIRECTORY = os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2")
+DOMAIN = os.path.join(DIRECTORY, "domainemergencias_costs.pddl")
+CONFIGS = ["gbfs", "astar"]
+MAX_SIZE = 8
+
+
+def scenarios(repairer, plan, executed):
+    """(nombre, añadidos, retirados) para el punto de ejecución dado."""
+    state = repairer.task.initial_state
+    for step in plan[:executed]:
+        state = repairer.ops[str_to_atom(step)].apply(state)
+    pending = sorted(g for g in repairer.task.goals if g not in state)
+    if not pending:
+        return []
+    _, person, content = str_to_atom(pending[-1])
+    persons = sorted({str_to_atom(f)[1] for f in repairer.task.static if f.startswith("(at-person ")})
+    new = [f"(person-has {p} {content})" for p in persons
+           if f"(person-has {p} {content})" not in repairer.task.goals]
+    result = [("retirada", [], [pending[-1]])]
+    if new:
+        result.insert(0, ("cambio", [new[0]], [pending[-1]]))
+    return result
+
+
+def main():
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else MAX_SIZE
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Size':>4} | {'Escenario':<9} | {'Búsqueda':<8} | {'Método':<16} | {'Repar.(s)':>9} | "
+              f"{'Coste rep.':>10} | {'Replan.(s)':>10} | {'Coste repl.':>11} | {'Aceleración':>11}")
+    lines = [f"BENCHMARK REPARACIÓN DE PLANES - {time.strftime('%Y-%m-%d %H:%M:%S')}",
+             f"Dominio: {os.path.relpath(DOMAIN, PRACTICA_DIR)} | plan inicial GBFS+emergencias, "
+             f"mitad ejecutada", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    for size in range(1, max_size + 1):
+        problem = os.path.join(DIRECTORY, "problems2", f"problem_size{size}.pddl")
+        if not os.path.exists(problem):
+            break
+        initial = solve(DOMAIN, problem, "gbfs", "emergencias")
+        if not initial["solved"]:
+            continue
+        plan = [op.name for op in initial["plan"]]
+        executed = len(plan) // 2
+        repairer = get_repairer(DOMAIN, problem)
+        for name, added, removed in scenarios(repairer, plan, executed):
+            for search in CONFIGS:
+                rep = repairer.repair(plan, executed, added, removed, search=search)
+                ref = repairer.replan(plan, executed, added, removed, search=search)
+                speedup = f"x{ref['time'] / max(rep['time'], 1e-4):.1f}" if ref["time"] else "-"
+                line = (f"{size:>4} | {name:<9} | {search:<8} | {rep['method']:<16} | {rep['time']:>9} | "
+                        f"{rep['cost'] if rep['solved'] else '-':>10} | {ref['time']:>10} | "
+                        f"{ref['cost'] if ref['solved'] else '-':>11} | {speedup:>11}")
+                print(line)
+                lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
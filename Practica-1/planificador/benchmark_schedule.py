@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark del programador temporal (schedule.py).
+
+    1. Problemas de Parte-3: makespan del plan programado frente a la última
+       solución guardada de OPTIC (Parte-3/plans), cuando la hay.
+    2. Problemas generados con generate_problem_temporal.py con 3 a 10
+       drones, donde OPTIC no encontraba plan.
+
+El plan secuencial es el de vrp.py con el dominio de costes; se anota el
+makespan secuencial (suma de duraciones), el programado, el tiempo de
+programar y si validate.py acepta el plan temporal.
+
+Uso:
+    python3 benchmark_schedule.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+PARTE3_DIR = os.path.join(PRACTICA_DIR, "Parte-3")
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, PARTE3_DIR)
+from generate_problem_temporal import generate_problem
+from schedule import schedule, sequential_plan
+from validate import validate_plan
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "schedule.txt")
+DOMAIN = os.path.join(PARTE3_DIR, "domainemergencias_temporal.pddl")
+
+# (drones = transportadores, refugios, personas, objetivos)
+GENERATED = [
+    (3, 4, 3, 6),
+    (3, 6, 10, 12),
+    (4, 8, 12, 20),
+    (5, 10, 20, 30),
+    (5, 20, 40, 80),
+    (10, 50, 100, 200),
+]
+
+
+def row(name, problem, optic):
+    start = time.time()
+    steps = sequential_plan(problem)
+    plan_time = time.time() - start
+    result = schedule(DOMAIN, problem, steps)
+    valid = validate_plan(DOMAIN, problem, result["plan"])["valid"]
+    return (f"{name:<34} | {len(steps):>8} | {result['sequential']:>10} | {result['makespan']:>9} | "
+            f"{optic:>9} | {plan_time:>9.3f} | {result['time']:>12} | {'sí' if valid else 'NO':>6}")
+
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Problema':<34} | {'Acciones':>8} | {'Secuencial':>10} | {'Makespan':>9} | {'OPTIC':>9} | "
+              f"{'vrp.py(s)':>9} | {'Programar(s)':>12} | {'Válido':>6}")
+    lines = [f"BENCHMARK SCHEDULE - {time.strftime('%Y-%m-%d %H:%M:%S')}", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    problems_dir = os.path.join(PARTE3_DIR, "problems")
+    for sub in sorted(os.listdir(problems_dir)):
+        for f in sorted(os.listdir(os.path.join(problems_dir, sub))):
+            problem = os.path.join(problems_dir, sub, f)
+            optic_plan = os.path.join(PARTE3_DIR, "plans", sub, f[:-len(".pddl")] + "_last.SOL")
+            optic = "N/A"
+            if os.path.exists(optic_plan):
+                optic = validate_plan(DOMAIN, problem, optic_plan)["makespan"]
+            line = row(f[:-len(".pddl")], problem, optic)
+            print(line)
+            lines.append(line)
+
+    lines.append("")
+    with tempfile.TemporaryDirectory() as tmp:
+        for drones, locations, persons, goals in GENERATED:
+            name, text = generate_problem(drones, drones, locations, persons, 2 * goals, goals, 4, seed=1)
+            problem = os.path.join(tmp, name + ".pddl")
+            with open(problem, "w") as f:
+                f.write(text)
+            line = row(name, problem, "N/A")
+            print(line)
+            lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la poda por simetrías (symmetry.py).
+
+Ejecuta BFS y A*+emergencias con y sin canonización de estados sobre los
+problemas de Parte-1/Ejercicio3 y Parte-2 y mide la reducción de nodos
+expandidos y la aceleración. Para cada combinación se sube de tamaño hasta
+que la versión con simetrías no resuelve en TIMEOUT segundos.
+
+Uso:
+    python3 benchmark_simetria.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+PLANNER = os.path.join(BASE_DIR, "planner.py")
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "simetria.txt")
+TIMEOUT = 60
+
+PROBLEM_SETS = [
+    ("P1-Ej3", os.path.join(PRACTICA_DIR, "Parte-1", "Ejercicio3"), "domainemergencias.pddl", "problems"),
+    ("P2-Ej1", os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio1"), "domainemergencias.pddl", "problems"),
+    ("P2-Ej2", os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2"), "domainemergencias_costs.pddl", "problems2"),
+]
+
+SEARCHES = [
+    ("BFS", ["-s", "bfs"]),
+    ("A*+emergencias", ["-s", "astar", "-H", "emergencias"]),
+]
+
+
+def run(domain, problem, args, symmetry):
+    """Ejecuta planner.py y devuelve {solved, time, expanded, cost}."""
+    cmd = [sys.executable, PLANNER] + args + (["--symmetry"] if symmetry else []) + [domain, problem]
+    start = time.time()
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        return {"solved": False, "time": TIMEOUT, "expanded": None, "cost": None}
+    finally:
+        if os.path.exists(problem + ".soln"):
+            os.remove(problem + ".soln")
+    elapsed = round(time.time() - start, 3)
+    cost = re.search(r"Plan cost: ([\d.]+)", result.stdout)
+    expanded = re.search(r"(\d+) Nodes expanded", result.stdout)
+    return {
+        "solved": cost is not None,
+        "time": elapsed,
+        "expanded": int(expanded.group(1)) if expanded else None,
+        "cost": cost.group(1) if cost else None,
+    }
+
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Conjunto':<8} | {'Búsqueda':<15} | {'Size':>4} | {'Exp. sin':>9} | {'Exp. con':>9} | "
+              f"{'Reducción':>9} | {'T. sin(s)':>9} | {'T. con(s)':>9} | {'Speedup':>7} | {'Coste':>5}")
+    lines = [f"BENCHMARK SIMETRÍAS - {time.strftime('%Y-%m-%d %H:%M:%S')} (timeout {TIMEOUT}s)", "",
+             header, "-" * len(header)]
+    print("\n".join(lines))
+
+    for set_name, directory, domain_name, problems_name in PROBLEM_SETS:
+        domain = os.path.join(directory, domain_name)
+        for label, args in SEARCHES:
+            plain_alive = True
+            for size in range(1, 31):
+                problem = os.path.join(directory, problems_name, f"problem_size{size}.pddl")
+                if not os.path.exists(problem):
+                    break
+                sym = run(domain, problem, args, True)
+                plain = run(domain, problem, args, False) if plain_alive else {"solved": False, "time": TIMEOUT}
+                plain_alive = plain["solved"]
+                if not sym["solved"]:
+                    break
+
+                if plain["solved"]:
+                    reduction = f"x{plain['expanded'] / max(1, sym['expanded']):.1f}"
+                    speedup = f"x{plain['time'] / max(0.001, sym['time']):.1f}"
+                    plain_exp, plain_time = plain["expanded"], plain["time"]
+                else:
+                    reduction, speedup, plain_exp, plain_time = "-", "-", "TIMEOUT", "TIMEOUT"
+                line = (f"{set_name:<8} | {label:<15} | {size:>4} | {plain_exp:>9} | {sym['expanded']:>9} | "
+                        f"{reduction:>9} | {plain_time:>9} | {sym['time']:>9} | {speedup:>7} | {sym['cost']:>5}")
+                print(line)
+                lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark del solver de rutas (vrp.py).
+
+    1. Problemas del repositorio (Parte-1/Ejercicio3, Parte-2/Ejercicio1 y
+       Parte-2/Ejercicio2): coste del plan, tiempo y validez del plan
+       reproduciéndolo sobre la tarea instanciada.
+    2. Problemas grandes generados con generate_problem_temporal.py (cientos
+       de refugios, 1000+ objetivos) resueltos con el dominio de costes.
+       Replay instancia todo el dominio y no escala a estos tamaños, así que
+       sus planes se comprueban con validate.py (instancia bajo demanda,
+       coste lineal en la longitud del plan): la columna Válido exige que el
+       plan sea aplicable, alcance los objetivos y cueste lo que dice vrp.py.
+
+Uso:
+    python3 benchmark_vrp.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, os.path.join(PRACTICA_DIR, "Parte-3"))
+from generate_problem_temporal import generate_problem
+from grounding import load_task
+from pddl import str_to_atom
+from validate import Validator, parse_plan
+from vrp import solve_vrp
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "vrp.txt")
+COSTS_DOMAIN = os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2", "domainemergencias_costs.pddl")
+
+PROBLEM_SETS = [
+    ("P1-Ej3", os.path.join(PRACTICA_DIR, "Parte-1", "Ejercicio3"), "domainemergencias.pddl", "problems"),
+    ("P2-Ej1", os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio1"), "domainemergencias.pddl", "problems"),
+    ("P2-Ej2", os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2"), "domainemergencias_costs.pddl", "problems2"),
+]
+
+# (drones, transportadores, refugios, personas, cajas, objetivos)
+LARGE = [
+    (2, 2, 50, 150, 300, 250),
+    (5, 5, 100, 600, 1200, 1000),
+    (5, 5, 200, 600, 1200, 1000),
+    (10, 10, 300, 1200, 2400, 2000),
+]
+
+
+def replay(domain, problem, steps):
+    """Reproduce el plan sobre la tarea instanciada. Devuelve el coste o None."""
+    task = load_task(domain, problem)
+    ops = {str_to_atom(op.name): op for op in task.operators}
+    state, cost = task.initial_state, 0
+    for step in steps:
+        op = ops.get(str_to_atom(step))
+        if op is None or not op.applicable(state):
+            return None
+        state = op.apply(state)
+        cost += op.cost
+    return cost if task.goal_reached(state) else None
+
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    lines = [f"BENCHMARK VRP - {time.strftime('%Y-%m-%d %H:%M:%S')}", ""]
+    header = f"{'Conjunto':<8} | {'Size':>4} | {'Coste':>7} | {'Acciones':>8} | {'Tiempo(s)':>9} | {'Válido':>6}"
+    lines += [header, "-" * len(header)]
+    print("\n".join(lines))
+
+    for set_name, directory, domain_name, problems_name in PROBLEM_SETS:
+        domain = os.path.join(directory, domain_name)
+        for size in range(1, 31):
+            problem = os.path.join(directory, problems_name, f"problem_size{size}.pddl")
+            if not os.path.exists(problem):
+                break
+            result = solve_vrp(domain, problem)
+            valid = replay(domain, problem, result["plan"]) == result["cost"]
+            line = (f"{set_name:<8} | {size:>4} | {result['cost']:>7g} | {len(result['plan']):>8} | "
+                    f"{result['time']:>9} | {'sí' if valid else 'NO':>6}")
+            print(line)
+            lines.append(line)
+
+    header = (f"{'Problema':<34} | {'Objetivos':>9} | {'Coste':>8} | {'Acciones':>8} | {'Rutas':>5} | "
+              f"{'Parseo+solver(s)':>16} | {'Válido':>6}")
+    lines += ["", header, "-" * len(header)]
+    print("\n" + "\n".join(lines[-2:]))
+    with tempfile.TemporaryDirectory() as tmp:
+        for drones, carriers, locations, persons, crates, goals in LARGE:
+            name, text = generate_problem(drones, carriers, locations, persons, crates, goals, 4, seed=1)
+            problem = os.path.join(tmp, name + ".pddl")
+            with open(problem, "w") as f:
+                f.write(text)
+            result = solve_vrp(COSTS_DOMAIN, problem)
+            check = Validator(COSTS_DOMAIN, problem).validate(parse_plan(result["plan"]))
+            valid = check["valid"] and check["cost"] == result["cost"]
+            line = (f"{name:<34} | {goals:>9} | {result['cost']:>8g} | {len(result['plan']):>8} | "
+                    f"{result['routes']:>5} | {result['time']:>16} | {'sí' if valid else 'NO':>6}")
+            print(line)
+            lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Descomposición por objetivos para problemas con varios drones.
+
+generate_problem_temporal.py crea N drones y N transportadores en el
+depósito y la búsqueda explota con N. Aquí el problema se parte en un
+subproblema por dron:
+
+    1. Cajas: cada objetivo (person-has) recibe su caja con
+       vrp.assign_boxes y cada dron su transportador con vrp.drone_teams.
+    2. Agrupación: los refugios con objetivos se reparten en k grupos (k =
+       drones con transportador) con k-medoids sobre el grafo de fly-cost
+       (distancia de camino mínimo, simetrizada). Después se equilibra la
+       carga estimada de cada grupo, 20 por entrega (pick, put, take y leave)
+       más ida y vuelta desde el hub por cada viaje de Q cajas, moviendo
+       refugios del grupo más cargado mientras baje el máximo.
+    3. Cada subproblema conserva las localizaciones, los números, su dron,
+       su transportador, sus cajas y sus personas; los demás objetos y los
+       hechos que los nombran se quitan.
+    4. Los subproblemas se resuelven a la vez en un pool de procesos con
+       cualquier motor: vrp.py o una búsqueda de planner.py sobre el dominio
+       de costes.
+    5. Como los subplanes no comparten dron, transportador, caja ni persona,
+       su concatenación es un plan secuencial válido. schedule.py lo programa
+       sobre el dominio temporal y los drones vuelan en paralelo.
+
+Con --compare se resuelve también el problema completo con el mismo motor
+(con límite de tiempo) y se da la diferencia de makespan.
+
+Uso:
+    python3 decompose.py [-b vrp] [-j 4] [--compare] problema.pddl
+"""
+
+import argparse
+import math
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pddl import parse_problem, str_to_atom
+from planner import solve
+from schedule import schedule, write_plan
+from search import SEARCHES
+from validate import get_validator
+from vrp import Instance, assign_boxes, drone_teams, solve_vrp
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+COSTS_DOMAIN = os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2", "domainemergencias_costs.pddl")
+TEMPORAL_DOMAIN = os.path.join(PRACTICA_DIR, "Parte-3", "domainemergencias_temporal.pddl")
+BACKENDS = ["vrp"] + sorted(SEARCHES)
+SERVICE = 20
+MONOLITHIC_TIMEOUT = 300
+
+
+# --------------------------------------------------------------------------
+# Agrupación de objetivos
+# --------------------------------------------------------------------------
+
+def _estimate(graph, deliveries, capacity):
+    """Tiempo estimado de un dron que hace todas las entregas de un grupo."""
+    per_loc = {}
+    for hub, target, *_ in deliveries:
+        per_loc[(hub, target)] = per_loc.get((hub, target), 0) + 1
+    travel = sum(math.ceil(n / capacity) * (graph.quick_cost(hub, target) + graph.quick_cost(target, hub))
+                 for (hub, target), n in per_loc.items())
+    return SERVICE * len(deliveries) + travel
+
+
+def cluster(inst, deliveries, k, capacity):
+    """
+    Reparte las entregas en k grupos por el refugio de destino.
+    Returns: lista de k listas de entregas (algunas vacías si hay pocos refugios)
+    """
+    graph = inst.graph
+    by_loc = {}
+    for delivery in deliveries:
+        by_loc.setdefault(delivery[1], []).append(delivery)
+    locs = sorted(by_loc)
+    if not locs:
+        return [[] for _ in range(k)]
+
+    def d(a, b):
+        return (graph.quick_cost(a, b) + graph.quick_cost(b, a)) / 2
+
+    # Medoides iniciales: el refugio más lejano a los ya elegidos (empezando por el hub)
+    hubs = {delivery[0] for delivery in deliveries}
+    medoids = []
+    while len(medoids) < min(k, len(locs)):
+        anchors = medoids or sorted(hubs)
+        medoids.append(max((l for l in locs if l not in medoids),
+                           key=lambda l: (min(d(l, a) for a in anchors), l)))
+
+    assign = {}
+    for _ in range(20):
+        assign = {l: min(range(len(medoids)), key=lambda i: (d(l, medoids[i]), i)) for l in locs}
+        moved = False
+        for i in range(len(medoids)):
+            members = [l for l in locs if assign[l] == i]
+            best = min(members, key=lambda m: (sum(d(m, l) * len(by_loc[l]) for l in members), m))
+            if best != medoids[i]:
+                medoids[i], moved = best, True
+        if not moved:
+            break
+
+    groups = [[l for l in locs if assign[l] == i] for i in range(len(medoids))]
+    loads = [_estimate(graph, [x for l in g for x in by_loc[l]], capacity) for g in groups]
+    while True:
+        worst = max(range(len(groups)), key=lambda i: loads[i])
+        best = None
+        for loc in groups[worst]:
+            if len(groups[worst]) == 1:
+                break
+            rest = [x for l in groups[worst] if l != loc for x in by_loc[l]]
+            new_worst = _estimate(graph, rest, capacity)
+            for j in range(len(groups)):
+                if j == worst:
+                    continue
+                new_j = _estimate(graph, [x for l in groups[j] for x in by_loc[l]] + by_loc[loc], capacity)
+                peak = max(new_worst, new_j)
+                if peak < loads[worst] and (best is None or peak < best[0]):
+                    best = (peak, loc, j, new_worst, new_j)
+        if best is None:
+            break
+        _, loc, j, loads[worst], loads[j] = best
+        groups[worst].remove(loc)
+        groups[j].append(loc)
+
+    result = [[x for l in sorted(g) for x in by_loc[l]] for g in groups]
+    return result + [[] for _ in range(k - len(result))]
+
+
+# --------------------------------------------------------------------------
+# Subproblemas
+# --------------------------------------------------------------------------
+
+def _fmt(value):
+    return int(value) if float(value).is_integer() else value
+
+
+def write_subproblem(problem, name, keep, goals, path):
+    """Escribe el problema con solo los objetos de keep (y los hechos que los nombran)."""
+    dropped = {o for o, _ in problem["objects"] if o not in keep}
+    by_type = {}
+    for obj, typ in problem["objects"]:
+        if obj in keep:
+            by_type.setdefault(typ, []).append(obj)
+    lines = [f"(define (problem {name})", f"(:domain {problem['domain']})", "(:objects"]
+    lines += [f"\t{' '.join(objs)} - {typ}" for typ, objs in by_type.items()]
+    lines += [")", "", "(:init"]
+    for atom, value in sorted(problem["numeric"].items()):
+        if not dropped.intersection(atom[1:]):
+            lines.append(f"\t(= ({' '.join(atom)}) {_fmt(value)})")
+    for atom in sorted(problem["init"]):
+        if not dropped.intersection(atom[1:]):
+            lines.append(f"\t({' '.join(atom)})")
+    lines += [")", "", "(:goal (and"]
+    lines += [f"\t(person-has {person} {content})" for person, content in goals]
+    lines += ["))", ")"]
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def split(problem_file, workdir):
+    """
+    Crea un subproblema por dron en workdir.
+    Returns: lista de (dron, ruta del subproblema, número de objetivos)
+    """
+    inst = Instance(COSTS_DOMAIN, problem_file)
+    problem = parse_problem(problem_file)
+    teams = drone_teams(inst)
+    if not inst.carrier_variant:
+        raise ValueError("la descomposición es para el dominio con transportadores")
+    capacity = min(inst.capacity(c) for c in teams.values())
+    groups = cluster(inst, assign_boxes(inst), len(teams), capacity)
+
+    # Los grupos más cargados, para los drones más cercanos a sus cajas
+    drones = sorted(teams)
+    groups.sort(key=len, reverse=True)
+    shared = {o for o, typ in problem["objects"] if typ not in ("dron", "carrier", "box", "person")}
+    jobs = []
+    for group in groups:
+        if not group:
+            continue
+        hub = group[0][0]
+        drone = min(drones, key=lambda d: (inst.graph.quick_cost(inst.drones[d], hub), d))
+        drones.remove(drone)
+        keep = shared | {drone, teams[drone]} | {x[2] for x in group} | {x[3] for x in group}
+        path = os.path.join(workdir, f"{problem['name']}_{drone}.pddl")
+        write_subproblem(problem, f"{problem['name']}_{drone}", keep, [(x[3], x[4]) for x in group], path)
+        jobs.append((drone, path, len(group)))
+    return jobs
+
+
+def solve_problem(backend, problem_file):
+    """Plan secuencial (lista de átomos) con el motor indicado, o None."""
+    start = time.time()
+    if backend == "vrp":
+        steps = solve_vrp(COSTS_DOMAIN, problem_file)["plan"]
+    else:
+        result = solve(COSTS_DOMAIN, problem_file, search=backend)
+        steps = [op.name for op in result["plan"]] if result["solved"] else None
+    if steps is None:
+        return None, round(time.time() - start, 3)
+    return [str_to_atom(step) for step in steps], round(time.time() - start, 3)
+
+
+def _solve_job(args):
+    return solve_problem(*args)
+
+
+def _pool_context():
+    return mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+
+
+def decompose(problem_file, backend="vrp", workers=None, domain_file=TEMPORAL_DOMAIN):
+    """
+    Resuelve el problema por grupos en paralelo y une los subplanes.
+    Returns: {solved, plan (temporal), steps, makespan, cost, groups, schedule, time}
+    """
+    start = time.time()
+    workdir = tempfile.mkdtemp(prefix="decompose_")
+    try:
+        jobs = split(problem_file, workdir)
+        workers = workers or min(len(jobs), os.cpu_count() or 1)
+        with _pool_context().Pool(max(1, workers)) as pool:
+            results = pool.map(_solve_job, [(backend, path) for _, path, _ in jobs])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    groups = [{"drone": drone, "goals": n, "time": t, "solved": steps is not None}
+              for (drone, _, n), (steps, t) in zip(jobs, results)]
+    if any(steps is None for steps, _ in results):
+        return {"solved": False, "plan": None, "steps": None, "makespan": None, "cost": None,
+                "groups": groups, "schedule": None, "time": round(time.time() - start, 3)}
+    steps = [step for plan, _ in results for step in plan]
+    cost = get_validator(COSTS_DOMAIN, problem_file).validate([(None, s, None) for s in steps])["cost"]
+    timed = schedule(domain_file, problem_file, steps)
+    return {
+        "solved": True,
+        "plan": timed["plan"],
+        "steps": steps,
+        "makespan": timed["makespan"],
+        "cost": cost,
+        "groups": groups,
+        "schedule": timed,
+        "time": round(time.time() - start, 3),
+    }
+
+
+def monolithic(problem_file, backend="vrp", timeout=MONOLITHIC_TIMEOUT, domain_file=TEMPORAL_DOMAIN):
+    """
+    El problema completo con el mismo motor, en un proceso con límite de tiempo.
+    Returns: {solved, makespan, cost, time}
+    """
+    start = time.time()
+    with _pool_context().Pool(1) as pool:
+        try:
+            steps, _ = pool.apply_async(solve_problem, (backend, problem_file)).get(timeout)
+        except mp.TimeoutError:
+            steps = None
+    elapsed = round(time.time() - start, 3)
+    if steps is None:
+        return {"solved": False, "makespan": None, "cost": None, "time": elapsed}
+    cost = get_validator(COSTS_DOMAIN, problem_file).validate([(None, s, None) for s in steps])["cost"]
+    return {"solved": True, "makespan": schedule(domain_file, problem_file, steps)["makespan"],
+            "cost": cost, "time": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("problem")
+    parser.add_argument("-b", "--backend", default="vrp", choices=BACKENDS)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="procesos del pool")
+    parser.add_argument("--domain", default=TEMPORAL_DOMAIN, help="dominio temporal para programar")
+    parser.add_argument("--compare", action="store_true", help="resuelve también el problema completo")
+    parser.add_argument("--timeout", type=float, default=MONOLITHIC_TIMEOUT, help="límite del problema completo")
+    args = parser.parse_args()
+
+    try:
+        result = decompose(args.problem, args.backend, args.workers, args.domain)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    for g in result["groups"]:
+        print(f"  {g['drone']:<8} | {g['goals']:>4} objetivos | {g['time']:>8}s | {'ok' if g['solved'] else 'sin plan'}")
+    if not result["solved"]:
+        print(f"No se encontró solución ({result['time']}s)")
+        sys.exit(1)
+    check = get_validator(args.domain, args.problem).validate(result["plan"])
+    if not check["valid"]:
+        print(f"❌ Plan temporal inválido: {check['error']}")
+        sys.exit(1)
+    write_plan(result["schedule"], args.problem + ".SOL")
+    print(f"Plan length: {len(result['plan'])} step(s).")
+    print(f"Makespan: {result['makespan']}")
+    print(f"Plan cost: {result['cost']}")
+    print(f"Search time: {result['time']}")
+
+    if args.compare:
+        mono = monolithic(args.problem, args.backend, args.timeout, args.domain)
+        if mono["solved"]:
+            gap = 100 * (result["makespan"] - mono["makespan"]) / mono["makespan"]
+            print(f"Monolítico: makespan {mono['makespan']} | coste {mono['cost']} | {mono['time']}s "
+                  f"| diferencia {gap:+.1f}%")
+        else:
+            print(f"Monolítico: sin plan en {mono['time']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Instanciación (grounding) de dominios PDDL en una tarea STRIPS.
+
+La representación sigue la de pyperplan para que las heurísticas puedan
+usarse en ambos motores: los estados son frozensets de cadenas
+"(pred arg1 arg2)" y los operadores tienen preconditions, add_effects y
+del_effects. Además cada operador guarda su coste (1 si el dominio no usa
+:action-costs).
+"""
+
+from pddl import atom_to_str, eval_numeric, parse_domain, parse_problem
+
+
+class Operator:
+    """Acción instanciada."""
+
+    __slots__ = ("name", "preconditions", "add_effects", "del_effects", "cost")
+
+    def __init__(self, name, preconditions, add_effects, del_effects, cost=1):
+        self.name = name
+        self.preconditions = frozenset(preconditions)
+        self.add_effects = frozenset(add_effects)
+        self.del_effects = frozenset(del_effects)
+        self.cost = cost
+
+    def applicable(self, state):
+        return self.preconditions <= state
+
+    def apply(self, state):
+        return (state - self.del_effects) | self.add_effects
+
+    def __repr__(self):
+        return self.name
+
+
+class Task:
+    """Tarea de planificación instanciada."""
+
+    def __init__(self, name, facts, initial_state, goals, operators, static=frozenset(), numeric=None):
+        self.name = name
+        self.facts = facts
+        self.initial_state = initial_state
+        self.goals = goals
+        self.operators = operators
+        self.static = static
+        self.numeric = numeric or {}
+
+    def goal_reached(self, state):
+        return self.goals <= state
+
+    def get_successor_states(self, state):
+        return [(op, op.apply(state)) for op in self.operators if op.applicable(state)]
+
+
+def objects_by_type(domain, problem):
+    """Agrupa los objetos del problema por tipo, incluyendo los supertipos."""
+    by_type = {}
+    for name, typ in problem["objects"]:
+        current = typ
+        while current is not None:
+            by_type.setdefault(current, []).append(name)
+            current = domain["types"].get(current) if current != "object" else None
+    return by_type
+
+
+def static_predicates(domain):
+    """Predicados que ninguna acción modifica."""
+    changed = set()
+    for action in domain["actions"]:
+        for atom in action["add"] + action["delete"]:
+            changed.add(atom[0])
+    return set(domain["predicates"]) - changed
+
+
+def ground_action(action, by_type, static_facts, static_preds, numeric, use_costs):
+    """
+    Genera todas las instancias de una acción compatibles con los hechos
+    estáticos. Las precondiciones estáticas se comprueban en cuanto todos sus
+    parámetros están ligados, lo que poda la enumeración pronto.
+    """
+    params = [var for var, _ in action["parameters"]]
+    domains = [by_type.get(typ, []) for _, typ in action["parameters"]]
+    static_pre = [atom for positive, atom in action["precondition"] if positive and atom[0] in static_preds]
+
+    # Para cada posición, las precondiciones estáticas que quedan ligadas al fijarla
+    checks = [[] for _ in params]
+    for atom in static_pre:
+        last = max((params.index(a) for a in atom[1:] if a in params), default=-1)
+        if last >= 0:
+            checks[last].append(atom)
+
+    def substitute(atom, bindings):
+        return (atom[0],) + tuple(bindings.get(a, a) for a in atom[1:])
+
+    operators = []
+    bindings = {}
+
+    def bind(i):
+        if i == len(params):
+            pre = [atom_to_str(substitute(a, bindings)) for positive, a in action["precondition"]
+                   if positive and a[0] not in static_preds]
+            add = [atom_to_str(substitute(a, bindings)) for a in action["add"]]
+            delete = [atom_to_str(substitute(a, bindings)) for a in action["delete"]]
+            cost = 1
+            if use_costs:
+                cost = eval_numeric(action["cost"], bindings, numeric) if action["cost"] is not None else 0
+                cost = int(cost) if float(cost).is_integer() else cost
+            name = "(" + " ".join([action["name"]] + [bindings[p] for p in params]) + ")"
+            operators.append(Operator(name, pre, add, delete, cost))
+            return
+        for obj in domains[i]:
+            bindings[params[i]] = obj
+            if all(substitute(a, bindings) in static_facts for a in checks[i]):
+                bind(i + 1)
+        bindings.pop(params[i], None)
+
+    bind(0)
+    return operators
+
+
+def relaxed_reachable(initial, operators):
+    """Hechos alcanzables ignorando borrados (punto fijo)."""
+    reached = set(initial)
+    changed = True
+    while changed:
+        changed = False
+        for op in operators:
+            if op.preconditions <= reached and not op.add_effects <= reached:
+                reached |= op.add_effects
+                changed = True
+    return reached
+
+
+def ground(domain, problem):
+    """Instancia dominio y problema ya parseados en una Task."""
+    by_type = objects_by_type(domain, problem)
+    static_preds = static_predicates(domain)
+    static_facts = {atom for atom in problem["init"] if atom[0] in static_preds}
+    use_costs = ":action-costs" in domain["requirements"]
+
+    operators = []
+    for action in domain["actions"]:
+        operators.extend(ground_action(action, by_type, static_facts, static_preds,
+                                       problem["numeric"], use_costs))
+
+    # Descartar operadores que no cambian el estado (p.ej. move de A a A)
+    operators = [op for op in operators
+                 if not (op.add_effects <= op.preconditions and op.del_effects <= op.add_effects)]
+
+    initial = frozenset(atom_to_str(a) for a in problem["init"] if a[0] not in static_preds)
+    goals = frozenset(atom_to_str(a) for a in problem["goal"])
+
+    reachable = relaxed_reachable(initial, operators)
+    operators = [op for op in operators if op.preconditions <= reachable]
+
+    facts = set(initial) | set(goals)
+    for op in operators:
+        facts |= op.preconditions | op.add_effects | op.del_effects
+
+    return Task(problem["name"], frozenset(facts), initial, goals, operators,
+                static=frozenset(atom_to_str(a) for a in static_facts),
+                numeric=problem["numeric"])
+
+
+def load_task(domain_file, problem_file):
+    """Atajo: parsea e instancia un par dominio/problema."""
+    return ground(parse_domain(domain_file), parse_problem(problem_file))
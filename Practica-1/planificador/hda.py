@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+A* paralelo distribuido por hash (HDA*) sobre varios procesos.
+
+Cada estado tiene un proceso dueño: owner(s) = hash(s) % N. Cada worker
+mantiene su propia lista abierta y su tabla de mejores g para los estados
+que le pertenecen; los sucesores se envían al dueño en lotes por colas de
+multiprocessing. Los estados viajan como tuplas ordenadas de índices de
+hechos, que son baratas de serializar y tienen un hash estable entre
+procesos.
+
+Optimalidad y terminación:
+    - Cuando un worker expande una meta con coste menor que el incumbente,
+      lo publica en memoria compartida; todos descartan nodos con f >= coste.
+    - El proceso principal da la búsqueda por terminada cuando todos los
+      workers están ociosos y el total de lotes enviados coincide con el de
+      recibidos en dos lecturas consecutivas iguales (método de los cuatro
+      contadores). En ese momento no queda ningún nodo con f < incumbente, así
+      que el plan es óptimo si la heurística es admisible.
+    - El plan se reconstruye preguntando a cada dueño por el padre del estado.
+    - Si un worker muere (excepción, falta de memoria) el protocolo de
+      terminación no se completaría nunca: mientras espera, el proceso
+      principal comprueba que todos siguen vivos y, si no, para los demás y
+      lanza RuntimeError.
+
+Resultado (results/hda.txt, máquina con cpu_count=1): HDA* no acelera nada.
+Con un solo núcleo los workers se reparten la misma CPU, así que con 2 y 4
+workers el tiempo queda entre x0.76 y x1.16 del A* secuencial (ruido de
+medida) y se expanden algunos nodos más que con 1 worker por el reparto
+entre dueños. Solo tiene sentido en una máquina con varios núcleos.
+
+Uso:
+    python3 hda.py [-n 4] [-H emergencias] dominio.pddl problema.pddl
+"""
+
+import argparse
+import heapq
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from grounding import load_task
+from heuristics import HEURISTICS
+
+BATCH_SIZE = 64
+INF = float("inf")
+
+
+class _Node:
+    """Lo mínimo que necesitan las heurísticas: el estado como frozenset."""
+
+    __slots__ = ("state",)
+
+    def __init__(self, state):
+        self.state = state
+
+
+def _compile(task):
+    """Traduce la Task a índices enteros (mismo resultado en todos los procesos)."""
+    facts = sorted(task.facts)
+    index = {f: i for i, f in enumerate(facts)}
+    ops = []
+    for op in task.operators:
+        ops.append((
+            frozenset(index[f] for f in op.preconditions),
+            frozenset(index[f] for f in op.add_effects),
+            frozenset(index[f] for f in op.del_effects),
+            op.cost,
+        ))
+    goals = frozenset(index[f] for f in task.goals)
+    initial = tuple(sorted(index[f] for f in task.initial_state))
+    return facts, ops, goals, initial
+
+
+def _worker(wid, n_workers, domain_file, problem_file, heuristic_name,
+            inboxes, results, incumbent, incumbent_owner, sent, received, idle, done):
+    task = load_task(domain_file, problem_file)
+    facts, ops, goals, _ = _compile(task)
+    heuristic = HEURISTICS[heuristic_name](task)
+    inbox = inboxes[wid]
+
+    def h_value(state):
+        return heuristic(_Node(frozenset(facts[i] for i in state)))
+
+    open_list = []
+    best = {}            # estado -> (g, padre, índice de operador)
+    counter = itertools.count()
+    outbox = [[] for _ in range(n_workers)]
+    expanded = generated = 0
+    goal_state = None
+
+    def flush(force):
+        for dest in range(n_workers):
+            batch = outbox[dest]
+            if batch and (force or len(batch) >= BATCH_SIZE):
+                sent[wid] += 1  # se cuenta antes de enviar
+                inboxes[dest].put(("nodes", batch))
+                outbox[dest] = []
+
+    def receive(state, g, parent, op_index):
+        nonlocal generated
+        generated += 1
+        old = best.get(state)
+        if old is not None and old[0] <= g:
+            return
+        best[state] = (g, parent, op_index)
+        h = h_value(state)
+        if g + h < incumbent.value:
+            heapq.heappush(open_list, (g + h, h, next(counter), state, g))
+
+    def handle(message):
+        kind, payload = message
+        if kind == "nodes":
+            for state, g, parent, op_index in payload:
+                receive(state, g, parent, op_index)
+        elif kind == "trace":
+            _, parent, op_index = best[payload]
+            results.put(("trace", payload, parent, op_index))
+
+    while not done.value:
+        # 1. Vaciar la bandeja de entrada sin bloquear
+        while True:
+            try:
+                message = inbox.get_nowait()
+            except queue.Empty:
+                break
+            idle[wid] = 0
+            received[wid] += 1
+            handle(message)
+
+        # 2. Expandir un nodo
+        if open_list:
+            idle[wid] = 0
+            f, h, _, state, g = heapq.heappop(open_list)
+            if best[state][0] < g:
+                continue
+            if f >= incumbent.value:
+                open_list.clear()
+                continue
+            state_set = frozenset(state)
+            if goals <= state_set:
+                with incumbent.get_lock():
+                    if g < incumbent.value:
+                        incumbent.value = g
+                        incumbent_owner.value = wid
+                        goal_state = state
+                continue
+            expanded += 1
+            for op_index, (pre, add, delete, cost) in enumerate(ops):
+                if pre <= state_set:
+                    succ = tuple(sorted((state_set - delete) | add))
+                    dest = hash(succ) % n_workers
+                    if dest == wid:
+                        receive(succ, g + cost, state, op_index)
+                    else:
+                        outbox[dest].append((succ, g + cost, state, op_index))
+            flush(force=False)
+            continue
+
+        # 3. Sin trabajo local: enviar lo pendiente y esperar
+        if any(outbox):
+            flush(force=True)
+            continue
+        idle[wid] = 1
+        try:
+            message = inbox.get(timeout=0.01)
+        except queue.Empty:
+            continue
+        idle[wid] = 0
+        received[wid] += 1
+        handle(message)
+
+    # Fase final: responder a las peticiones de reconstrucción del plan
+    results.put(("stats", wid, expanded, generated, goal_state))
+    while True:
+        message = inbox.get()
+        if message[0] == "exit":
+            break
+        if message[0] == "trace":
+            handle(message)
+
+
+def hda_search(domain_file, problem_file, n_workers=None, heuristic="emergencias"):
+    """
+    Ejecuta HDA* con n_workers procesos.
+    Returns: {solved, plan, cost, expanded, generated, time, workers}
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    start = time.time()
+    task = load_task(domain_file, problem_file)
+    _, _, _, initial = _compile(task)
+
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    inboxes = [ctx.Queue() for _ in range(n_workers)]
+    results = ctx.Queue()
+    incumbent = ctx.Value("d", INF)
+    incumbent_owner = ctx.Value("i", -1)
+    sent = ctx.Array("q", n_workers + 1, lock=False)
+    received = ctx.Array("q", n_workers + 1, lock=False)
+    idle = ctx.Array("b", n_workers, lock=False)
+    done = ctx.Value("b", 0, lock=False)
+
+    workers = [
+        ctx.Process(target=_worker, args=(wid, n_workers, domain_file, problem_file, heuristic,
+                                          inboxes, results, incumbent, incumbent_owner,
+                                          sent, received, idle, done))
+        for wid in range(n_workers)
+    ]
+    for w in workers:
+        w.start()
+    try:
+        return _coordinate(task, initial, start, n_workers, workers, inboxes, results, incumbent,
+                           incumbent_owner, sent, received, idle, done)
+    except RuntimeError:
+        for w in workers:
+            w.terminate()
+            w.join()
+        raise
+
+
+def _check_workers(workers):
+    """RuntimeError si algún worker ha terminado antes de recibir "exit"."""
+    for wid, w in enumerate(workers):
+        if not w.is_alive():
+            raise RuntimeError(f"el worker {wid} ha terminado antes de tiempo (código {w.exitcode})")
+
+
+def _coordinate(task, initial, start, n_workers, workers, inboxes, results, incumbent,
+                incumbent_owner, sent, received, idle, done):
+    """Proceso principal: detecta la terminación, recoge estadísticas y reconstruye el plan."""
+
+    def get():
+        while True:
+            try:
+                return results.get(timeout=0.1)
+            except queue.Empty:
+                _check_workers(workers)
+
+    # El proceso principal usa la última posición de los contadores
+    sent[n_workers] += 1
+    inboxes[hash(initial) % n_workers].put(("nodes", [(initial, 0, None, None)]))
+
+    previous = None
+    while True:
+        time.sleep(0.005)
+        _check_workers(workers)
+        snapshot = (all(idle[i] for i in range(n_workers)), sum(sent), sum(received))
+        if snapshot[0] and snapshot[1] == snapshot[2]:
+            if snapshot == previous:
+                break
+            previous = snapshot
+        else:
+            previous = None
+    done.value = 1
+
+    stats = {}
+    goal_state = None
+    for _ in range(n_workers):
+        _, wid, expanded, generated, state = get()
+        stats[wid] = (expanded, generated)
+        if wid == incumbent_owner.value:
+            goal_state = state
+
+    plan = None
+    if goal_state is not None:
+        plan = []
+        state = goal_state
+        while True:
+            inboxes[hash(state) % n_workers].put(("trace", state))
+            _, _, parent, op_index = get()
+            if parent is None:
+                break
+            plan.append(task.operators[op_index])
+            state = parent
+        plan.reverse()
+
+    for inbox in inboxes:
+        inbox.put(("exit", None))
+    for w in workers:
+        w.join()
+
+    return {
+        "solved": plan is not None,
+        "plan": plan,
+        "cost": incumbent.value if plan is not None else None,
+        "expanded": sum(e for e, _ in stats.values()),
+        "generated": sum(g for _, g in stats.values()),
+        "time": round(time.time() - start, 3),
+        "workers": n_workers,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problem")
+    parser.add_argument("-n", "--workers", type=int, default=None)
+    parser.add_argument("-H", "--heuristic", default="emergencias", choices=sorted(HEURISTICS))
+    args = parser.parse_args()
+
+    try:
+        result = hda_search(args.domain, args.problem, args.workers, args.heuristic)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not result["solved"]:
+        print(f"No se encontró solución ({result['time']}s)")
+        sys.exit(1)
+    with open(args.problem + ".soln", "w") as f:
+        for op in result["plan"]:
+            f.write(f"{op.name}\n")
+    cost = result["cost"]
+    print(f"Plan length: {len(result['plan'])} step(s).")
+    print(f"Plan cost: {int(cost) if float(cost).is_integer() else cost}")
+    print(f"{result['expanded']} Nodes expanded")
+    print(f"{result['generated']} Nodes generated")
+    print(f"Workers: {result['workers']}")
+    print(f"Search time: {result['time']}")
+
+
+if __name__ == "__main__":
+    main()
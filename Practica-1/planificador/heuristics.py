@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Heurísticas para el motor de búsqueda.
+
+Todas siguen la interfaz de pyperplan: se construyen con la Task y se llaman
+con un nodo que tenga .state. Así la heurística de dominio "emergencias"
+funciona tanto en este motor como dentro de pyperplan (ver planner.py
+--engine pyperplan).
+
+    - blind:       0 en la meta, coste mínimo de acción en otro caso
+    - hmax:        hMAX con costes de acción (admisible)
+    - emergencias: heurística de dominio admisible (ver EmergenciasHeuristic)
+"""
+
+import heapq
+
+from pddl import str_to_atom
+
+INF = float("inf")
+
+
+def op_cost(op):
+    """Coste de un operador; pyperplan no guarda costes, así que vale 1."""
+    return getattr(op, "cost", 1)
+
+
+def op_args(op):
+    """"(move deposito refugio1 dron1)" -> ("move", "deposito", ...)."""
+    return str_to_atom(op.name)
+
+
+class BlindHeuristic:
+    def __init__(self, task):
+        self.goals = task.goals
+        self.min_cost = min((op_cost(op) for op in task.operators), default=0)
+
+    def __call__(self, node):
+        return 0 if self.goals <= node.state else self.min_cost
+
+
+class HMaxHeuristic:
+    """hMAX con costes: coste del subobjetivo más caro en el problema relajado."""
+
+    def __init__(self, task):
+        self.goals = task.goals
+        self.fact_ops = {}
+        self.ops = []
+        for op in task.operators:
+            entry = [op, len(op.preconditions)]
+            self.ops.append(entry)
+            for fact in op.preconditions:
+                self.fact_ops.setdefault(fact, []).append(entry)
+        self.no_pre = [entry for entry in self.ops if entry[1] == 0]
+
+    def __call__(self, node):
+        state = node.state
+        cost = {}
+        remaining = {id(entry): entry[1] for entry in self.ops}
+        op_value = {}
+        queue = [(0, fact) for fact in state]
+        for entry in self.no_pre:
+            for fact in entry[0].add_effects:
+                queue.append((op_cost(entry[0]), fact))
+        heapq.heapify(queue)
+        goals_left = set(self.goals)
+
+        while queue:
+            value, fact = heapq.heappop(queue)
+            if fact in cost:
+                continue
+            cost[fact] = value
+            goals_left.discard(fact)
+            if not goals_left:
+                break
+            for entry in self.fact_ops.get(fact, ()):
+                key = id(entry)
+                remaining[key] -= 1
+                op_value[key] = max(op_value.get(key, 0), value)
+                if remaining[key] == 0:
+                    op = entry[0]
+                    new_value = op_value[key] + op_cost(op)
+                    for eff in op.add_effects:
+                        if eff not in cost:
+                            heapq.heappush(queue, (new_value, eff))
+
+        if goals_left:
+            return INF
+        return max((cost[g] for g in self.goals), default=0)
+
+
+class EmergenciasHeuristic:
+    """
+    Heurística admisible específica de los dominios emergencias.
+
+    h = coste de acciones de entrega + coste de recogidas + cota de viaje
+
+    - Entregas: cada objetivo (person-has p c) pendiente necesita su propio
+      leave, porque cada leave consigue un único person-has.
+    - Recogidas: cada leave necesita una caja en la garra y cada caja solo
+      sirve a un objetivo (leave borra box-has). Si hay n_c objetivos de un
+      contenido c y k_c cajas de c ya cogidas, hacen falta al menos
+      n_c - k_c pick/take-from-carrier. Cuando move exige (free ?d), una
+      caja que no está ya en la localización de la persona tiene que viajar
+      en el transportador (put-in-carrier + take-from-carrier); la suma por
+      objetivo del mínimo de esas acciones es otra cota y se usa la mayor.
+    - Viaje: las localizaciones de las personas pendientes deben visitarse,
+      igual que el único punto donde quedan cajas de un contenido si todas
+      están en el mismo sitio (normalmente el deposito). El conjunto de
+      recorridos de los drones contiene un árbol que une esas localizaciones
+      con sus posiciones actuales, así que el árbol de expansión mínimo
+      (MST) sobre las distancias mínimas de fly-cost, con las posiciones de
+      los drones contraídas en un único nodo, es una cota inferior.
+
+    Los términos se refieren a acciones distintas (leave, pick/take y
+    move/move-carrier), así que la suma no sobreestima.
+    """
+
+    ACQUIRE = ("pick", "take-from-carrier")
+    MOVES = ("move", "move-carrier")
+
+    def __init__(self, task):
+        self.goals = []
+        for fact in task.goals:
+            atom = str_to_atom(fact)
+            if atom[0] == "person-has":
+                self.goals.append((fact, atom[1], atom[2]))
+
+        self.person_loc = {}
+        self.cost = {}
+        locations = set()
+        move_cost = {}
+        move_needs_free = True
+        for op in task.operators:
+            args = op_args(op)
+            cost = op_cost(op)
+            self.cost[args[0]] = min(self.cost.get(args[0], INF), cost)
+            if args[0] == "leave":
+                self.person_loc[args[-2]] = args[2]
+            elif args[0] in self.MOVES:
+                a, b = args[1], args[2]
+                locations.update((a, b))
+                move_cost[(a, b)] = min(move_cost.get((a, b), INF), cost)
+                if not any(pre.startswith("(free ") for pre in op.preconditions):
+                    move_needs_free = False
+        self.leave_cost = self.cost.get("leave", 0)
+        self.acquire_cost = min((self.cost[a] for a in self.ACQUIRE if a in self.cost), default=0)
+
+        # En los dominios con transportador el dron no vuela con la caja en la
+        # garra: para llevarla a otra localización debe ir en el transportador.
+        pick = self.cost.get("pick", INF)
+        put = self.cost.get("put-in-carrier", INF)
+        take = self.cost.get("take-from-carrier", INF)
+        via_carrier = put + take if move_needs_free else 0
+        self.hand_cost = {
+            "carried_here": 0,
+            "carried_away": via_carrier,
+            "ground_here": pick,
+            "ground_away": pick + via_carrier,
+            "in_carrier": take,
+        }
+
+        self.dist = self._shortest_paths(sorted(locations), move_cost)
+        self.parsed = {fact: str_to_atom(fact) for fact in task.facts}
+
+    @staticmethod
+    def _shortest_paths(locations, move_cost):
+        """Floyd-Warshall y simetrización: dist[a][b] = min(d(a,b), d(b,a))."""
+        d = {a: {b: (0 if a == b else move_cost.get((a, b), INF)) for b in locations} for a in locations}
+        for k in locations:
+            dk = d[k]
+            for i in locations:
+                dik = d[i][k]
+                if dik == INF:
+                    continue
+                di = d[i]
+                for j in locations:
+                    if dik + dk[j] < di[j]:
+                        di[j] = dik + dk[j]
+        return {a: {b: min(d[a][b], d[b][a]) for b in locations} for a in locations}
+
+    def _travel_bound(self, targets, starts):
+        """MST (Prim) sobre targets con todas las posiciones de salida contraídas."""
+        pending = [t for t in targets if t not in starts]
+        if not pending:
+            return 0
+        dist = self.dist
+        best = {t: min((dist[s].get(t, INF) for s in starts if s in dist), default=INF) for t in pending}
+        total = 0
+        while best:
+            t = min(best, key=best.get)
+            value = best.pop(t)
+            if value == INF:
+                return INF
+            total += value
+            row = dist.get(t, {})
+            for other in best:
+                if row.get(other, INF) < best[other]:
+                    best[other] = row[other]
+        return total
+
+    def _hand_cost(self, box, loc, carried, box_loc, dron_loc):
+        """Coste mínimo de tener la caja en la garra de un dron situado en loc."""
+        cost = self.hand_cost
+        if box in carried:
+            here = dron_loc.get(carried[box]) == loc
+            return cost["carried_here"] if here else cost["carried_away"]
+        if box in box_loc:
+            return cost["ground_here"] if box_loc[box] == loc else cost["ground_away"]
+        return cost["in_carrier"]
+
+    def __call__(self, node):
+        state = node.state
+        pending = [(p, c) for fact, p, c in self.goals if fact not in state]
+        if not pending:
+            return 0
+
+        content = {}
+        carried = {}
+        box_loc = {}
+        in_carrier = {}
+        carrier_loc = {}
+        dron_loc = {}
+        for fact in state:
+            atom = self.parsed.get(fact) or str_to_atom(fact)
+            pred = atom[0]
+            if pred == "box-has":
+                content[atom[1]] = atom[2]
+            elif pred == "carrying":
+                carried[atom[-1]] = atom[1]
+            elif pred == "at-box":
+                box_loc[atom[1]] = atom[2]
+            elif pred == "in-carrier":
+                in_carrier[atom[1]] = atom[2]
+            elif pred == "at-carrier":
+                carrier_loc[atom[1]] = atom[2]
+            elif pred == "at-dron":
+                dron_loc[atom[1]] = atom[2]
+        drones = set(dron_loc.values())
+
+        pending_by_content = {}
+        for p, c in pending:
+            pending_by_content.setdefault(c, []).append(self.person_loc.get(p))
+
+        h = 0
+        targets = {loc for locs in pending_by_content.values() for loc in locs}
+        for c, goal_locs in pending_by_content.items():
+            n = len(goal_locs)
+            boxes = [b for b, bc in content.items() if bc == c]
+            if len(boxes) < n:
+                return INF
+            in_hand = sum(1 for b in boxes if b in carried)
+            acquire = max(0, n - in_hand)
+
+            # Cota 1: hace falta coger al menos n - k cajas.
+            # Cota 2: cada objetivo necesita su propia caja; se suma, para cada
+            # uno, lo mínimo que cuesta tener alguna caja de c en la garra en
+            # la localización de la persona. Ambas cuentan las mismas acciones
+            # (pick/put/take), así que se toma el máximo.
+            per_goal = sum(min(self._hand_cost(b, loc, carried, box_loc, dron_loc) for b in boxes)
+                           for loc in goal_locs)
+            h += n * self.leave_cost + max(acquire * self.acquire_cost, per_goal)
+            if per_goal == INF:
+                return INF
+
+            if acquire:
+                places = set()
+                for b in boxes:
+                    if b in carried:
+                        continue
+                    if b in box_loc:
+                        places.add(box_loc[b])
+                    elif b in in_carrier:
+                        places.add(carrier_loc.get(in_carrier[b]))
+                if len(places) == 1:
+                    targets |= places
+
+        targets.discard(None)
+        return h + self._travel_bound(targets, drones)
+
+
+HEURISTICS = {
+    "blind": BlindHeuristic,
+    "hmax": HMaxHeuristic,
+    "emergencias": EmergenciasHeuristic,
+}
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Parser PDDL para la familia de dominios "emergencias".
+
+Cubre los dialectos que hay en el repositorio:
+    - STRIPS con tipos (Parte-1, Parte-2/Ejercicio1)
+    - :action-costs con (increase (total-cost) ...) (Parte-2/Ejercicio2)
+    - :durative-actions con condiciones/efectos at start, over all y at end
+      (Parte-3)
+
+El dominio y el problema se devuelven como diccionarios sencillos; los átomos
+se representan como tuplas ("at-dron", "dron1", "deposito").
+
+Los problemas se leen por secciones con un lector que avanza por el buffer
+(_Reader, sobre mmap en los ficheros grandes) sin construir el árbol
+completo ni la lista de tokens: los problemas con matrices fly-cost densas
+crecen con el cuadrado de las localizaciones (1000 refugios son un millón
+de líneas).
+
+    - :init se delimita buscando la siguiente sección y sus hechos, planos
+      o (= (f a b) k), se extraen con findall en bloques de CHUNK bytes
+      cortados entre dos hechos (solo se copia y decodifica un bloque a la
+      vez); si hay comentarios o hechos más anidados se lee hecho a hecho.
+      Los nombres se comparten (sys.intern) entre todos los átomos.
+    - El resto de secciones son pequeñas y se construyen como listas.
+    - Con parse_problem(..., dense=True) las funciones numéricas de dos
+      argumentos (fly-cost) van a una matriz de NumPy en lugar del
+      diccionario numeric.
+"""
+
+import gc
+import mmap
+import os
+import re
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TOKEN_RE = re.compile(r"\(|\)|[^\s()]+")
+BYTE_TOKEN_RE = re.compile(rb";[^\n]*|\(|\)|[^\s();]+")
+# Salta blancos y comentarios y lee un token
+NEXT_RE = re.compile(rb"(?:\s+|;[^\n]*)*(\(|\)|[^\s();]+)?")
+# Hechos de :init: (= (función args) valor) o átomo plano
+FACT_RE = re.compile(r"\(\s*=\s*\(\s*([^\s()]+)([^()]*)\)\s*([^\s()]+)\s*\)|\(([^()]*)\)")
+# Entre dos hechos de :init
+BOUNDARY_RE = re.compile(rb"\)\s*\(")
+MMAP_MIN = 1 << 20
+CHUNK = 1 << 20
+
+
+def tokenize(text):
+    """Divide el texto PDDL en tokens, eliminando comentarios (;)."""
+    text = re.sub(r";[^\n]*", "", text).lower()
+    return TOKEN_RE.findall(text)
+
+
+def parse_sexpr(tokens):
+    """Convierte la lista de tokens en listas anidadas."""
+    stack = [[]]
+    for tok in tokens:
+        if tok == "(":
+            stack.append([])
+        elif tok == ")":
+            if len(stack) == 1:
+                raise ValueError("Paréntesis de cierre sin apertura")
+            expr = stack.pop()
+            stack[-1].append(expr)
+        else:
+            stack[-1].append(tok)
+    if len(stack) != 1:
+        raise ValueError("Paréntesis sin cerrar")
+    return stack[0]
+
+
+class _Reader:
+    """Lectura de s-expresiones token a token sobre un buffer (bytes o mmap)."""
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+        self.names = {}
+
+    def name(self, raw):
+        name = self.names.get(raw)
+        if name is None:
+            name = self.names[raw] = raw.decode("utf-8").lower()
+        return name
+
+    def token(self):
+        """Siguiente token ("(", ")" o nombre), o None al final del buffer."""
+        match = NEXT_RE.match(self.buf, self.pos)
+        self.pos = match.end()
+        raw = match.group(1)
+        if raw is None:
+            return None
+        if raw == b"(" or raw == b")":
+            return raw.decode()
+        return self.name(raw)
+
+    def expr(self):
+        """Resto de una lista ya abierta, como listas anidadas."""
+        stack = [[]]
+        name = self.name
+        for match in BYTE_TOKEN_RE.finditer(self.buf, self.pos):
+            raw = match.group()
+            if raw == b"(":
+                stack.append([])
+            elif raw == b")":
+                expr = stack.pop()
+                if not stack:
+                    self.pos = match.end()
+                    return expr
+                stack[-1].append(expr)
+            elif raw[0] != 59:  # ";": comentario
+                stack[-1].append(name(raw))
+        raise ValueError("Paréntesis sin cerrar")
+
+    def init(self):
+        """
+        Hechos de una sección :init ya abierta, hasta su cierre, por bloques
+        de unos CHUNK bytes. Genera listas de (función, argumentos, valor, "")
+        para (= (función argumentos) valor) y de ("", "", "", cuerpo) para
+        los átomos, con los nombres en minúsculas.
+        """
+        close = self._init_close()
+        start = self.pos
+        while close is not None and start < close:
+            cut = close
+            if close - start > CHUNK:
+                # Entre dos hechos siempre hay ")...(" y dentro de uno no
+                boundary = BOUNDARY_RE.search(self.buf, start + CHUNK, close)
+                if boundary is not None:
+                    cut = boundary.start() + 1
+            text = self.buf[start:cut].decode("utf-8").lower()
+            facts = FACT_RE.findall(text)
+            expected = len(facts) + sum(1 for fact in facts if fact[2])
+            if text.count("(") != expected or text.count(")") != expected:
+                break
+            yield facts
+            start = cut
+        else:
+            if close is not None:
+                self.pos = close + 1
+                return
+        # Comentarios (pueden tener paréntesis) o hechos más anidados: el
+        # resto se lee hecho a hecho
+        self.pos = start
+        facts = []
+        while True:
+            tok = self.token()
+            if tok == ")":
+                yield facts
+                return
+            if tok != "(":
+                raise ValueError("Hecho de :init mal formado")
+            fact = self.expr()
+            if fact and fact[0] == "=":
+                facts.append((fact[1][0], " ".join(fact[1][1:]), fact[2], ""))
+            else:
+                facts.append(("", "", "", " ".join(fact)))
+
+    def _init_close(self):
+        """
+        Posición de la ")" que cierra :init (la anterior a la siguiente
+        sección o a la ")" del define), o None si hay comentarios en medio.
+        """
+        end = self.buf.find(b"(:", self.pos)
+        if end < 0:
+            end = self.buf.rfind(b")", self.pos)
+            if end < 0 or self.buf[end + 1:].strip():
+                return None
+        close = self.buf.rfind(b")", self.pos, end)
+        if close < 0 or self.buf[close + 1:end].strip() or self.buf.find(b";", self.pos, close) >= 0:
+            return None
+        return close
+
+
+def _map_file(path):
+    """Contenido del fichero: mmap de solo lectura si es grande, bytes si no."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN:
+            return f.read()
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _open_define(path):
+    """Lector colocado tras "(define"."""
+    reader = _Reader(_map_file(path))
+    tok = reader.token()
+    if tok is None:
+        raise ValueError(f"Fichero PDDL vacío: {path}")
+    if tok != "(" or reader.token() != "define":
+        raise ValueError(f"Se esperaba (define ...): {path}")
+    return reader
+
+
+def read_sexpr(path):
+    """Lee un fichero PDDL y devuelve su primera expresión."""
+    reader = _Reader(_map_file(path))
+    tok = reader.token()
+    if tok is None:
+        raise ValueError(f"Fichero PDDL vacío: {path}")
+    if tok != "(":
+        return tok
+    return reader.expr()
+
+
+def iter_sections(path):
+    """
+    Secciones de un (define ...) en orden, sin leer el fichero entero.
+    Genera (cabecera, sección); la sección de :init es el generador de
+    bloques de hechos de _Reader.init y se consume antes de seguir.
+    """
+    reader = _open_define(path)
+    while True:
+        tok = reader.token()
+        if tok == ")":
+            return
+        if tok is None:
+            raise ValueError(f"Paréntesis sin cerrar en {path}")
+        if tok != "(":
+            raise ValueError(f"Sección mal formada en {path}: {tok}")
+        head = reader.token()
+        if head == ":init":
+            chunks = reader.init()
+            yield head, chunks
+            for _ in chunks:
+                pass
+        else:
+            yield head, [head] + reader.expr()
+
+
+def parse_typed_list(items):
+    """
+    Interpreta una lista tipada PDDL ("a b - tipo c - otro").
+    Devuelve una lista de pares (nombre, tipo) en el orden original.
+    """
+    result = []
+    pending = []
+    i = 0
+    while i < len(items):
+        if items[i] == "-":
+            for name in pending:
+                result.append((name, items[i + 1]))
+            pending = []
+            i += 2
+        else:
+            pending.append(items[i])
+            i += 1
+    for name in pending:
+        result.append((name, "object"))
+    return result
+
+
+def parse_literals(expr):
+    """
+    Aplana una conjunción en una lista de (positivo, átomo).
+    Acepta (and ...), literales sueltos y (not ...).
+    """
+    if not expr:
+        return []
+    if expr[0] == "and":
+        literals = []
+        for sub in expr[1:]:
+            literals.extend(parse_literals(sub))
+        return literals
+    if expr[0] == "not":
+        return [(False, tuple(expr[1]))]
+    return [(True, tuple(expr))]
+
+
+def parse_effect(expr):
+    """
+    Separa un efecto en (add, delete, cost_expr).
+    cost_expr es la expresión de (increase (total-cost) X) o None.
+    """
+    add, delete, cost = [], [], None
+    parts = expr[1:] if expr and expr[0] == "and" else [expr]
+    for part in parts:
+        if not part:
+            continue
+        if part[0] == "increase" and part[1] == ["total-cost"]:
+            cost = part[2]
+        elif part[0] == "not":
+            delete.append(tuple(part[1]))
+        else:
+            add.append(tuple(part))
+    return add, delete, cost
+
+
+def parse_action(expr):
+    """Interpreta un bloque (:action ...)."""
+    action = {
+        "name": expr[1],
+        "parameters": [],
+        "precondition": [],
+        "add": [],
+        "delete": [],
+        "cost": None,
+    }
+    i = 2
+    while i < len(expr):
+        key, value = expr[i], expr[i + 1]
+        if key == ":parameters":
+            action["parameters"] = parse_typed_list(value)
+        elif key == ":precondition":
+            action["precondition"] = parse_literals(value)
+        elif key == ":effect":
+            action["add"], action["delete"], action["cost"] = parse_effect(value)
+        i += 2
+    return action
+
+
+def _split_timed(expr):
+    """Agrupa los literales de (and (at start ...) (over all ...) ...) por instante."""
+    timed = {"start": [], "all": [], "end": []}
+    parts = expr[1:] if expr and expr[0] == "and" else [expr]
+    for part in parts:
+        if not part:
+            continue
+        if part[0] == "at" and part[1] in ("start", "end"):
+            timed[part[1]].append(part[2])
+        elif part[0] == "over" and part[1] == "all":
+            timed["all"].append(part[2])
+    return timed
+
+
+def parse_durative_action(expr):
+    """
+    Interpreta un bloque (:durative-action ...).
+
+    Además de las partes temporizadas (start_pre, all_pre, end_pre,
+    start_add, start_del, end_add, end_del y duration) se rellenan
+    precondition/add/delete con la versión secuencial comprimida, de modo que
+    grounding.py puede tratar el dominio temporal como uno clásico.
+    """
+    action = {
+        "name": expr[1],
+        "parameters": [],
+        "durative": True,
+        "duration": None,
+        "cost": None,
+    }
+    conditions = {"start": [], "all": [], "end": []}
+    effects = {"start": [], "end": []}
+    i = 2
+    while i < len(expr):
+        key, value = expr[i], expr[i + 1]
+        if key == ":parameters":
+            action["parameters"] = parse_typed_list(value)
+        elif key == ":duration":
+            action["duration"] = value[2]  # (= ?duration expr)
+        elif key == ":condition":
+            conditions = _split_timed(value)
+        elif key == ":effect":
+            effects = _split_timed(value)
+        i += 2
+
+    for when in ("start", "all", "end"):
+        action[f"{when}_pre"] = [lit for c in conditions[when] for lit in parse_literals(c)]
+    for when in ("start", "end"):
+        add, delete = [], []
+        for e in effects[when]:
+            a, d, _ = parse_effect(e)
+            add.extend(a)
+            delete.extend(d)
+        action[f"{when}_add"], action[f"{when}_del"] = add, delete
+
+    start_add = set(action["start_add"])
+    action["precondition"] = action["start_pre"] + action["all_pre"] + [
+        lit for lit in action["end_pre"] if not (lit[0] and lit[1] in start_add)]
+    action["add"] = list(dict.fromkeys(action["start_add"] + action["end_add"]))
+    added = set(action["add"])
+    action["delete"] = [a for a in dict.fromkeys(action["start_del"] + action["end_del"]) if a not in added]
+    return action
+
+
+def parse_domain(path):
+    """Lee un fichero de dominio y devuelve un diccionario con su contenido."""
+    expr = read_sexpr(path)
+    domain = {
+        "name": None,
+        "requirements": [],
+        "types": {},
+        "predicates": {},
+        "functions": {},
+        "actions": [],
+    }
+    for section in expr[1:]:
+        head = section[0]
+        if head == "domain":
+            domain["name"] = section[1]
+        elif head == ":requirements":
+            domain["requirements"] = section[1:]
+        elif head == ":types":
+            for name, parent in parse_typed_list(section[1:]):
+                domain["types"][name] = parent
+        elif head == ":predicates":
+            for pred in section[1:]:
+                domain["predicates"][pred[0]] = parse_typed_list(pred[1:])
+        elif head == ":functions":
+            for item in section[1:]:
+                if isinstance(item, list):
+                    domain["functions"][item[0]] = parse_typed_list(item[1:])
+        elif head == ":action":
+            domain["actions"].append(parse_action(section))
+        elif head == ":durative-action":
+            domain["actions"].append(parse_durative_action(section))
+    return domain
+
+
+def parse_problem(path, dense=False):
+    """
+    Lee un fichero de problema.
+
+    Returns: {name, domain, objects, init, numeric, goal, metric}
+        objects: lista de (nombre, tipo)
+        init:    conjunto de átomos (tuplas)
+        numeric: {("fly-cost", "a", "b"): valor}
+        goal:    lista de átomos
+    Con dense=True las funciones de dos argumentos no van a numeric sino a
+    matrices: {"fly-cost": (índice {objeto: fila}, matriz NumPy)}, con NaN
+    donde no hay valor.
+    """
+    if dense and np is None:
+        raise ValueError("parse_problem(dense=True) necesita NumPy (pip install numpy)")
+    problem = {
+        "name": None,
+        "domain": None,
+        "objects": [],
+        "init": set(),
+        "numeric": {},
+        "goal": [],
+        "metric": None,
+    }
+    if dense:
+        problem["matrices"] = {}
+    # Millones de tuplas nuevas: el recolector de ciclos las recorrería una
+    # y otra vez sin encontrar nada
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for head, section in iter_sections(path):
+            if head == "problem":
+                problem["name"] = section[1]
+            elif head == ":domain":
+                problem["domain"] = section[1]
+            elif head == ":objects":
+                problem["objects"] = parse_typed_list(section[1:])
+            elif head == ":init":
+                _load_init(problem, section, dense)
+            elif head == ":goal":
+                problem["goal"] = [atom for positive, atom in parse_literals(section[1]) if positive]
+            elif head == ":metric":
+                problem["metric"] = section[1:]
+    finally:
+        if enabled:
+            gc.enable()
+    return problem
+
+
+def _load_init(problem, chunks, dense):
+    """Bloques de hechos de _Reader.init en init, numeric y (con dense) matrices."""
+    intern = sys.intern
+    init, numeric = problem["init"], problem["numeric"]
+    cells = {}
+    for facts in chunks:
+        init.update(tuple(map(intern, body.split())) for _, _, value, body in facts if not value)
+        for function, args, value, _ in facts:
+            if not value:
+                continue
+            args = args.split()
+            if dense and len(args) == 2:
+                if function not in cells:
+                    cells[function] = ({}, array("q"), array("q"), array("d"))
+                index, rows, cols, values = cells[function]
+                rows.append(index.setdefault(args[0], len(index)))
+                cols.append(index.setdefault(args[1], len(index)))
+                values.append(float(value))
+            else:
+                numeric[(intern(function),) + tuple(map(intern, args))] = float(value)
+    for function, (index, rows, cols, values) in cells.items():
+        matrix = np.full((len(index), len(index)), np.nan)
+        matrix[np.frombuffer(rows, dtype=np.int64), np.frombuffer(cols, dtype=np.int64)] = \
+            np.frombuffer(values, dtype=np.float64)
+        problem["matrices"][function] = ({intern(name): i for name, i in index.items()}, matrix)
+
+
+def eval_numeric(expr, bindings, numeric):
+    """Evalúa una expresión numérica de coste (constante o función)."""
+    if isinstance(expr, str):
+        return float(expr)
+    if expr[0] in ("+", "-", "*", "/"):
+        a = eval_numeric(expr[1], bindings, numeric)
+        b = eval_numeric(expr[2], bindings, numeric)
+        return {"+": a + b, "-": a - b, "*": a * b, "/": a / b}[expr[0]]
+    key = (expr[0],) + tuple(bindings.get(arg, arg) for arg in expr[1:])
+    return numeric.get(key, 0.0)
+
+
+def atom_to_str(atom):
+    """("at-dron", "dron1", "deposito") -> "(at-dron dron1 deposito)"."""
+    return "(" + " ".join(atom) + ")"
+
+
+def str_to_atom(text):
+    """"(at-dron dron1 deposito)" -> ("at-dron", "dron1", "deposito")."""
+    return tuple(text.strip().strip("()").lower().split())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Planificador en Python para los dominios emergencias.
+
+Interfaz parecida a la de pyperplan: escribe el plan en <problema>.soln y
+muestra en consola las estadísticas de la búsqueda.
+
+Uso:
+    python3 planner.py [-s astar] [-H emergencias] dominio.pddl problema.pddl
+    python3 planner.py --engine pyperplan -s astar -H emergencias dominio problema
+    python3 planner.py --evaluate plan.soln dominio.pddl problema.pddl
+    python3 planner.py --symmetry -s bfs dominio.pddl problema.pddl
+    python3 planner.py --por dominio.pddl problema.pddl
+    python3 planner.py --vrp-bound dominio.pddl problema.pddl
+    python3 planner.py -s gbfs --postopt dominio.pddl problema.pddl
+    python3 planner.py -s rwastar --deadline 60 dominio.pddl problema.pddl
+
+Con --engine pyperplan la búsqueda la hace pyperplan y nuestra heurística
+se usa como evaluador externo. Con --evaluate se imprime el valor heurístico
+de cada estado a lo largo de un plan dado.
+
+--por está desactivado por defecto y conviene dejarlo así: en los dominios
+emergencias no poda ningún sucesor y hace la búsqueda más lenta (mediana
+x1.7, hasta x7.3 en results/por.txt; ver stubborn.py).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from grounding import load_task
+from heuristics import HEURISTICS
+from pddl import str_to_atom
+from postopt import optimize
+from search import SEARCHES, SearchNode
+from stubborn import PrunedTask
+from symmetry import load_canonicalizer
+from vrp import solve_vrp
+
+
+def solve(domain_file, problem_file, search="astar", heuristic="emergencias", weight=None,
+          symmetry=False, por=False, vrp_bound=False, postopt=False, deadline=None, on_solution=None):
+    """
+    Resuelve un problema con el motor propio.
+    Con symmetry=True la detección de duplicados usa estados canónicos y con
+    por=True se expanden solo los conjuntos testarudos (stubborn.py). Con
+    vrp_bound=True el plan de vrp.py sirve de cota superior y de respaldo, y con
+    postopt=True el plan encontrado se mejora con postopt.py. Con rwastar,
+    on_solution recibe cada plan que mejora al anterior y deadline (segundos)
+    corta la búsqueda con el mejor plan encontrado.
+    Returns: {solved, plan, cost, expanded, generated, evaluated, time, ground_time, operators, facts}
+    """
+    start = time.time()
+    task = load_task(domain_file, problem_file)
+    canonical = load_canonicalizer(domain_file, problem_file) if symmetry else None
+    search_task = PrunedTask(task) if por else task
+    ground_time = time.time() - start
+
+    known = None
+    if vrp_bound:
+        try:
+            vrp = solve_vrp(domain_file, problem_file)
+            ops = {str_to_atom(op.name): op for op in task.operators}
+            plan = [ops[str_to_atom(step)] for step in vrp["plan"]]
+            known = {"plan": plan, "cost": sum(op.cost for op in plan)}
+        except (ValueError, KeyError):
+            known = None
+
+    bound = known["cost"] if known else None
+    if search == "bfs":
+        result = SEARCHES["bfs"](search_task, canonical=canonical)
+    else:
+        h = HEURISTICS[heuristic](task)
+        if search == "wastar" and weight is not None:
+            result = SEARCHES["wastar"](search_task, h, weight, canonical=canonical, bound=bound)
+        elif search == "rwastar":
+            result = SEARCHES["rwastar"](search_task, h, canonical=canonical, bound=bound,
+                                         on_solution=on_solution, deadline=deadline)
+        else:
+            result = SEARCHES[search](search_task, h, canonical=canonical, bound=bound)
+
+    if known and (not result["solved"] or result["cost"] >= known["cost"]):
+        # Nada mejor que el plan de vrp.py dentro de la cota
+        result.update(solved=True, plan=known["plan"], cost=known["cost"])
+
+    if postopt and result["solved"]:
+        improved = optimize(domain_file, problem_file, [(None, str_to_atom(op.name), None) for op in result["plan"]])
+        ops = {str_to_atom(op.name): op for op in task.operators}
+        result.update(plan=[ops[str_to_atom(step)] for step in improved["plan"]], cost=improved["cost"],
+                      postopt_time=improved["time"])
+
+    result["time"] = round(time.time() - start, 3)
+    result["ground_time"] = round(ground_time, 3)
+    result.update(operators=len(task.operators), facts=len(task.facts))
+    return result
+
+
+def solve_with_pyperplan(domain_file, problem_file, heuristic="emergencias"):
+    """
+    Usa la búsqueda A* de pyperplan con una de nuestras heurísticas.
+    pyperplan solo cuenta acciones (no usa :action-costs).
+    """
+    try:
+        from pyperplan.planner import search_plan
+        from pyperplan.search import astar_search
+    except ImportError:
+        print("❌ Error: pyperplan no está instalado.")
+        print("   pip install pyperplan --break-system-packages")
+        sys.exit(1)
+    start = time.time()
+    plan = search_plan(domain_file, problem_file, astar_search, HEURISTICS[heuristic])
+    return {
+        "solved": plan is not None,
+        "plan": plan,
+        "cost": len(plan) if plan is not None else None,
+        "time": round(time.time() - start, 3),
+    }
+
+
+def evaluate_plan(domain_file, problem_file, plan_file, heuristic="emergencias"):
+    """Aplica un plan paso a paso y devuelve [(paso, g, h)] con la heurística."""
+    task = load_task(domain_file, problem_file)
+    h = HEURISTICS[heuristic](task)
+    ops = {str_to_atom(op.name): op for op in task.operators}
+
+    with open(plan_file) as f:
+        steps = [l.strip() for l in f if l.strip() and not l.startswith(";")]
+
+    node = SearchNode(task.initial_state)
+    rows = [(0, 0, h(node))]
+    for i, line in enumerate(steps, 1):
+        op = ops.get(str_to_atom(line))
+        if op is None or not op.applicable(node.state):
+            raise ValueError(f"Paso {i} no aplicable: {line}")
+        node = SearchNode(op.apply(node.state), node, op, node.g + op.cost)
+        rows.append((i, node.g, h(node)))
+    return rows
+
+
+def write_plan(plan, path):
+    with open(path, "w") as f:
+        for op in plan:
+            f.write(f"{op.name}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problem")
+    parser.add_argument("-s", "--search", default="astar", choices=sorted(SEARCHES))
+    parser.add_argument("-H", "--heuristic", default="emergencias", choices=sorted(HEURISTICS))
+    parser.add_argument("-w", "--weight", type=float, default=None, help="peso para wastar")
+    parser.add_argument("--engine", default="propio", choices=["propio", "pyperplan"])
+    parser.add_argument("--symmetry", action="store_true", help="poda de estados simétricos")
+    parser.add_argument("--por", action="store_true", help="reducción de orden parcial (stubborn sets); en los dominios emergencias "
+                             "no poda nada y ralentiza la búsqueda (results/por.txt)")
+    parser.add_argument("--vrp-bound", action="store_true", help="usa el plan de vrp.py como cota superior")
+    parser.add_argument("--postopt", action="store_true", help="post-optimiza el plan (postopt.py)")
+    parser.add_argument("--deadline", type=float, default=None, help="límite de tiempo (s) para rwastar")
+    parser.add_argument("--evaluate", metavar="PLAN", help="evalúa la heurística a lo largo de un plan")
+    args = parser.parse_args()
+
+    if args.evaluate:
+        for step, g, h in evaluate_plan(args.domain, args.problem, args.evaluate, args.heuristic):
+            print(f"paso {step:>3} | g = {g:<8} | h = {h}")
+        return
+
+    if args.engine == "pyperplan":
+        result = solve_with_pyperplan(args.domain, args.problem, args.heuristic)
+    else:
+        def report(plan, cost, weight, elapsed):
+            # Cada mejora se escribe ya, así un corte externo deja el mejor plan
+            write_plan(plan, args.problem + ".soln")
+            print(f"Solution found: cost {cost} (w = {weight}, {elapsed}s)", flush=True)
+
+        result = solve(args.domain, args.problem, args.search, args.heuristic, args.weight,
+                       args.symmetry, args.por, args.vrp_bound, args.postopt, args.deadline, report)
+
+    if not result["solved"]:
+        print(f"No se encontró solución ({result['time']}s)")
+        sys.exit(1)
+
+    write_plan(result["plan"], args.problem + ".soln")
+    print(f"Plan length: {len(result['plan'])} step(s).")
+    print(f"Plan cost: {result['cost']}")
+    if "expanded" in result:
+        print(f"{result['expanded']} Nodes expanded")
+        print(f"{result['generated']} Nodes generated")
+        print(f"{result['evaluated']} Nodes evaluated")
+    if "optimal" in result:
+        print(f"Optimal: {result['optimal']}")
+    if "postopt_time" in result:
+        print(f"Postopt time: {result['postopt_time']}")
+    # Tamaño de la tarea y tiempo de instanciación (searchstats.py)
+    if "operators" in result:
+        print(f"Operators: {result['operators']}")
+        print(f"Facts: {result['facts']}")
+    if "ground_time" in result:
+        print(f"Ground time: {result['ground_time']}")
+    print(f"Search time: {result['time']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Post-optimización de planes secuenciales para los dominios emergencias.
+
+Los planes de GBFS/EHC o de lama-first son rápidos de obtener pero traen
+acciones de sobra (23-31 acciones donde el óptimo es mucho más corto, coste
+679 frente a 406). Este módulo los mejora sin volver a buscar, con pasadas
+lineales en la longitud del plan que se repiten mientras el plan mejore:
+
+    1. Ciclos de estados: si el estado tras el paso j es igual al estado tras
+       el paso i < j, los pasos i+1..j no sirven para nada (pares de vuelos
+       ida y vuelta, pick/put-in-carrier/take-from-carrier que se deshacen).
+       Los estados se comparan por un hash de Zobrist que se actualiza con
+       los efectos de cada paso.
+    2. Atajos de vuelos: las cadenas de move (o move-carrier) de un mismo
+       dron sin ninguna otra acción que lo use entre medias se sustituyen
+       por el camino más barato entre el origen y el destino según fly-cost
+       (vrp.Graph). Así se quitan rodeos y, como los fly-cost no cumplen la
+       desigualdad triangular, un vuelo directo caro puede pasar a hacerse
+       con escala.
+    3. Acciones no justificadas: recorriendo el plan hacia atrás se marcan
+       los hechos que necesita algún paso posterior o el objetivo; una acción
+       que no añade ninguno sobra (cajas que se cogen y no se entregan).
+
+El resultado se valida con validate.py y solo se devuelve si es válido y no
+más caro que el original. Los dominios temporales no se tratan: sus planes
+se reordenan con su propio planificador.
+
+Uso:
+    python3 postopt.py dominio.pddl problema.pddl plan [-o salida]
+    python3 postopt.py --all      # planes guardados en el repositorio
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from validate import PRACTICA_DIR, get_validator, read_plan, stored_plans
+from vrp import Graph
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(BASE_DIR, "results", "postopt.txt")
+MOVES = ("move", "move-carrier")
+MAX_ROUNDS = 10
+
+
+class _Context:
+    """Validador, grafo de vuelos y claves de Zobrist de un problema."""
+
+    def __init__(self, validator):
+        self.validator = validator
+        locations = [name for name, kinds in validator.types.items() if "location" in kinds]
+        fly_cost = None
+        if validator.use_costs:
+            fly_cost = {(k[1], k[2]): v for k, v in validator.numeric.items() if k[0] == "fly-cost"}
+        self.graph = Graph(locations, fly_cost)
+        self.rng = random.Random(0)
+        self.keys = []
+
+    def key(self, fact):
+        while len(self.keys) <= fact:
+            self.keys.append(self.rng.getrandbits(64))
+        return self.keys[fact]
+
+
+_contexts = {}
+
+
+def get_context(domain_file, problem_file):
+    """_Context con caché por problema (comparte el Validator de validate.py)."""
+    validator = get_validator(domain_file, problem_file)
+    if id(validator) not in _contexts:
+        _contexts[id(validator)] = _Context(validator)
+    return _contexts[id(validator)]
+
+
+def remove_cycles(ctx, steps):
+    """Pasada 1: elimina los tramos que vuelven a un estado ya visitado."""
+    v = ctx.validator
+    state = set(v.init)
+    h = 0
+    for fact in state:
+        h ^= ctx.key(fact)
+    seen = {h: 0}
+    hashes = [h]
+    out = []
+    for step in steps:
+        g = v.ground(step)
+        for fact in g.delete - g.add:
+            if fact in state:
+                state.discard(fact)
+                h ^= ctx.key(fact)
+        for fact in g.add:
+            if fact not in state:
+                state.add(fact)
+                h ^= ctx.key(fact)
+        out.append(step)
+        previous = seen.get(h)
+        if previous is not None:
+            # Mismo estado que tras el paso previous: se descarta el tramo
+            for old in hashes[previous + 1:]:
+                del seen[old]
+            del hashes[previous + 1:]
+            del out[previous:]
+        else:
+            seen[h] = len(out)
+            hashes.append(h)
+    return out
+
+
+def shortcut_moves(ctx, steps):
+    """Pasada 2: cada cadena de vuelos de un dron se cambia por el camino mínimo."""
+    v = ctx.validator
+    out = list(steps)
+    chains = {}          # agentes -> [índices de la cadena]
+    owner = {}           # objeto -> agentes de la cadena abierta que lo usa
+
+    def close(agents):
+        chain = chains.pop(agents)
+        for obj in agents[1:]:
+            owner.pop(obj, None)
+        first, last = out[chain[0]], out[chain[-1]]
+        origin, target = first[1], last[2]
+        old_cost = sum(v.ground(out[i]).cost for i in chain)
+        hops = ctx.graph.path(origin, target)
+        new_cost = ctx.graph.cost(origin, target)
+        if new_cost > old_cost or (new_cost == old_cost and len(hops) >= len(chain)):
+            return
+        for i in chain:
+            out[i] = None
+        route = []
+        current = origin
+        for hop in hops:
+            route.append((first[0], current, hop) + first[3:])
+            current = hop
+        out[chain[-1]] = route
+
+    for i, step in enumerate(steps):
+        agents = (step[0],) + step[3:] if step[0] in MOVES else None
+        touched = {owner[obj] for obj in step[1:] if obj in owner}
+        for other in touched:
+            if other != agents:
+                close(other)
+        if agents is None:
+            continue
+        if agents in chains:
+            chains[agents].append(i)
+        else:
+            chains[agents] = [i]
+            for obj in agents[1:]:
+                owner[obj] = agents
+    for agents in list(chains):
+        close(agents)
+
+    result = []
+    for item in out:
+        if isinstance(item, list):
+            result.extend(item)
+        elif item is not None:
+            result.append(item)
+    return result
+
+
+def remove_unjustified(ctx, steps):
+    """Pasada 3: quita las acciones que no aportan ningún hecho necesario."""
+    v = ctx.validator
+    needed = set(v.goal)
+    kept = []
+    for step in reversed(steps):
+        g = v.ground(step)
+        if g.neg or g.add & needed:
+            needed -= g.add
+            needed |= g.pre
+            kept.append(step)
+    kept.reverse()
+    return kept
+
+
+def optimize(domain_file, problem_file, plan):
+    """
+    Post-optimiza un plan secuencial (ruta, líneas o salida de parse_plan).
+    Returns: {plan, cost, length, original_cost, original_length, valid, time}
+    """
+    if isinstance(plan, str):
+        plan = read_plan(plan)
+    start = time.time()
+    ctx = get_context(domain_file, problem_file)
+    v = ctx.validator
+    if v.temporal:
+        raise ValueError("postopt.py solo trata dominios secuenciales")
+    original = v.validate(plan)
+    steps = [step for _, step, _ in plan]
+    best, best_cost = steps, original["cost"]
+
+    if original["valid"]:
+        for _ in range(MAX_ROUNDS):
+            candidate = remove_unjustified(ctx, shortcut_moves(ctx, remove_cycles(ctx, best)))
+            check = v.validate([(None, step, None) for step in candidate])
+            if not check["valid"] or (check["cost"], len(candidate)) >= (best_cost, len(best)):
+                break
+            best, best_cost = candidate, check["cost"]
+
+    return {
+        "plan": [f"({' '.join(step)})" for step in best],
+        "cost": best_cost,
+        "length": len(best),
+        "original_cost": original["cost"],
+        "original_length": len(steps),
+        "valid": original["valid"],
+        "time": round(time.time() - start, 4),
+    }
+
+
+def write_plan(result, path):
+    with open(path, "w") as f:
+        for step in result["plan"]:
+            f.write(step + "\n")
+        f.write(f"; cost = {result['cost']} (original {result['original_cost']}, "
+                f"postopt {result['time']}s)\n")
+
+
+def optimize_stored():
+    """Post-optimiza los planes secuenciales guardados y escribe results/postopt.txt."""
+    header = (f"{'Plan':<72} | {'Long.':>5} | {'Long.opt':>8} | {'Coste':>6} | {'Coste opt':>9} | "
+              f"{'Tiempo(s)':>9}")
+    lines = [f"POST-OPTIMIZACIÓN DE PLANES GUARDADOS - {time.strftime('%Y-%m-%d %H:%M:%S')}", "",
+             header, "-" * len(header)]
+    total = improved = 0
+    before = after = 0
+    for path, domain, problem in stored_plans():
+        if not (domain and problem) or get_validator(domain, problem).temporal:
+            continue
+        result = optimize(domain, problem, path)
+        if not result["valid"]:
+            continue
+        total += 1
+        improved += result["cost"] < result["original_cost"] or result["length"] < result["original_length"]
+        before += result["original_cost"]
+        after += result["cost"]
+        lines.append(f"{os.path.relpath(path, PRACTICA_DIR):<72} | {result['original_length']:>5} | "
+                     f"{result['length']:>8} | {result['original_cost']:>6} | {result['cost']:>9} | "
+                     f"{result['time']:>9}")
+    lines += ["", f"{total} planes válidos, {improved} mejorados | coste total {before} -> {after}"]
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(lines[-1])
+    print(f"📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain", nargs="?")
+    parser.add_argument("problem", nargs="?")
+    parser.add_argument("plan", nargs="?")
+    parser.add_argument("-o", "--output", help="fichero del plan mejorado (por defecto <plan>.opt)")
+    parser.add_argument("--all", action="store_true", help="post-optimiza los planes guardados del repositorio")
+    args = parser.parse_args()
+
+    if args.all:
+        optimize_stored()
+        return
+    if not (args.domain and args.problem and args.plan):
+        parser.error("hacen falta dominio, problema y plan")
+    result = optimize(args.domain, args.problem, args.plan)
+    if not result["valid"]:
+        print(f"❌ El plan de entrada no es válido: {args.plan}")
+        sys.exit(1)
+    output = args.output or args.plan + ".opt"
+    write_plan(result, output)
+    print(f"Acciones: {result['original_length']} -> {result['length']}")
+    print(f"Coste: {result['original_cost']} -> {result['cost']}")
+    print(f"Tiempo de optimización: {result['time']}s")
+    print(f"📄 Plan mejorado en: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Detección de regresiones de rendimiento entre dos campañas de benchmark.
+
+Tras cambiar un dominio (p. ej. de BASE_domainemergencias.pddl a
+domainemergencias.pddl en Parte-2/Ejercicio1) o de versión de planificador,
+las ralentizaciones se buscaban a ojo en las tablas. Este comando compara la
+campaña base A con la nueva B del almacén de resultados (runs.py):
+
+    - Campaña: ids de sesión separados por comas ("3,4") de la base --db, o
+      un directorio con un runs.sqlite (copia de results/ de otra máquina o
+      de otro checkout), con todas sus sesiones o las de "dir:3,4".
+    - Las ejecuciones se emparejan por planificador, configuración y hash
+      del problema (el nombre si no hay hash).
+    - Tiempo y memoria: cociente de medianas B/A de las ejecuciones
+      resueltas. Con al menos 2 ejecuciones en cada lado se exige además
+      que el intervalo bootstrap del cociente (trials.py) no contenga 1; con
+      una sola solo cuenta el umbral ("sin test").
+    - Resolución: un problema que A resuelve en todas sus ejecuciones y B en
+      ninguna.
+    - Tamaño máximo resuelto (params.size) por planificador y configuración.
+
+Sale con código 1 si hay alguna regresión por encima de los umbrales, así que
+sirve de puerta para cambios en los dominios.
+
+Uso:
+    python3 regress.py A B [--tiempo 0.10] [--memoria 0.10] [--tamaño 0] [--db RUTA]
+    python3 regress.py 3 5
+    python3 regress.py /ruta/results_antes:1,2 7
+"""
+
+import argparse
+import os
+import random
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+from runs import DEFAULT_DB, load
+from trials import _ratio, bootstrap
+
+MIN_SAMPLES = 2
+
+
+def load_campaign(spec, db=None):
+    """Ejecuciones de una campaña ("3,4", "dir" o "dir:3,4")."""
+    path, _, ids = spec.rpartition(":") if ":" in spec else ("", "", spec)
+    if not path and os.path.isdir(spec):
+        path, ids = spec, ""
+    if path:
+        db = os.path.join(path, "runs.sqlite")
+        if not os.path.exists(db):
+            raise ValueError(f"No hay runs.sqlite en {path}")
+    sessions = [int(i) for i in ids.split(",") if i.strip()]
+    if not sessions:
+        rows = load(db)
+    else:
+        marks = ", ".join("?" * len(sessions))
+        rows = load(db, where=f"runs.session IN ({marks})", args=sessions)
+    if not rows:
+        raise ValueError(f"La campaña {spec} no tiene ejecuciones")
+    return rows
+
+
+def _group(rows):
+    groups = {}
+    for run in rows:
+        key = (run["planner"], run["config"], run["problem_hash"] or run["problem"])
+        groups.setdefault(key, []).append(run)
+    return groups
+
+
+def _metric(a, b, column, threshold, rng):
+    """(cociente B/A, intervalo o None, regresión) de column en las ejecuciones resueltas."""
+    values_a = [r[column] for r in a if r["status"] == "ok" and r[column] is not None]
+    values_b = [r[column] for r in b if r["status"] == "ok" and r[column] is not None]
+    if not values_a or not values_b:
+        return None
+    ratio = _ratio(values_b, values_a)
+    interval = None
+    significant = True
+    if len(values_a) >= MIN_SAMPLES and len(values_b) >= MIN_SAMPLES:
+        interval = bootstrap(_ratio, [values_b, values_a], rng)
+        significant = interval[0] > 1
+    return ratio, interval, ratio > 1 + threshold and significant
+
+
+def compare_campaigns(rows_a, rows_b, time_threshold=0.10, memory_threshold=0.10, size_threshold=0, seed=0):
+    """
+    Compara dos campañas.
+    Returns: {"matched": n, "findings": [(tipo, planificador, config, problema, detalle, resultado)]}
+    con resultado REGRESIÓN, mejora o tolerado (por debajo del umbral o no significativo).
+    """
+    rng = random.Random(seed)
+    groups_a, groups_b = _group(rows_a), _group(rows_b)
+    findings = []
+    matched = 0
+    for key in sorted(set(groups_a) & set(groups_b)):
+        matched += 1
+        a, b = groups_a[key], groups_b[key]
+        planner, config, _ = key
+        problem = b[-1]["problem"]
+        for kind, column, threshold in (("tiempo", "wall", time_threshold), ("memoria", "rss", memory_threshold)):
+            result = _metric(a, b, column, threshold, rng)
+            if result is None:
+                continue
+            ratio, interval, regression = result
+            test = f"IC [{interval[0]:.2f}, {interval[1]:.2f}]" if interval else "sin test"
+            if regression:
+                label = "REGRESIÓN"
+            elif ratio < 1 / (1 + threshold) and (interval is None or interval[1] < 1):
+                label = "mejora"
+            elif ratio > 1 + threshold or ratio < 1 / (1 + threshold):
+                label = "tolerado"
+            else:
+                continue
+            findings.append((kind, planner, config, problem, f"B/A {ratio:.2f} ({test})", label))
+        solved_a = sum(r["status"] == "ok" for r in a)
+        solved_b = sum(r["status"] == "ok" for r in b)
+        if solved_a == len(a) and solved_b == 0:
+            findings.append(("resolución", planner, config, problem,
+                             f"A {solved_a}/{len(a)}, B 0/{len(b)} ({b[-1]['status']})", "REGRESIÓN"))
+
+    def largest(rows):
+        sizes = {}
+        for run in rows:
+            size = run["params"].get("size")
+            if size is not None:
+                best = sizes.setdefault((run["planner"], run["config"]), 0)
+                if run["status"] == "ok":
+                    sizes[(run["planner"], run["config"])] = max(best, size)
+        return sizes
+
+    sizes_a, sizes_b = largest(rows_a), largest(rows_b)
+    for key in sorted(set(sizes_a) & set(sizes_b)):
+        lost = sizes_a[key] - sizes_b[key]
+        if lost:
+            label = "REGRESIÓN" if lost > size_threshold else "mejora" if lost < 0 else "tolerado"
+            findings.append(("tamaño máx.", key[0], key[1], "-", f"A {sizes_a[key]}, B {sizes_b[key]}", label))
+    return {"matched": matched, "findings": findings}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base", help="campaña A (ids de sesión, directorio o directorio:ids)")
+    parser.add_argument("nueva", help="campaña B")
+    parser.add_argument("--db", default=None, help=f"base de datos (por defecto {DEFAULT_DB})")
+    parser.add_argument("--tiempo", type=float, default=0.10, help="ralentización tolerada (0.10 = 10%%)")
+    parser.add_argument("--memoria", type=float, default=0.10, help="aumento de memoria tolerado")
+    parser.add_argument("--tamaño", type=int, default=0, help="pérdida de tamaño máximo resuelto tolerada")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        rows_a = load_campaign(args.base, args.db)
+        rows_b = load_campaign(args.nueva, args.db)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    result = compare_campaigns(rows_a, rows_b, args.tiempo, args.memoria, args.tamaño, args.seed)
+
+    print(f"Campaña A: {args.base} ({len(rows_a)} ejecuciones), B: {args.nueva} ({len(rows_b)} ejecuciones), "
+          f"{result['matched']} pares emparejados")
+    if not result["matched"]:
+        print("❌ Ninguna ejecución coincide en planificador, configuración y problema")
+        sys.exit(2)
+    header = f"{'Tipo':<12} | {'Planificador':<12} | {'Configuración':<20} | {'Problema':<24} | {'Detalle':<32} | Resultado"
+    print(header)
+    print("-" * len(header))
+    for kind, planner, config, problem, detail, label in result["findings"]:
+        print(f"{kind:<12} | {planner:<12} | {config:<20} | {problem:<24} | {detail:<32} | {label}")
+    regressions = sum(1 for finding in result["findings"] if finding[-1] == "REGRESIÓN")
+    if regressions:
+        print(f"\n❌ {regressions} regresiones")
+        sys.exit(1)
+    print("\n✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Reparación incremental de planes para los dominios emergencias.
+
+Mientras se ejecuta un plan de reparto llegan necesidades nuevas
+(person-has) o desaparecen otras. En vez de buscar desde cero cada vez, se
+repara la parte del plan que queda por ejecutar:
+
+    1. Se aplica el prefijo ya ejecutado para obtener el estado actual.
+    2. Objetivos retirados: se quitan del resto del plan las acciones de la
+       caja que se iba a entregar (pick, put, take y leave). Los contadores
+       del transportador de las acciones siguientes se reajustan y después
+       se quitan las acciones que ya no justifica ningún objetivo.
+    3. Inserción: en varios puntos del resto del plan se inserta un subplan
+       que solo resuelve los objetivos que faltan (búsqueda pequeña desde el
+       estado de ese punto). Tras el subplan, los drones y transportadores
+       vuelven a donde los espera el resto del plan.
+    4. Nueva cola: se conserva el resto del plan hasta el punto más tardío
+       desde el que todos los objetivos siguen siendo alcanzables (una caja
+       ya entregada a un objetivo retirado hace falta para uno nuevo, por
+       ejemplo) y desde ahí se busca. Con el punto 0 esto es replanificar
+       desde el estado actual, el último recurso.
+
+Las cadenas de vuelos de cada candidato se acortan con
+postopt.shortcut_moves y se queda el candidato válido más barato.
+
+La tarea instanciada se guarda en caché por problema, así que las
+reparaciones sucesivas no vuelven a instanciar el dominio.
+
+Uso:
+    python3 repair.py dominio.pddl problema.pddl plan -e 10 \\
+        --add "(person-has person1 comida)" --remove "(person-has person5 comida)"
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from grounding import Task, load_task
+from heuristics import HEURISTICS
+from pddl import atom_to_str, str_to_atom
+from postopt import get_context, shortcut_moves
+from search import SEARCHES
+from validate import read_plan
+
+CANDIDATES = 8
+
+
+class Repairer:
+    """Repara planes de un problema concreto (la tarea se instancia una vez)."""
+
+    def __init__(self, domain_file, problem_file):
+        self.task = load_task(domain_file, problem_file)
+        self.ops = {str_to_atom(op.name): op for op in self.task.operators}
+        self.ctx = get_context(domain_file, problem_file)
+        types = self.ctx.validator.types
+        self.boxes = {obj for obj, kinds in types.items() if "box" in kinds}
+        # Variantes de cada acción que solo difieren en los contadores n0..nK
+        self.numbers = {obj for obj, kinds in types.items() if "num" in kinds}
+        self.variants = {}
+        for args, op in self.ops.items():
+            self.variants.setdefault(self._shape(args), []).append(op)
+
+    def _shape(self, args):
+        return tuple(None if a in self.numbers else a for a in args)
+
+    def _op(self, step):
+        op = self.ops.get(str_to_atom(step) if isinstance(step, str) else tuple(step))
+        if op is None:
+            raise ValueError(f"acción desconocida: {step}")
+        return op
+
+    def _search(self, state, goals, search, heuristic):
+        """Búsqueda desde state hasta goals con la configuración dada."""
+        t = self.task
+        sub = Task(t.name, t.facts, frozenset(state), frozenset(goals), t.operators, t.static, t.numeric)
+        if search == "bfs":
+            return SEARCHES["bfs"](sub)
+        return SEARCHES[search](sub, HEURISTICS[heuristic](sub))
+
+    @staticmethod
+    def _justify(ops, goals):
+        """Quita las acciones que no aportan ningún hecho necesario para goals."""
+        needed = set(goals)
+        kept = []
+        for op in reversed(ops):
+            if op.add_effects & needed:
+                needed -= op.add_effects
+                needed |= op.preconditions
+                kept.append(op)
+        kept.reverse()
+        return kept
+
+    @staticmethod
+    def _replay(state, ops, goals):
+        """Coste del plan si es aplicable desde state y alcanza goals; None si no."""
+        cost = 0
+        for op in ops:
+            if not op.applicable(state):
+                return None
+            state = op.apply(state)
+            cost += op.cost
+        return cost if goals <= state else None
+
+    def _realign(self, state, ops):
+        """
+        Reproduce ops desde state cambiando cada acción no aplicable por la
+        variante con los contadores del transportador correctos (al quitar o
+        insertar un put-in-carrier cambian los n de los siguientes).
+        Devuelve la lista corregida o None si alguna acción no tiene arreglo.
+        """
+        result = []
+        for op in ops:
+            if not op.applicable(state):
+                op = next((o for o in self.variants.get(self._shape(str_to_atom(op.name)), ())
+                           if o.applicable(state)), None)
+                if op is None:
+                    return None
+            state = op.apply(state)
+            result.append(op)
+        return result
+
+    def _drop_deliveries(self, state, suffix, removed):
+        """Quita del resto del plan todo lo que mueve las cajas destinadas a objetivos retirados."""
+        boxes = set()
+        for op in suffix:
+            if op.add_effects & removed:
+                boxes |= self.boxes & set(str_to_atom(op.name)[1:])
+        if not boxes:
+            return suffix
+        kept = [op for op in suffix if not boxes & set(str_to_atom(op.name)[1:])]
+        steps = shortcut_moves(self.ctx, [str_to_atom(op.name) for op in kept])
+        realigned = self._realign(state, [self.ops[step] for step in steps if step in self.ops])
+        return realigned if realigned is not None and len(realigned) == len(steps) else suffix
+
+    def _anchor(self, before, after):
+        """Vuelos que devuelven drones y transportadores a su posición en before."""
+        where = {}
+        for fact in before - after:
+            atom = str_to_atom(fact)
+            if atom[0] in ("at-dron", "at-carrier"):
+                where[atom[1]] = atom[2]
+        if not where:
+            return []
+        now = {}
+        for fact in after:
+            atom = str_to_atom(fact)
+            if atom[0] in ("at-dron", "at-carrier"):
+                now[atom[1]] = atom[2]
+
+        steps = []
+        drones = [obj for obj in where if f"(at-dron {obj} {now.get(obj)})" in after]
+        for dron in sorted(drones):
+            loc = now[dron]
+            # El transportador que estaba con el dron y también se ha movido vuelve con él
+            carriers = [c for c in where if c not in drones and now.get(c) == loc and where[c] == where[dron]]
+            hops = self.ctx.graph.path(loc, where[dron])
+            for hop in hops:
+                if carriers:
+                    steps.append(("move-carrier", loc, hop, dron, carriers[0]))
+                else:
+                    steps.append(("move", loc, hop, dron))
+                loc = hop
+        return steps
+
+    def _finish(self, state, ops, goals):
+        """Acorta los vuelos del plan candidato y devuelve (coste, ops) o None si no es válido."""
+        steps = shortcut_moves(self.ctx, [str_to_atom(op.name) for op in ops])
+        if not all(step in self.ops for step in steps):
+            return None
+        ops = self._realign(state, [self.ops[step] for step in steps])
+        if ops is None:
+            return None
+        cost = self._replay(state, ops, goals)
+        return None if cost is None else (cost, ops)
+
+    def _insertions(self, states, suffix, missing, goals, points, search, heuristic):
+        """Subplan para missing insertado en cada punto, con vuelta de drones y transportadores."""
+        found = []
+        for i in points:
+            sub = self._search(states[i], missing, search, heuristic)
+            if not sub["solved"]:
+                continue
+            after = states[i]
+            for op in sub["plan"]:
+                after = op.apply(after)
+            try:
+                anchor = [self.ops[step] for step in self._anchor(states[i], after)]
+            except KeyError:
+                continue
+            candidate = self._finish(states[0], suffix[:i] + sub["plan"] + anchor + suffix[i:], goals)
+            if candidate:
+                found.append(candidate + (i, "inserción"))
+        return found
+
+    def _tails(self, states, suffix, goals, points, search, heuristic):
+        """Se conserva el plan hasta el punto más tardío desde el que los objetivos son alcanzables."""
+        for i in sorted(points, reverse=True):
+            sub = self._search(states[i], goals, search, heuristic)
+            if not sub["solved"]:
+                continue
+            candidate = self._finish(states[0], suffix[:i] + sub["plan"], goals)
+            if candidate:
+                return [candidate + (i, "nueva cola" if i else "replanificación")]
+        return []
+
+    def repair(self, plan, executed, add_goals=(), remove_goals=(), search="astar", heuristic="emergencias",
+               candidates=CANDIDATES):
+        """
+        Repara plan (lista de pasos) cuando ya se han ejecutado sus executed
+        primeros pasos y cambian los objetivos.
+        Returns: {solved, plan, suffix, cost, method, insert_at, time}
+        (method: justificación, inserción, nueva cola o replanificación)
+        """
+        start = time.time()
+        steps = [self._op(step) for step in plan]
+        goals = frozenset(_fact(g) for g in add_goals) | (self.task.goals - {_fact(g) for g in remove_goals})
+
+        state = self.task.initial_state
+        for i, op in enumerate(steps[:executed], 1):
+            if not op.applicable(state):
+                raise ValueError(f"paso {i} del prefijo no aplicable: {op.name}")
+            state = op.apply(state)
+
+        removed = {_fact(g) for g in remove_goals} - goals
+        suffix = self._justify(self._drop_deliveries(state, steps[executed:], removed), goals)
+        reached = state
+        for op in suffix:
+            reached = reached - op.del_effects | op.add_effects
+        missing = goals - reached
+
+        method, insert_at = "justificación", None
+        cost = self._replay(state, suffix, goals) if not missing else None
+        if cost is None:
+            states = [state]
+            for op in suffix:
+                states.append(states[-1] - op.del_effects | op.add_effects)
+            n = len(suffix)
+            points = sorted({0, n} | {round(k * n / candidates) for k in range(candidates)})
+            found = self._insertions(states, suffix, missing, goals, points, search, heuristic) if missing else []
+            found += self._tails(states, suffix, goals, points, search, heuristic)
+            if found:
+                cost, suffix, insert_at, method = min(found, key=lambda c: c[0])
+            else:
+                suffix = None
+
+        solved = suffix is not None
+        return {
+            "solved": solved,
+            "plan": [op.name for op in steps[:executed] + suffix] if solved else None,
+            "suffix": [op.name for op in suffix] if solved else None,
+            "cost": cost,
+            "method": method,
+            "insert_at": insert_at,
+            "time": round(time.time() - start, 4),
+        }
+
+    def replan(self, plan, executed, add_goals=(), remove_goals=(), search="astar", heuristic="emergencias"):
+        """Referencia: búsqueda desde cero en el estado actual con los objetivos nuevos."""
+        start = time.time()
+        goals = frozenset(_fact(g) for g in add_goals) | (self.task.goals - {_fact(g) for g in remove_goals})
+        state = self.task.initial_state
+        for step in plan[:executed]:
+            state = self._op(step).apply(state)
+        result = self._search(state, goals, search, heuristic)
+        return {
+            "solved": result["solved"],
+            "suffix": [op.name for op in result["plan"]] if result["solved"] else None,
+            "cost": result["cost"],
+            "expanded": result["expanded"],
+            "time": round(time.time() - start, 4),
+        }
+
+
+def _fact(goal):
+    """Objetivo como cadena "(person-has p c)" (admite cadena o tupla)."""
+    return atom_to_str(str_to_atom(goal) if isinstance(goal, str) else tuple(goal))
+
+
+_repairers = {}
+
+
+def get_repairer(domain_file, problem_file):
+    """Repairer con caché por (dominio, problema)."""
+    key = (os.path.abspath(domain_file), os.path.abspath(problem_file))
+    if key not in _repairers:
+        _repairers[key] = Repairer(*key)
+    return _repairers[key]
+
+
+def repair_plan(domain_file, problem_file, plan, executed, add_goals=(), remove_goals=(), **kwargs):
+    """Atajo: plan puede ser una ruta o una lista de pasos."""
+    if isinstance(plan, str):
+        plan = [step for _, step, _ in read_plan(plan)]
+    return get_repairer(domain_file, problem_file).repair(plan, executed, add_goals, remove_goals, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problem")
+    parser.add_argument("plan")
+    parser.add_argument("-e", "--executed", type=int, default=0, help="pasos del plan ya ejecutados")
+    parser.add_argument("--add", action="append", default=[], help="objetivo nuevo, p.ej. \"(person-has p1 comida)\"")
+    parser.add_argument("--remove", action="append", default=[], help="objetivo retirado")
+    parser.add_argument("-s", "--search", default="astar", choices=sorted(SEARCHES))
+    parser.add_argument("-H", "--heuristic", default="emergencias", choices=sorted(HEURISTICS))
+    args = parser.parse_args()
+
+    result = repair_plan(args.domain, args.problem, args.plan, args.executed, args.add, args.remove,
+                         search=args.search, heuristic=args.heuristic)
+    if not result["solved"]:
+        print(f"❌ No se pudo reparar el plan ({result['time']}s)")
+        sys.exit(1)
+    for step in result["suffix"]:
+        print(step)
+    where = f" en el paso {args.executed + result['insert_at']}" if result["insert_at"] is not None else ""
+    print(f"; Método: {result['method']}{where}")
+    print(f"; Coste del resto del plan: {result['cost']}")
+    print(f"; Tiempo de reparación: {result['time']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Almacén de resultados de benchmark en SQLite.
+
+Los benchmarks escribían sus resultados como texto libre, tablas Markdown y
+líneas separadas por "|" (summary.txt, resultados_benchmark.txt,
+benchmark.txt...), y graficar.py los volvía a leer partiendo cadenas. Aquí
+cada ejecución es una fila y los informes son consultas:
+
+    - sessions: una por ejecución de un benchmark (nombre, fecha, commit de
+      git y máquina: host, plataforma, CPUs, versión de Python).
+    - runs: planificador, configuración, problema (nombre y hash SHA-1 del
+      contenido, así se reconoce el mismo problema aunque cambie de ruta),
+      parámetros de tamaño (JSON), estado, tiempo de pared, CPU, pico de
+      memoria (MB), longitud, coste, makespan y extra (JSON con lo propio de
+      cada benchmark).
+    - Store.add acumula las filas y Store.flush las escribe en una sola
+      transacción cada BATCH filas y al cerrar; la base va en modo WAL para
+      poder leerla mientras otro benchmark escribe.
+    - run_command ejecuta un planificador externo y mide su CPU y su pico de
+      memoria con wait4 (incluye los procesos hijos que haya esperado, p. ej.
+      el de Fast Downward bajo el contenedor).
+
+Estados: ok, tiempo, memoria, pila, sin plan, inválido, error.
+
+La base por defecto es results/runs.sqlite junto a este fichero (o la de la
+variable de entorno RUNS_DB).
+
+Uso:
+    python3 runs.py sesiones [--db RUTA]
+    python3 runs.py ejecuciones [--benchmark NOMBRE] [--sesion ID] [--csv] [--db RUTA]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import platform
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB = os.environ.get("RUNS_DB", os.path.join(BASE_DIR, "results", "runs.sqlite"))
+BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    benchmark TEXT NOT NULL,
+    started TEXT NOT NULL,
+    git_commit TEXT,
+    host TEXT,
+    platform TEXT,
+    cpus INTEGER,
+    python TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    session INTEGER NOT NULL REFERENCES sessions(id),
+    planner TEXT NOT NULL,
+    config TEXT NOT NULL,
+    problem TEXT NOT NULL,
+    problem_hash TEXT,
+    params TEXT,
+    status TEXT NOT NULL,
+    wall REAL,
+    cpu REAL,
+    rss REAL,
+    length INTEGER,
+    cost REAL,
+    makespan REAL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_session ON runs(session);
+CREATE INDEX IF NOT EXISTS runs_problem ON runs(planner, config, problem_hash);
+"""
+COLUMNS = ["planner", "config", "problem", "problem_hash", "params", "status",
+           "wall", "cpu", "rss", "length", "cost", "makespan", "extra"]
+
+_hashes = {}
+
+
+def connect(path=None):
+    """Conexión a la base (la crea con el esquema si no existe)."""
+    path = path or DEFAULT_DB
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def problem_hash(path):
+    """SHA-1 (16 primeros dígitos) del contenido del problema, en caché por ruta y fecha."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _hashes:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _hashes[key] = digest.hexdigest()[:16]
+    return _hashes[key]
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=BASE_DIR, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_command(command, timeout=None, **kwargs):
+    """
+    Ejecuta command (en su propio grupo de procesos, que se mata entero al
+    pasar timeout) midiendo el proceso con wait4. El pico de memoria incluye
+    lo heredado del padre hasta el exec: por debajo del RSS del benchmark no
+    es significativo.
+    Returns: {stdout, stderr, returncode, timeout, wall, cpu, rss (MB)}
+    """
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen(command, stdout=out, stderr=err, start_new_session=True, **kwargs)
+        expired = threading.Event()
+
+        def kill():
+            expired.set()
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        timer = threading.Timer(timeout, kill) if timeout else None
+        if timer:
+            timer.start()
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        if timer:
+            timer.cancel()
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        out.seek(0)
+        err.seek(0)
+        return {"stdout": out.read().decode(errors="replace"), "stderr": err.read().decode(errors="replace"),
+                "returncode": proc.returncode, "timeout": expired.is_set(), "wall": wall,
+                "cpu": usage.ru_utime + usage.ru_stime, "rss": usage.ru_maxrss / 1024}
+
+
+class Store:
+    """Sesión de un benchmark: acumula ejecuciones y las escribe por lotes."""
+
+    def __init__(self, benchmark, path=None, batch=BATCH):
+        self.conn = connect(path)
+        self.batch = batch
+        self.pending = []
+        with self.conn:
+            self.session = self.conn.execute(
+                "INSERT INTO sessions (benchmark, started, git_commit, host, platform, cpus, python) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (benchmark, time.strftime("%Y-%m-%d %H:%M:%S"), git_commit(), socket.gethostname(),
+                 platform.platform(), os.cpu_count(), platform.python_version())).lastrowid
+
+    def add(self, planner, config, problem, status, params=None, wall=None, cpu=None, rss=None,
+            length=None, cost=None, makespan=None, **extra):
+        """
+        Añade una ejecución. problem es la ruta del fichero (se guarda su
+        nombre y su hash) o un nombre; lo que no tiene columna va a extra.
+        """
+        digest = None
+        if os.path.isfile(problem):
+            digest = problem_hash(problem)
+            problem = os.path.basename(problem)
+        self.pending.append((planner, config or "", problem, digest, json.dumps(params or {}), status,
+                             wall, cpu, rss, length, cost, makespan, json.dumps(extra) if extra else None))
+        if len(self.pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO runs (session, {', '.join(COLUMNS)}) VALUES (?, {', '.join('?' * len(COLUMNS))})",
+                [(self.session,) + row for row in self.pending])
+        self.pending = []
+
+    def query(self, where="1", *args):
+        """Ejecuciones de esta sesión que cumplen where (SQL sobre runs), en orden."""
+        self.flush()
+        return load(session=self.session, where=where, args=args, conn=self.conn)
+
+    def largest(self, config, planner=None):
+        """Ejecución resuelta (ok) de config con mayor params.size, o None."""
+        rows = self.query("config = ? AND status = 'ok' AND (? IS NULL OR planner = ?)", config, planner, planner)
+        return max(rows, key=lambda r: r["params"].get("size", 0), default=None)
+
+    def last(self, config, planner=None):
+        """Última ejecución de config, o None."""
+        rows = self.query("config = ? AND (? IS NULL OR planner = ?)", config, planner, planner)
+        return rows[-1] if rows else None
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load(path=None, benchmark=None, session=None, where="1", args=(), conn=None):
+    """
+    Ejecuciones (dicts con las columnas de runs y de su sesión, params y
+    extra ya decodificados). session="última" es la última del benchmark.
+    """
+    own = conn is None
+    conn = conn or connect(path)
+    try:
+        if session == "última":
+            row = conn.execute("SELECT MAX(id) FROM sessions WHERE ? IS NULL OR benchmark = ?",
+                               (benchmark, benchmark)).fetchone()
+            session = row[0] if row[0] is not None else -1
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(
+            "SELECT runs.*, sessions.benchmark, sessions.started, sessions.git_commit, sessions.host "
+            "FROM runs JOIN sessions ON sessions.id = runs.session "
+            f"WHERE (? IS NULL OR sessions.benchmark = ?) AND (? IS NULL OR runs.session = ?) AND ({where}) "
+            "ORDER BY runs.id", (benchmark, benchmark, session, session) + tuple(args)).fetchall()
+        names = [column[0] for column in cursor.description]
+    finally:
+        if own:
+            conn.close()
+    # params y extra se repiten mucho entre filas: cada texto se decodifica una vez
+    decoded = {None: {}}
+    params, extra = names.index("params"), names.index("extra")
+    result = []
+    for row in rows:
+        run = dict(zip(names, row))
+        for i, key in ((params, "params"), (extra, "extra")):
+            text = row[i]
+            if text not in decoded:
+                decoded[text] = json.loads(text)
+            run[key] = dict(decoded[text])
+        result.append(run)
+    return result
+
+
+def sessions(path=None):
+    conn = connect(path)
+    try:
+        return [dict(row) for row in conn.execute(
+            "SELECT sessions.*, COUNT(runs.id) AS runs FROM sessions LEFT JOIN runs ON runs.session = sessions.id "
+            "GROUP BY sessions.id ORDER BY sessions.id")]
+    finally:
+        conn.close()
+
+
+def _cell(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    if isinstance(value, dict):
+        return " ".join(f"{k}={v}" for k, v in value.items()) or "-"
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("consulta", choices=["sesiones", "ejecuciones"])
+    parser.add_argument("--db", default=None, help=f"base de datos (por defecto {DEFAULT_DB})")
+    parser.add_argument("--benchmark", default=None)
+    parser.add_argument("--sesion", default=None, help="id de sesión o 'última'")
+    parser.add_argument("--csv", action="store_true", help="salida CSV en lugar de tabla")
+    args = parser.parse_args()
+
+    if args.consulta == "sesiones":
+        columns = ["id", "benchmark", "started", "git_commit", "host", "cpus", "runs"]
+        rows = sessions(args.db)
+    else:
+        columns = ["session", "planner", "config", "problem", "params", "status",
+                   "wall", "cpu", "rss", "length", "cost", "makespan"]
+        session = args.sesion if args.sesion in (None, "última") else int(args.sesion)
+        rows = load(args.db, args.benchmark, session)
+
+    if args.csv:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([json.dumps(row[c]) if isinstance(row[c], dict) else row[c] for c in columns])
+        return
+    cells = [[_cell(row[c]) for c in columns] for row in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    header = " | ".join(c.ljust(w) for c, w in zip(columns, widths))
+    print(header)
+    print("-" * len(header))
+    for row in cells:
+        print(" | ".join(v.ljust(w) for v, w in zip(row, widths)))
+
+
+if __name__ == "__main__":
+    main()
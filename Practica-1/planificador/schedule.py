@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Planificación temporal a partir de un plan secuencial (dominio temporal).
+
+OPTIC no encuentra planes con 3 o más drones, pero el problema temporal
+tiene los mismos objetos y acciones que el de costes, así que un plan
+secuencial de cualquier planificador clásico (o de vrp.py) sirve de base.
+Las acciones se instancian con el dominio temporal (validate.Validator) y
+se construye el orden parcial que impone el plan:
+
+    - i depende de la última acción j anterior que escribe (añade o borra,
+      at start o at end) un hecho que i lee o escribe.
+    - i depende de las acciones que leen un hecho que i escribe desde la
+      última escritura.
+
+Los mutex dron-available / carrier-available / person-available hacen que
+las acciones de un mismo dron, transportador o persona queden en serie y
+los hechos de cajas y contadores encadenan las entregas. Cada acción empieza
+en cuanto terminan sus predecesoras (más SEPARATION, como OPTIC) y dura lo
+que dice el dominio (fly-cost o 5), así que el makespan es el del camino
+crítico: el mínimo que admite ese orden parcial. Todo es O(longitud del plan
+· hechos por acción).
+
+Uso:
+    python3 schedule.py dominio_temporal.pddl problema.pddl [plan_secuencial]
+
+Sin plan, el plan secuencial se obtiene con vrp.py sobre el dominio de
+costes de Parte-2/Ejercicio2. El plan temporal se escribe en <problema>.SOL
+con el formato de OPTIC y se valida con validate.py.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pddl import str_to_atom
+from validate import get_validator, read_plan
+from vrp import solve_vrp
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+COSTS_DOMAIN = os.path.join(PRACTICA_DIR, "Parte-2", "Ejercicio2", "domainemergencias_costs.pddl")
+SEPARATION = 0.001
+
+
+def partial_order(grounded):
+    """
+    Predecesoras directas de cada acción del plan secuencial.
+    grounded: lista de acciones instanciadas (validate._Grounded) en orden.
+    """
+    writer = {}
+    readers = {}
+    preds = []
+    for i, g in enumerate(grounded):
+        reads = g.start_pre | g.start_neg | g.all_pre | g.end_pre | g.end_neg
+        writes = g.start_add | g.start_del | g.end_add | g.end_del
+        before = set()
+        for fact in reads | writes:
+            j = writer.get(fact)
+            if j is not None:
+                before.add(j)
+        for fact in writes:
+            before.update(readers.pop(fact, ()))
+            writer[fact] = i
+        for fact in reads - writes:
+            readers.setdefault(fact, []).append(i)
+        before.discard(i)
+        preds.append(before)
+    return preds
+
+
+def schedule(domain_file, problem_file, steps):
+    """
+    Programa un plan secuencial sobre el dominio temporal.
+    steps: lista de átomos (tuplas) en orden.
+    Returns: {plan [(inicio, átomo, duración)], makespan, sequential, time}
+    """
+    start = time.time()
+    v = get_validator(domain_file, problem_file)
+    if not v.temporal:
+        raise ValueError("el dominio no tiene acciones durativas")
+    grounded = [v.ground(step) for step in steps]
+    ends = []
+    plan = []
+    for i, before in enumerate(partial_order(grounded)):
+        begin = max((ends[j] + SEPARATION for j in before), default=0)
+        ends.append(begin + grounded[i].duration)
+        plan.append((round(begin, 3), steps[i], grounded[i].duration))
+    plan.sort(key=lambda p: p[0])
+    return {
+        "plan": plan,
+        "makespan": round(max(ends, default=0), 3),
+        "sequential": round(sum(g.duration for g in grounded) + SEPARATION * max(0, len(grounded) - 1), 3),
+        "time": round(time.time() - start, 4),
+    }
+
+
+def sequential_plan(problem_file, plan_file=None):
+    """Plan secuencial dado (cualquier formato de validate.py) o el de vrp.py."""
+    if plan_file:
+        return [step for _, step, _ in read_plan(plan_file)]
+    return [str_to_atom(step) for step in solve_vrp(COSTS_DOMAIN, problem_file)["plan"]]
+
+
+def write_plan(result, path):
+    with open(path, "w") as f:
+        f.write(f"; Makespan: {result['makespan']} (secuencial {result['sequential']}), "
+                f"programado en {result['time']}s\n\n")
+        for begin, step, duration in result["plan"]:
+            f.write(f"{begin:.3f}: ({' '.join(step)})  [{duration:.3f}]\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problem")
+    parser.add_argument("plan", nargs="?", help="plan secuencial (por defecto, el de vrp.py)")
+    args = parser.parse_args()
+
+    try:
+        result = schedule(args.domain, args.problem, sequential_plan(args.problem, args.plan))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    check = get_validator(args.domain, args.problem).validate(result["plan"])
+    if not check["valid"]:
+        print(f"❌ Plan temporal inválido: {check['error']}")
+        sys.exit(1)
+    write_plan(result, args.problem + ".SOL")
+    print(f"Plan length: {len(result['plan'])} step(s).")
+    print(f"Makespan: {result['makespan']} (secuencial {result['sequential']})")
+    print(f"Schedule time: {result['time']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Algoritmos de búsqueda sobre una Task instanciada.
+
+    - bfs:    Breadth First Search (óptimo en número de acciones)
+    - astar:  A* (óptimo en coste con heurística admisible)
+    - wastar: Weighted A* (f = g + w·h)
+    - gbfs:   Greedy Best First Search (f = h)
+    - rwastar: Restarting Weighted A* anytime (pesos decrecientes)
+
+Todas devuelven un diccionario {solved, plan, cost, expanded, generated,
+evaluated} para que los benchmarks puedan comparar el esfuerzo de búsqueda.
+
+El parámetro opcional canonical (ver symmetry.py) transforma cada estado en
+la clave usada para detectar duplicados; el nodo conserva el estado real.
+Con bound (coste de un plan ya conocido, p.ej. de vrp.py) las búsquedas
+primero-el-mejor descartan los nodos con g + h >= bound: si no encuentran
+nada, el plan conocido ya era óptimo (con heurística admisible).
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+
+
+class SearchNode:
+    """Nodo del espacio de búsqueda (misma interfaz que pyperplan)."""
+
+    __slots__ = ("state", "parent", "action", "g")
+
+    def __init__(self, state, parent=None, action=None, g=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.g = g
+
+    def extract_solution(self):
+        plan = []
+        node = self
+        while node.parent is not None:
+            plan.append(node.action)
+            node = node.parent
+        plan.reverse()
+        return plan
+
+
+def _result(node, expanded, generated, evaluated):
+    if node is None:
+        return {"solved": False, "plan": None, "cost": None,
+                "expanded": expanded, "generated": generated, "evaluated": evaluated}
+    plan = node.extract_solution()
+    return {"solved": True, "plan": plan, "cost": node.g,
+            "expanded": expanded, "generated": generated, "evaluated": evaluated}
+
+
+def _identity(state):
+    return state
+
+
+def breadth_first_search(task, canonical=None):
+    """Búsqueda en anchura con detección de duplicados."""
+    key = canonical or _identity
+    root = SearchNode(task.initial_state)
+    if task.goal_reached(root.state):
+        return _result(root, 0, 1, 0)
+    queue = deque([root])
+    closed = {key(root.state)}
+    expanded = 0
+    generated = 1
+    while queue:
+        node = queue.popleft()
+        expanded += 1
+        for op, succ in task.get_successor_states(node.state):
+            generated += 1
+            succ_key = key(succ)
+            if succ_key in closed:
+                continue
+            child = SearchNode(succ, node, op, node.g + op.cost)
+            if task.goal_reached(succ):
+                return _result(child, expanded, generated, 0)
+            closed.add(succ_key)
+            queue.append(child)
+    return _result(None, expanded, generated, 0)
+
+
+def best_first_search(task, heuristic, f_value, canonical=None, bound=None):
+    """
+    Búsqueda primero-el-mejor genérica con reapertura de nodos.
+    f_value(g, h) decide el orden de expansión (A*, WA*, GBFS).
+    """
+    bound = float("inf") if bound is None else bound
+    key = canonical or _identity
+    counter = itertools.count()
+    root = SearchNode(task.initial_state)
+    h = heuristic(root)
+    evaluated = 1
+    if h == float("inf") or h >= bound:
+        return _result(None, 0, 1, evaluated)
+    root_key = key(root.state)
+    open_list = [(f_value(0, h), h, next(counter), root, root_key)]
+    best_g = {root_key: 0}
+    expanded = 0
+    generated = 1
+
+    while open_list:
+        _, h, _, node, node_key = heapq.heappop(open_list)
+        if best_g[node_key] < node.g:
+            continue  # entrada obsoleta
+        if task.goal_reached(node.state):
+            return _result(node, expanded, generated, evaluated)
+        expanded += 1
+        for op, succ in task.get_successor_states(node.state):
+            generated += 1
+            g = node.g + op.cost
+            succ_key = key(succ)
+            if g >= best_g.get(succ_key, float("inf")):
+                continue
+            best_g[succ_key] = g
+            child = SearchNode(succ, node, op, g)
+            h = heuristic(child)
+            evaluated += 1
+            if h == float("inf") or g + h >= bound:
+                continue
+            heapq.heappush(open_list, (f_value(g, h), h, next(counter), child, succ_key))
+    return _result(None, expanded, generated, evaluated)
+
+
+def astar_search(task, heuristic, canonical=None, bound=None):
+    return best_first_search(task, heuristic, lambda g, h: g + h, canonical, bound)
+
+
+def weighted_astar_search(task, heuristic, weight=5, canonical=None, bound=None):
+    return best_first_search(task, heuristic, lambda g, h: g + weight * h, canonical, bound)
+
+
+def greedy_best_first_search(task, heuristic, canonical=None, bound=None):
+    return best_first_search(task, heuristic, lambda g, h: h, canonical, bound)
+
+
+ANYTIME_WEIGHTS = (5, 3, 2, 1.5, 1)
+
+
+def restarting_weighted_astar_search(task, heuristic, weights=ANYTIME_WEIGHTS, canonical=None, bound=None,
+                                     on_solution=None, deadline=None):
+    """
+    Restarting Weighted A* (Richter, Thayer y Ruml 2010), búsqueda anytime.
+
+    Empieza con el peso más alto y, cada vez que encuentra un plan, reinicia
+    desde el estado inicial con el siguiente peso y con el coste del plan
+    como cota (se podan los nodos con g + h >= cota). Entre iteraciones se
+    reutiliza el esfuerzo: el valor heurístico de cada estado se calcula una
+    sola vez y los estados ya vistos conservan el mejor camino conocido, así
+    que al volver a generarlos por un camino peor se sigue por el mejor.
+
+    on_solution(plan, cost, weight, elapsed) se llama con cada plan que
+    mejora al anterior; deadline (segundos) corta la búsqueda devolviendo el
+    mejor plan encontrado. Si la última iteración (peso 1) agota la lista
+    abierta, el plan es óptimo con heurística admisible (optimal=True).
+    """
+    start = time.time()
+    bound = float("inf") if bound is None else bound
+    key = canonical or _identity
+    counter = itertools.count()
+    h_cache = {}
+    nodes = {}           # clave -> nodo con el mejor camino conocido
+    expanded = generated = evaluated = 0
+    incumbent = None
+    solutions = []
+    timed_out = proven = False
+
+    def h_value(node, node_key):
+        nonlocal evaluated
+        h = h_cache.get(node_key)
+        if h is None:
+            h = h_cache[node_key] = heuristic(node)
+            evaluated += 1
+        return h
+
+    root = SearchNode(task.initial_state)
+    root_key = key(root.state)
+    nodes[root_key] = root
+    for weight in weights:
+        h = h_value(root, root_key)
+        if h == float("inf") or h >= bound:
+            proven = True
+            break
+        open_list = [(weight * h, h, next(counter), root, root_key)]
+        iteration_g = {root_key: 0}
+        found = None
+        while open_list:
+            _, h, _, node, node_key = heapq.heappop(open_list)
+            if iteration_g[node_key] < node.g or node.g + h >= bound:
+                continue
+            if task.goal_reached(node.state):
+                found = node
+                break
+            expanded += 1
+            if deadline is not None and expanded % 256 == 0 and time.time() - start > deadline:
+                timed_out = True
+                break
+            for op, succ in task.get_successor_states(node.state):
+                generated += 1
+                g = node.g + op.cost
+                succ_key = key(succ)
+                known = nodes.get(succ_key)
+                if known is None or g < known.g:
+                    known = nodes[succ_key] = SearchNode(succ, node, op, g)
+                if known.g >= iteration_g.get(succ_key, float("inf")):
+                    continue
+                iteration_g[succ_key] = known.g
+                h = h_value(known, succ_key)
+                if h == float("inf") or known.g + h >= bound:
+                    continue
+                heapq.heappush(open_list, (known.g + weight * h, h, next(counter), known, succ_key))
+        if found is not None:
+            incumbent, bound = found, found.g
+            elapsed = round(time.time() - start, 3)
+            solutions.append((found.g, weight, elapsed))
+            if on_solution is not None:
+                on_solution(found.extract_solution(), found.g, weight, elapsed)
+        if timed_out:
+            break
+        proven = weight == 1
+
+    result = _result(incumbent, expanded, generated, evaluated)
+    result["solutions"] = solutions
+    result["optimal"] = incumbent is not None and proven
+    return result
+
+
+SEARCHES = {
+    "bfs": breadth_first_search,
+    "astar": astar_search,
+    "wastar": weighted_astar_search,
+    "gbfs": greedy_best_first_search,
+    "rwastar": restarting_weighted_astar_search,
+}
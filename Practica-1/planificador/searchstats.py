@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Estadísticas de búsqueda extraídas de la salida de cada planificador.
+
+Los benchmarks guardaban el tiempo de pared y tiraban la salida, así que no
+se podía saber si una configuración es lenta porque su heurística es cara
+(pocos nodos por segundo) o porque explora mucho (muchos nodos). Aquí se
+convierte la salida en un diccionario con lo que informe cada uno:
+
+    - expanded, generated, evaluated: nodos expandidos, generados y
+      evaluados.
+    - operators, variables, facts: tamaño de la tarea instanciada.
+    - translate_time, search_time, total_time: segundos de instanciación
+      (traducción en Fast Downward), de búsqueda y totales. Si falta uno se
+      deduce de los otros dos (o del tiempo de pared medido, wall).
+    - nodes_per_s, evals_per_s: expandidos y evaluados por segundo de
+      búsqueda.
+
+Formatos:
+
+    - pyperplan: "N Nodes expanded", "N Variables created", "N Operators
+      created" y "Wall-clock search time: T" (sin tiempo de instanciación:
+      sale de wall).
+    - planner.py (propio; hda.py escribe igual nodos y tiempo): "N Nodes
+      expanded/generated/evaluated", "Operators: N", "Facts: N", "Ground
+      time: T" y "Search time: T" (el total).
+    - Fast Downward: "Translator variables/facts/operators: N", "Done! [...,
+      Ts wall-clock]" del traductor y "Expanded/Evaluated/Generated N
+      state(s).", "Search time: Ts", "Total time: Ts" de la búsqueda. Se toma
+      la última aparición: en las búsquedas iteradas (lama, seq-sat-*) es el
+      bloque acumulado; en los portfolios, el último componente.
+    - FF / Metric-FF: "creating final representation with N relevant facts",
+      "T seconds searching, evaluating N states" y "T seconds total time".
+    - OPTIC: "; States evaluated: N" (o el último "so far") y el último
+      "; Time T" como tiempo de búsqueda.
+    - JSHOP2: "Time Used = T" como búsqueda; no informa de nodos.
+
+Uso:
+    python3 searchstats.py {pyperplan,propio,fast-downward,ff,metric-ff,optic,jshop2} salida.txt [--wall T]
+"""
+
+import argparse
+import re
+import sys
+
+NUMBER = r"(\d+(?:\.\d+)?(?:e[-+]?\d+)?)"
+
+PATTERNS = {
+    "pyperplan": {
+        "expanded": r"(\d+) Nodes expanded",
+        "variables": r"(\d+) Variables created",
+        "operators": r"(\d+) Operators created",
+        "search_time": r"Wall-clock search time: " + NUMBER,
+    },
+    "propio": {
+        "expanded": r"(\d+) Nodes expanded",
+        "generated": r"(\d+) Nodes generated",
+        "evaluated": r"(\d+) Nodes evaluated",
+        "operators": r"^Operators: (\d+)",
+        "facts": r"^Facts: (\d+)",
+        "translate_time": r"^Ground time: " + NUMBER,
+        "total_time": r"^Search time: " + NUMBER,
+    },
+    "fast-downward": {
+        "variables": r"Translator variables: (\d+)",
+        "facts": r"Translator facts: (\d+)",
+        "operators": r"Translator operators: (\d+)",
+        "translate_time": r"Done! \[[\d.]+s CPU, " + NUMBER + r"s wall-clock\]",
+        "expanded": r"Expanded (\d+) state\(s\)\.",
+        "evaluated": r"Evaluated (\d+) state\(s\)\.",
+        "generated": r"Generated (\d+) state\(s\)\.",
+        "search_time": r"Search time: " + NUMBER + "s",
+        "total_time": r"Total time: " + NUMBER + "s",
+    },
+    "ff": {
+        "facts": r"creating final representation with (\d+) relevant facts",
+        "search_time": NUMBER + r" seconds searching",
+        "evaluated": r"seconds searching, evaluating (\d+) states",
+        "total_time": NUMBER + r" seconds total time",
+    },
+    "optic": {
+        "evaluated": r"; States evaluated(?: so far)?: (\d+)",
+        "search_time": r"; Time " + NUMBER,
+    },
+    "jshop2": {
+        "search_time": r"Time Used\s*=\s*" + NUMBER,
+    },
+}
+PATTERNS["metric-ff"] = PATTERNS["ff"]
+COMPILED = {backend: {key: re.compile(pattern, re.MULTILINE) for key, pattern in patterns.items()}
+            for backend, patterns in PATTERNS.items()}
+
+
+def parse(backend, output, wall=None):
+    """
+    Estadísticas de la salida de backend (claves de PATTERNS); wall es el
+    tiempo de pared medido por el benchmark.
+    Returns: dict solo con lo encontrado, más los tiempos y ritmos deducidos
+    """
+    if backend not in COMPILED:
+        raise ValueError(f"Planificador desconocido: {backend} (válidos: {', '.join(sorted(COMPILED))})")
+    stats = {}
+    for key, pattern in COMPILED[backend].items():
+        found = pattern.findall(output)
+        if found:
+            value = found[-1]
+            stats[key] = float(value) if "." in value or "e" in value or key.endswith("_time") else int(value)
+    if "total_time" not in stats and wall is not None:
+        stats["total_time"] = round(wall, 3)
+    total = stats.get("total_time")
+    if total is not None:
+        if "search_time" not in stats and "translate_time" in stats:
+            stats["search_time"] = round(max(0.0, total - stats["translate_time"]), 3)
+        elif "translate_time" not in stats and "search_time" in stats:
+            stats["translate_time"] = round(max(0.0, total - stats["search_time"]), 3)
+    search = stats.get("search_time")
+    if search:
+        for key, rate in (("expanded", "nodes_per_s"), ("evaluated", "evals_per_s")):
+            if key in stats:
+                stats[rate] = round(stats[key] / search, 1)
+    return stats
+
+
+def cells(stats):
+    """
+    Celdas (expandidos, evaluados, nodos/s, traducción, búsqueda) para las
+    tablas de los benchmarks. Expandidos y evaluados van en columnas
+    separadas (FF y OPTIC solo informan de evaluados) y nodos/s es siempre
+    expandidos por segundo.
+    """
+    stats = stats or {}
+    rate = stats.get("nodes_per_s")
+    return ["-" if stats.get("expanded") is None else stats["expanded"],
+            "-" if stats.get("evaluated") is None else stats["evaluated"],
+            "-" if rate is None else f"{rate:.0f}",
+            "-" if stats.get("translate_time") is None else f"{stats['translate_time']:.3f}",
+            "-" if stats.get("search_time") is None else f"{stats['search_time']:.3f}"]
+
+
+CELL_HEADERS = ["Expandidos", "Evaluados", "Nodos/s", "T trad. (s)", "T búsq. (s)"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("backend", choices=sorted(PATTERNS))
+    parser.add_argument("output", help="fichero con la salida del planificador ('-' para stdin)")
+    parser.add_argument("--wall", type=float, default=None, help="tiempo de pared medido (s)")
+    args = parser.parse_args()
+
+    if args.output == "-":
+        text = sys.stdin.read()
+    else:
+        with open(args.output, errors="replace") as f:
+            text = f.read()
+    stats = parse(args.backend, text, args.wall)
+    if not stats:
+        print("❌ No se han encontrado estadísticas en la salida")
+        sys.exit(1)
+    for key, value in stats.items():
+        print(f"{key:<15} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Reducción de orden parcial con conjuntos testarudos fuertes (strong
+stubborn sets).
+
+En el dominio de dos garras el orden de los pick da igual y en los problemas
+con varios drones las acciones de drones distintos conmutan, así que la
+búsqueda explora muchas veces las mismas combinaciones en distinto orden.
+En cada estado se calcula un conjunto testarudo T y solo se expanden los
+operadores aplicables de T:
+
+    1. T empieza con los operadores que consiguen un objetivo pendiente.
+    2. Para cada operador de T aplicable se añaden los que interfieren con
+       él (uno deshabilita al otro o sus efectos entran en conflicto).
+    3. Para cada operador de T no aplicable se elige una precondición falsa
+       y se añaden todos los que la consiguen.
+
+La interferencia se calcula a partir de precondiciones y efectos de los
+operadores instanciados. Dos operadores cuyas precondiciones son mutex (p.ej.
+(at-dron d1 deposito) y (at-dron d1 refugio1)) nunca son aplicables a la vez
+y no interfieren; los mutex salen de invariantes "como mucho un hecho
+p(k, *) por clave k" que se detectan automáticamente.
+
+Resultado (results/por.txt): en los dominios emergencias no se poda nada.
+Todos los drones pueden conseguir cualquier objetivo, así que el conjunto
+inicial ya contiene operadores de todos los drones; además (free ?d) y las
+cajas compartidas hacen que casi todo pick/leave interfiera con casi todo, y
+el cierre acaba incluyendo todos los operadores aplicables. Como calcular
+el cierre en cada estado cuesta, con --por la búsqueda es más lenta (mediana
+x1.7, hasta x7.3) sin expandir ni un nodo menos. Por eso --por queda
+desactivado por defecto (activarlo no mejora nada); la poda por simetrías
+(symmetry.py) es la que de verdad reduce el espacio de estados.
+"""
+
+
+def _group_invariants(task):
+    """
+    Detecta grupos de hechos mutuamente excluyentes.
+
+    Un candidato es (predicado, posición variable): los hechos con el mismo
+    predicado y mismos argumentos salvo esa posición forman un grupo. Es un
+    invariante si el estado inicial tiene como mucho un hecho por grupo y
+    todo operador que añade un hecho del grupo también borra otro del mismo
+    grupo que exige en su precondición.
+    Devuelve {hecho: [claves de grupo]}.
+    """
+    parsed = {fact: fact.strip("()").split() for fact in task.facts}
+    arities = {}
+    for atom in parsed.values():
+        arities[atom[0]] = len(atom) - 1
+
+    def key(atom, pos):
+        return (atom[0], pos) + tuple(a for i, a in enumerate(atom[1:]) if i != pos)
+
+    candidates = {(pred, pos) for pred, arity in arities.items() for pos in range(arity) if arity >= 1}
+
+    counts = {}
+    for fact in task.initial_state:
+        atom = parsed.get(fact)
+        if atom is None:
+            continue
+        for pos in range(len(atom) - 1):
+            k = key(atom, pos)
+            counts[k] = counts.get(k, 0) + 1
+            if counts[k] > 1:
+                candidates.discard((atom[0], pos))
+
+    for op in task.operators:
+        added = set()
+        for fact in op.add_effects:
+            atom = parsed[fact]
+            for pos in range(len(atom) - 1):
+                if (atom[0], pos) not in candidates:
+                    continue
+                k = key(atom, pos)
+                if k in added:
+                    candidates.discard((atom[0], pos))
+                    continue
+                added.add(k)
+                balanced = any(
+                    parsed[d][0] == atom[0] and key(parsed[d], pos) == k and d in op.preconditions
+                    for d in op.del_effects if d != fact
+                )
+                if not balanced:
+                    candidates.discard((atom[0], pos))
+
+    groups = {}
+    for fact, atom in parsed.items():
+        for pos in range(len(atom) - 1):
+            if (atom[0], pos) in candidates:
+                groups.setdefault(fact, []).append(key(atom, pos))
+    return groups
+
+
+class StubbornSets:
+    """Calcula conjuntos testarudos fuertes sobre una Task instanciada."""
+
+    def __init__(self, task):
+        self.task = task
+        self.ops = task.operators
+        self.index = {id(op): i for i, op in enumerate(self.ops)}
+        self.achievers = {}
+        self.pre_users = {}
+        self.deleters = {}
+        for i, op in enumerate(self.ops):
+            for fact in op.add_effects:
+                self.achievers.setdefault(fact, []).append(i)
+            for fact in op.preconditions:
+                self.pre_users.setdefault(fact, []).append(i)
+            for fact in op.del_effects:
+                self.deleters.setdefault(fact, []).append(i)
+        self.goals = sorted(task.goals)
+        self.groups = _group_invariants(task)
+        self.op_groups = []
+        for op in self.ops:
+            slots = {}
+            for fact in op.preconditions:
+                for k in self.groups.get(fact, ()):
+                    slots[k] = fact
+            self.op_groups.append(slots)
+        self._interference = {}
+
+    def _mutex(self, i, j):
+        """Las precondiciones de i y j asignan valores distintos a un mismo grupo."""
+        a, b = self.op_groups[i], self.op_groups[j]
+        if len(a) > len(b):
+            a, b = b, a
+        for k, fact in a.items():
+            other = b.get(k)
+            if other is not None and other != fact:
+                return True
+        return False
+
+    def interfering(self, i):
+        """Operadores que interfieren con el operador i (con caché)."""
+        cached = self._interference.get(i)
+        if cached is not None:
+            return cached
+        op = self.ops[i]
+        result = set()
+        for fact in op.del_effects:
+            result.update(self.pre_users.get(fact, ()))   # i deshabilita a j
+            result.update(self.achievers.get(fact, ()))   # conflicto add/del
+        for fact in op.preconditions:
+            result.update(self.deleters.get(fact, ()))    # j deshabilita a i
+        for fact in op.add_effects:
+            result.update(self.deleters.get(fact, ()))    # conflicto add/del
+        result.discard(i)
+        cached = [j for j in result if not self._mutex(i, j)]
+        self._interference[i] = cached
+        return cached
+
+    def stubborn_set(self, state):
+        """Índices de los operadores del conjunto testarudo en state."""
+        goal = None
+        for fact in self.goals:
+            if fact not in state:
+                # Objetivo con menos operadores que lo consiguen
+                if goal is None or len(self.achievers.get(fact, ())) < len(self.achievers.get(goal, ())):
+                    goal = fact
+        if goal is None:
+            return set()
+
+        stubborn = set(self.achievers.get(goal, ()))
+        queue = list(stubborn)
+        while queue:
+            i = queue.pop()
+            op = self.ops[i]
+            missing = [f for f in op.preconditions if f not in state]
+            if not missing:
+                new = self.interfering(i)
+            else:
+                fact = min(missing, key=lambda f: len(self.achievers.get(f, ())))
+                new = self.achievers.get(fact, ())
+            for j in new:
+                if j not in stubborn:
+                    stubborn.add(j)
+                    queue.append(j)
+        return stubborn
+
+    def successors(self, state):
+        """Sucesores (op, estado) restringidos al conjunto testarudo."""
+        result = []
+        for i in self.stubborn_set(state):
+            op = self.ops[i]
+            if op.preconditions <= state:
+                result.append((op, op.apply(state)))
+        # Orden estable para que la búsqueda sea determinista
+        result.sort(key=lambda pair: self.index[id(pair[0])])
+        return result
+
+
+class PrunedTask:
+    """Envuelve una Task para que la búsqueda expanda solo el conjunto testarudo."""
+
+    def __init__(self, task):
+        self.task = task
+        self.pruning = StubbornSets(task)
+        self.initial_state = task.initial_state
+        self.goals = task.goals
+        self.operators = task.operators
+        self.facts = task.facts
+
+    def goal_reached(self, state):
+        return self.task.goal_reached(state)
+
+    def get_successor_states(self, state):
+        return self.pruning.successors(state)
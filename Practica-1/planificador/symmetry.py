@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Detección de simetrías de objetos y canonización de estados.
+
+Dos objetos del mismo tipo son intercambiables si al permutarlos el estado
+inicial, los valores numéricos (fly-cost) y la meta quedan igual: cajas con
+el mismo contenido en el mismo sitio, personas con las mismas necesidades en
+el mismo refugio, drones/transportadores que empiezan juntos en el deposito,
+garras del mismo dron... Cada clase de objetos intercambiables es una órbita.
+
+Como cualquier permutación dentro de las órbitas es un automorfismo de la
+tarea, dos estados que solo difieren en esa permutación tienen el mismo coste
+hasta la meta. La búsqueda usa canonical(estado) como clave de detección de
+duplicados y sigue expandiendo el estado real, así que los planes que
+devuelve no necesitan traducirse.
+
+Uso:
+    python3 symmetry.py dominio.pddl problema.pddl
+"""
+
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pddl import atom_to_str, parse_domain, parse_problem, str_to_atom
+
+
+def _signature(obj, init, numeric, goal):
+    """Hechos en los que aparece obj, con obj sustituido por '*'."""
+    sig = []
+    for atom in init:
+        if obj in atom[1:]:
+            sig.append(("init",) + tuple("*" if a == obj else a for a in atom))
+    for atom, value in numeric.items():
+        if obj in atom[1:]:
+            sig.append(("num", value) + tuple("*" if a == obj else a for a in atom))
+    for atom in goal:
+        if obj in atom[1:]:
+            sig.append(("goal",) + tuple("*" if a == obj else a for a in atom))
+    return tuple(sorted(sig, key=repr))
+
+
+def _swap(atom, a, b):
+    return (atom[0],) + tuple(b if x == a else a if x == b else x for x in atom[1:])
+
+
+def _is_symmetry(a, b, init, numeric, goal):
+    """Comprueba que la transposición (a b) deja invariantes init, numeric y goal."""
+    if {_swap(atom, a, b) for atom in init} != init:
+        return False
+    if {_swap(atom, a, b): v for atom, v in numeric.items()} != numeric:
+        return False
+    return {_swap(atom, a, b) for atom in goal} == goal
+
+
+def compute_orbits(domain, problem):
+    """
+    Agrupa los objetos intercambiables del problema.
+    Devuelve una lista de órbitas (listas ordenadas de nombres, tamaño >= 2).
+    """
+    init = set(problem["init"])
+    numeric = dict(problem["numeric"])
+    goal = set(problem["goal"])
+
+    candidates = {}
+    for name, typ in problem["objects"]:
+        key = (typ, _signature(name, init, numeric, goal))
+        candidates.setdefault(key, []).append(name)
+
+    orbits = []
+    for members in candidates.values():
+        if len(members) < 2:
+            continue
+        # La firma igual es condición necesaria; se verifica con el primero
+        first = members[0]
+        orbit = [first] + [m for m in members[1:] if _is_symmetry(first, m, init, numeric, goal)]
+        if len(orbit) >= 2:
+            orbits.append(sorted(orbit))
+    return orbits
+
+
+class Canonicalizer:
+    """
+    Convierte estados en su representante canónico.
+
+    Para cada órbita se ordenan sus objetos según su firma en el estado (los
+    hechos en los que aparecen, con el propio objeto como '*' y cualquier
+    otro objeto simétrico sustituido por el nombre de su órbita) y se
+    renombran al orden fijo de la órbita. Estados simétricos con firmas
+    distintas acaban en el mismo representante; si hay empates con
+    estructura más profunda la canonización puede no ser perfecta, pero
+    siempre es correcta porque el renombrado es un automorfismo.
+    """
+
+    def __init__(self, orbits):
+        self.orbits = orbits
+        self.orbit_of = {}
+        for i, orbit in enumerate(orbits):
+            for obj in orbit:
+                self.orbit_of[obj] = f"#{i}"
+        self.parsed = {}
+
+    def _atom(self, fact):
+        atom = self.parsed.get(fact)
+        if atom is None:
+            atom = self.parsed[fact] = str_to_atom(fact)
+        return atom
+
+    def __call__(self, state):
+        if not self.orbits:
+            return state
+        orbit_of = self.orbit_of
+        facts_of = {}
+        for fact in state:
+            atom = self._atom(fact)
+            for obj in atom[1:]:
+                if obj in orbit_of:
+                    facts_of.setdefault(obj, []).append(atom)
+
+        rename = {}
+        for orbit in self.orbits:
+            def signature(obj):
+                return sorted(
+                    (atom[0],) + tuple("*" if a == obj else orbit_of.get(a, a) for a in atom[1:])
+                    for atom in facts_of.get(obj, ())
+                )
+            ordered = sorted(orbit, key=signature)
+            for old, new in zip(ordered, orbit):
+                if old != new:
+                    rename[old] = new
+
+        if not rename:
+            return state
+        result = []
+        for fact in state:
+            atom = self._atom(fact)
+            if any(a in rename for a in atom[1:]):
+                fact = atom_to_str((atom[0],) + tuple(rename.get(a, a) for a in atom[1:]))
+            result.append(fact)
+        return frozenset(result)
+
+
+def load_canonicalizer(domain_file, problem_file):
+    """Atajo: calcula las órbitas del problema y devuelve el canonizador."""
+    return Canonicalizer(compute_orbits(parse_domain(domain_file), parse_problem(problem_file)))
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    orbits = compute_orbits(parse_domain(sys.argv[1]), parse_problem(sys.argv[2]))
+    if not orbits:
+        print("No se han encontrado objetos intercambiables.")
+        return
+    factor = 1
+    for orbit in orbits:
+        factor *= math.factorial(len(orbit))
+        print(f"Órbita ({len(orbit)}): {' '.join(orbit)}")
+    print(f"Reducción máxima teórica del espacio de estados: x{factor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Benchmark con repeticiones y estadística para comparar configuraciones.
+
+Los tiempos de summary.txt, benchmark_results.txt y benchmark.txt salen de
+una sola ejecución (GBFS+hMAX en el tamaño 7: 52.415 s en la Parte 1 y
+51.675 s en la Parte 2), así que no se puede saber si una configuración
+mejora a otra. Aquí:
+
+    - Cada (configuración, problema) se ejecuta k veces, después de
+      `warmup` ejecuciones que se descartan (cachés de disco, bytecode...).
+      Las k repeticiones de todos los pares van en orden aleatorio (con
+      semilla), para que la deriva de la máquina no caiga siempre sobre la
+      misma configuración.
+    - Con --cpu se fija la afinidad de CPU (os.sched_setaffinity); la heredan
+      los planificadores lanzados.
+    - Los problemas se agrupan por el hash de su contenido, como en
+      regress.py: dos problem_size3.pddl de directorios distintos son dos
+      problemas (en la tabla, con el hash tras el nombre).
+    - Por par: mediana, IQR (Q3 - Q1) e intervalo de confianza bootstrap
+      (percentiles, BOOTSTRAP remuestreos) de la mediana, solo con las
+      ejecuciones resueltas.
+    - Entre dos configuraciones sobre el mismo problema: intervalo bootstrap
+      del cociente de medianas. La diferencia es significativa si el
+      intervalo no contiene 1.
+    - Cada repetición va al almacén de resultados (runs.py, benchmark
+      "trials", extra {"trial": i} y las estadísticas de búsqueda de
+      searchstats.py) y el resumen se calcula desde las filas de la sesión.
+    - La mediana de nodos expandidos por segundo de búsqueda distingue una
+      heurística cara (pocos nodos/s) de una búsqueda que explora mucho.
+
+Las configuraciones son "búsqueda/heurística" de planner.py o, con
+--pyperplan, de pyperplan (p. ej. gbf/hff).
+
+Uso:
+    python3 trials.py [-k 10] [--warmup 1] [--seed 0] [--cpu 0] [--timeout 60]
+                      [--pyperplan] -c gbfs/emergencias -c astar/hmax dominio.pddl problema.pddl [...]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+import searchstats
+from runs import Store, problem_hash, run_command
+from validate import validate_plan
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "trials.txt")
+PLANNER = os.path.join(BASE_DIR, "planner.py")
+PYPERPLAN = os.path.expanduser("~/planutils-venv/bin/pyperplan")
+BOOTSTRAP = 2000
+ALPHA = 0.05
+
+
+def quantile(values, q):
+    """Cuantil q de values (ordenados) con interpolación lineal."""
+    pos = (len(values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def median(values):
+    return quantile(sorted(values), 0.5)
+
+
+def iqr(values):
+    values = sorted(values)
+    return quantile(values, 0.75) - quantile(values, 0.25)
+
+
+def bootstrap(stat, samples, rng, b=BOOTSTRAP, alpha=ALPHA):
+    """Intervalo bootstrap (percentiles) de stat(*muestras remuestreadas)."""
+    estimates = sorted(stat(*[rng.choices(s, k=len(s)) for s in samples]) for _ in range(b))
+    return quantile(estimates, alpha / 2), quantile(estimates, 1 - alpha / 2)
+
+
+def _ratio(a, b):
+    base = median(b)
+    return median(a) / base if base else float("inf")
+
+
+def problem_labels(rows):
+    """
+    Nombre a mostrar de cada problema (hash del contenido, o nombre si no
+    hay): el nombre del fichero, con el hash si dos problemas distintos se
+    llaman igual (problem_size3.pddl de la Parte 1 y de la Parte 2).
+    """
+    hashes = {}
+    for run in rows:
+        hashes.setdefault(run["problem"], set()).add(run["problem_hash"] or run["problem"])
+    return {run["problem_hash"] or run["problem"]:
+            run["problem"] if len(hashes[run["problem"]]) == 1 else f"{run['problem']}@{run['problem_hash'][:6]}"
+            for run in rows}
+
+
+def summarize(rows, seed=0):
+    """
+    Estadísticas por (configuración, problema) a partir de filas del almacén.
+    El problema es su hash, así dos ficheros con el mismo nombre no se mezclan.
+    Returns: {(config, problema): {n, ok, times, median, iqr, ci, rate}}
+    """
+    rng = random.Random(seed)
+    groups = {}
+    for run in rows:
+        key = (run["config"], run["problem_hash"] or run["problem"])
+        group = groups.setdefault(key, {"n": 0, "ok": 0, "times": [], "rates": []})
+        group["n"] += 1
+        if run["status"] == "ok":
+            group["ok"] += 1
+            group["times"].append(run["wall"])
+            rate = run["extra"].get("stats", {}).get("nodes_per_s")
+            if rate is not None:
+                group["rates"].append(rate)
+    for group in groups.values():
+        times = group["times"]
+        group["median"] = median(times) if times else None
+        group["iqr"] = iqr(times) if times else None
+        group["ci"] = bootstrap(median, [times], rng) if len(times) > 1 else None
+        group["rate"] = median(group.pop("rates")) if group["rates"] else None
+    return groups
+
+
+def compare(groups, seed=0):
+    """
+    Pares de configuraciones sobre el mismo problema.
+    Returns: lista de (problema, config A, config B, cociente, (bajo, alto), significativa)
+    """
+    rng = random.Random(seed)
+    result = []
+    problems = sorted({problem for _, problem in groups})
+    configs = sorted({config for config, _ in groups})
+    for problem in problems:
+        for a, b in itertools.combinations(configs, 2):
+            times_a = groups.get((a, problem), {}).get("times")
+            times_b = groups.get((b, problem), {}).get("times")
+            if not times_a or not times_b or len(times_a) < 2 or len(times_b) < 2:
+                continue
+            low, high = bootstrap(_ratio, [times_a, times_b], rng)
+            result.append((problem, a, b, _ratio(times_a, times_b), (low, high), not low <= 1 <= high))
+    return result
+
+
+def planner_run(domain, problem, config, timeout, pyperplan=False):
+    """Una ejecución de planner.py (o pyperplan) validada, como fila para el almacén."""
+    search, _, heuristic = config.partition("/")
+    domain, problem = os.path.abspath(domain), os.path.abspath(problem)
+    if pyperplan:
+        command = [PYPERPLAN] + (["-H", heuristic] if heuristic else []) + ["-s", search, domain, problem]
+    else:
+        command = [sys.executable, PLANNER, "-s", search] + (["-H", heuristic] if heuristic else []) + [domain, problem]
+    plan_file = problem + ".soln"
+    if os.path.exists(plan_file):
+        os.remove(plan_file)
+    result = run_command(command, timeout=timeout, cwd=os.path.dirname(problem))
+    # El hash del dominio distingue campañas con el mismo problema (regress.py)
+    run = {"wall": result["wall"], "cpu": result["cpu"], "rss": result["rss"], "domain": problem_hash(domain)}
+    if not result["timeout"]:
+        run["stats"] = searchstats.parse("pyperplan" if pyperplan else "propio",
+                                         result["stdout"] + result["stderr"], result["wall"])
+    if result["timeout"]:
+        run["status"] = "tiempo"
+    elif not os.path.exists(plan_file):
+        run["status"] = "sin plan" if result["returncode"] == 0 else "error"
+    else:
+        with open(plan_file) as f:
+            check = validate_plan(domain, problem, f.read().splitlines())
+        run.update(status="ok" if check["valid"] else "inválido", length=check["length"],
+                   cost=check["cost"], makespan=check["makespan"])
+    if os.path.exists(plan_file):
+        os.remove(plan_file)
+    return run
+
+
+def run_trials(store, planner, tasks, k, warmup=0, seed=0, cpu=None, on_run=None):
+    """
+    Ejecuta cada (config, problema, fn) de tasks warmup veces (descartadas) y
+    k veces en orden aleatorio; fn() devuelve la fila (status, wall...).
+    """
+    previous = None
+    if cpu is not None:
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {cpu})
+    try:
+        for config, problem, fn in tasks:
+            for _ in range(warmup):
+                fn()
+        order = [(i, task) for task in tasks for i in range(k)]
+        random.Random(seed).shuffle(order)
+        for i, (config, problem, fn) in order:
+            run = fn()
+            status = run.pop("status")
+            store.add(planner, config, problem, status, trial=i, **run)
+            if on_run:
+                on_run(config, problem, i, status, run)
+    finally:
+        if previous is not None:
+            os.sched_setaffinity(0, previous)
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problems", nargs="+")
+    parser.add_argument("-c", "--config", action="append", required=True, help="búsqueda/heurística")
+    parser.add_argument("-k", type=int, default=10, help="repeticiones por configuración y problema")
+    parser.add_argument("--warmup", type=int, default=1, help="ejecuciones descartadas de cada par")
+    parser.add_argument("--seed", type=int, default=0, help="semilla del orden y del bootstrap")
+    parser.add_argument("--cpu", type=int, default=None, help="fija la afinidad a esta CPU")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--pyperplan", action="store_true", help="usa pyperplan en lugar de planner.py")
+    args = parser.parse_args()
+    if args.k < 2:
+        parser.error("hacen falta al menos 2 repeticiones")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    planner = "pyperplan" if args.pyperplan else "propio"
+    tasks = [(config, problem, lambda c=config, p=problem: planner_run(args.domain, p, c, args.timeout, args.pyperplan))
+             for config in args.config for problem in args.problems]
+
+    def progress(config, problem, i, status, run):
+        print(f"  {config:<20} {os.path.basename(problem):<24} #{i:<3} {status:<9} {run['wall']:.3f}s", flush=True)
+
+    with Store("trials") as store:
+        run_trials(store, planner, tasks, args.k, args.warmup, args.seed, args.cpu, progress)
+        rows = store.query()
+        groups = summarize(rows, args.seed)
+        labels = problem_labels(rows)
+        session = store.session
+
+    affinity = f", CPU {args.cpu}" if args.cpu is not None else ""
+    header = (f"{'Configuración':<20} | {'Problema':<24} | {'OK/n':>6} | {'Mediana(s)':>10} | "
+              f"{'IQR(s)':>8} | {f'IC{100 * (1 - ALPHA):.0f}% mediana':>17} | {'Nodos/s':>9}")
+    lines = [f"BENCHMARK CON REPETICIONES - {time.strftime('%Y-%m-%d %H:%M:%S')} (k={args.k}, "
+             f"calentamiento {args.warmup}, semilla {args.seed}{affinity}, planificador {planner}, "
+             f"sesión {session})", "", header, "-" * len(header)]
+    for (config, problem), group in sorted(groups.items(), key=lambda item: (item[0][0], labels[item[0][1]])):
+        ci = f"[{group['ci'][0]:.3f}, {group['ci'][1]:.3f}]" if group["ci"] else "-"
+        rate = "-" if group["rate"] is None else f"{group['rate']:.0f}"
+        lines.append(f"{config:<20} | {labels[problem]:<24} | {group['ok']:>2}/{group['n']:<3} | "
+                     f"{_seconds(group['median']):>10} | {_seconds(group['iqr']):>8} | {ci:>17} | {rate:>9}")
+
+    header = f"{'Problema':<24} | {'A':<20} | {'B':<20} | {'A/B':>6} | {'IC cociente':>17} | Significativa"
+    lines += ["", header, "-" * len(header)]
+    for problem, a, b, ratio, (low, high), significant in sorted(compare(groups, args.seed),
+                                                                  key=lambda c: (labels[c[0]], c[1], c[2])):
+        lines.append(f"{labels[problem]:<24} | {a:<20} | {b:<20} | {ratio:>6.3f} | "
+                     f"{f'[{low:.3f}, {high:.3f}]':>17} | {'sí' if significant else 'no'}")
+    print("\n" + "\n".join(lines))
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Validador de planes en proceso para los dominios emergencias.
+
+Los benchmarks daban un problema por resuelto si el .soln no estaba vacío o
+si la salida contenía "found legal plan", y el coste se sacaba del texto.
+Este módulo reproduce el plan sobre un estado indexado (cada hecho es un
+entero) y comprueba tipos de los argumentos, precondiciones y objetivos:
+
+    - STRIPS y :action-costs: el plan se aplica en orden. El coste es la suma
+      de los (increase (total-cost) ...), o el número de acciones si el
+      dominio no usa costes; el makespan es el número de acciones.
+    - Acciones durativas: cada acción genera un evento de inicio y otro de
+      fin. Se comprueban las condiciones at start / at end, las over all
+      mientras la acción está activa (desde después de sus efectos at start,
+      el intervalo abierto de PDDL2.1) y que la duración coincide con la del
+      dominio. El makespan (y el coste, la métrica es total-time) es el
+      instante del último fin. Como en VAL, con el mismo instante se procesan
+      antes los fines que los inicios.
+
+Las acciones se instancian bajo demanda y se guardan en caché, sin instanciar
+todo el dominio, así que validar un plan cuesta O(longitud del plan).
+
+Formatos de plan aceptados: "(move a b dron1)", "( MOVE A B DRON1 )",
+"0.000: (move a b dron1)  [7.000]" (OPTIC, .SOL) y "step 0: MOVE A B DRON1"
+(salida de Metric-FF). Las líneas que empiezan por ";" se ignoran.
+
+Uso:
+    python3 validate.py dominio.pddl problema.pddl plan [plan ...]
+    python3 validate.py --all      # planes guardados en el repositorio
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pddl import eval_numeric, parse_domain, parse_problem
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+RESULTS_FILE = os.path.join(BASE_DIR, "results", "validacion.txt")
+EPSILON = 1e-3
+
+TIMED_RE = re.compile(r"^\s*([\d.]+)\s*:\s*(\(.*?\))\s*(?:\[\s*([\d.]+)\s*\])?\s*$")
+STEP_RE = re.compile(r"^\s*(?:step)?\s*\d+\s*:\s*(.+?)\s*$", re.IGNORECASE)
+
+
+def parse_plan(lines):
+    """
+    Lee las líneas de un plan.
+    Returns: lista de (instante o None, átomo, duración o None)
+    """
+    plan = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(";"):
+            continue
+        timed = TIMED_RE.match(line)
+        if timed:
+            start, action, duration = timed.groups()
+            atom = tuple(action.strip("()").lower().split())
+            plan.append((float(start), atom, float(duration) if duration else None))
+            continue
+        step = STEP_RE.match(line)
+        if step and not line.startswith("("):
+            line = step.group(1)
+        if line.startswith("(") or step:
+            plan.append((None, tuple(line.strip("()").lower().split()), None))
+    return plan
+
+
+def read_plan(path):
+    with open(path, errors="replace") as f:
+        return parse_plan(f)
+
+
+class _Grounded:
+    """Acción instanciada con los hechos ya traducidos a enteros."""
+
+    __slots__ = ("pre", "neg", "add", "delete", "cost", "duration",
+                 "start_pre", "start_neg", "all_pre", "end_pre", "end_neg",
+                 "start_add", "start_del", "end_add", "end_del")
+
+
+class Validator:
+    """Valida planes de un problema concreto (dominio y problema se leen una vez)."""
+
+    def __init__(self, domain_file, problem_file):
+        domain = parse_domain(domain_file)
+        problem = parse_problem(problem_file)
+        self.actions = {a["name"]: a for a in domain["actions"]}
+        self.temporal = any(a.get("durative") for a in domain["actions"])
+        self.use_costs = ":action-costs" in domain["requirements"]
+        self.numeric = problem["numeric"]
+
+        parents = domain["types"]
+        self.types = {}
+        for name, typ in problem["objects"]:
+            kinds = {"object"}
+            while typ is not None and typ not in kinds:
+                kinds.add(typ)
+                typ = parents.get(typ)
+            self.types[name] = kinds
+
+        self.ids = {}
+        self.init = frozenset(self._id(atom) for atom in problem["init"])
+        self.goal = [self._id(atom) for atom in problem["goal"]]
+        self._cache = {}
+
+    def _id(self, atom):
+        i = self.ids.get(atom)
+        if i is None:
+            i = self.ids[atom] = len(self.ids)
+        return i
+
+    def ground(self, step):
+        cached = self._cache.get(step)
+        if cached is not None:
+            return cached
+        action = self.actions.get(step[0])
+        if action is None:
+            raise ValueError(f"acción desconocida: {step[0]}")
+        params = action["parameters"]
+        args = step[1:]
+        if len(args) != len(params):
+            raise ValueError(f"{step[0]} espera {len(params)} argumentos")
+        bindings = {}
+        for (var, typ), arg in zip(params, args):
+            if typ not in self.types.get(arg, ()):
+                raise ValueError(f"{arg} no es de tipo {typ}")
+            bindings[var] = arg
+
+        def atoms(literals, positive=True):
+            return frozenset(self._id(tuple(bindings.get(t, t) for t in atom))
+                             for pos, atom in literals if pos == positive)
+
+        def plain(atom_list):
+            return frozenset(self._id(tuple(bindings.get(t, t) for t in atom)) for atom in atom_list)
+
+        g = _Grounded()
+        g.pre, g.neg = atoms(action["precondition"]), atoms(action["precondition"], False)
+        g.add, g.delete = plain(action["add"]), plain(action["delete"])
+        if self.use_costs:
+            g.cost = eval_numeric(action["cost"], bindings, self.numeric) if action["cost"] is not None else 0
+        else:
+            g.cost = 1
+        if action.get("durative"):
+            g.duration = eval_numeric(action["duration"], bindings, self.numeric)
+            g.start_pre, g.start_neg = atoms(action["start_pre"]), atoms(action["start_pre"], False)
+            g.all_pre = atoms(action["all_pre"])
+            g.end_pre, g.end_neg = atoms(action["end_pre"]), atoms(action["end_pre"], False)
+            g.start_add, g.start_del = plain(action["start_add"]), plain(action["start_del"])
+            g.end_add, g.end_del = plain(action["end_add"]), plain(action["end_del"])
+        self._cache[step] = g
+        return g
+
+    def validate(self, plan):
+        """
+        Valida un plan (salida de parse_plan).
+        Returns: {valid, cost, makespan, length, error}
+        """
+        try:
+            if self.temporal:
+                return self._validate_temporal(plan)
+            return self._validate_sequential(plan)
+        except ValueError as e:
+            return {"valid": False, "cost": None, "makespan": None, "length": len(plan), "error": str(e)}
+
+    def _validate_sequential(self, plan):
+        if not plan and not all(fact in self.init for fact in self.goal):
+            raise ValueError("plan vacío")
+        state = set(self.init)
+        cost = 0
+        for i, (_, step, _) in enumerate(plan, 1):
+            g = self.ground(step)
+            if not g.pre <= state or g.neg & state:
+                raise ValueError(f"paso {i} no aplicable: ({' '.join(step)})")
+            state -= g.delete
+            state |= g.add
+            cost += g.cost
+        if not all(fact in state for fact in self.goal):
+            raise ValueError("el plan no alcanza los objetivos")
+        return {"valid": True, "cost": _number(cost), "makespan": len(plan), "length": len(plan), "error": None}
+
+    def _validate_temporal(self, plan):
+        if not plan and not all(fact in self.init for fact in self.goal):
+            raise ValueError("plan vacío")
+        events = []
+        for i, (start, step, duration) in enumerate(plan):
+            g = self.ground(step)
+            if start is None:
+                raise ValueError(f"acción sin instante de inicio: ({' '.join(step)})")
+            if duration is not None and abs(duration - g.duration) > EPSILON:
+                raise ValueError(f"duración {duration} incorrecta para ({' '.join(step)}), debe ser {g.duration}")
+            events.append((start, 1, i, g, step))
+            events.append((start + g.duration, 0, i, g, step))
+        events.sort(key=lambda e: (e[0], e[1], e[2]))
+
+        state = set(self.init)
+        active = {}
+        makespan = 0
+        for when, kind, i, g, step in events:
+            name = f"({' '.join(step)})"
+            if kind == 1:
+                if not g.start_pre <= state or g.start_neg & state:
+                    raise ValueError(f"{when:.3f}: condición at start falsa en {name}")
+                state -= g.start_del
+                state |= g.start_add
+                # over all vale en el intervalo abierto: se comprueba (abajo) tras los efectos at start
+                active[i] = g
+            else:
+                del active[i]
+                if not g.end_pre <= state or g.end_neg & state:
+                    raise ValueError(f"{when:.3f}: condición at end falsa en {name}")
+                state -= g.end_del
+                state |= g.end_add
+                makespan = max(makespan, when)
+            for other in active.values():
+                if not other.all_pre <= state:
+                    raise ValueError(f"{when:.3f}: se viola una condición over all")
+        if not all(fact in state for fact in self.goal):
+            raise ValueError("el plan no alcanza los objetivos")
+        makespan = round(makespan, 3)
+        return {"valid": True, "cost": makespan, "makespan": makespan, "length": len(plan), "error": None}
+
+
+def _number(x):
+    return int(x) if float(x).is_integer() else x
+
+
+_validators = {}
+
+
+def get_validator(domain_file, problem_file):
+    """Validator con caché por (dominio, problema)."""
+    key = (os.path.abspath(domain_file), os.path.abspath(problem_file))
+    if key not in _validators:
+        _validators[key] = Validator(*key)
+    return _validators[key]
+
+
+def validate_plan(domain_file, problem_file, plan):
+    """Atajo: plan puede ser una ruta o una lista de líneas."""
+    if isinstance(plan, str):
+        plan = read_plan(plan)
+    elif plan and isinstance(plan[0], str):
+        plan = parse_plan(plan)
+    return get_validator(domain_file, problem_file).validate(plan)
+
+
+# --------------------------------------------------------------------------
+# Planes guardados en el repositorio
+# --------------------------------------------------------------------------
+
+def _find_domain(directory):
+    """Dominio del directorio más cercano hacia arriba (se ignoran los BASE_*)."""
+    while directory.startswith(PRACTICA_DIR):
+        candidates = sorted(f for f in os.listdir(directory)
+                            if f.startswith("domain") and f.endswith(".pddl"))
+        if candidates:
+            return os.path.join(directory, candidates[0])
+        directory = os.path.dirname(directory)
+    return None
+
+
+def _find_problem(plan_path):
+    """Problema al que corresponde un plan guardado (.pddl.plan o .SOL)."""
+    name = os.path.basename(plan_path)
+    directory = os.path.dirname(plan_path)
+    if name.endswith(".plan"):
+        problem_name = name[:-len(".plan")]
+    else:
+        problem_name = re.sub(r"_(first|last)\.SOL$", "", name) + ".pddl"
+        directory = directory.replace(os.sep + "plans" + os.sep, os.sep + "problems" + os.sep)
+    while directory.startswith(PRACTICA_DIR):
+        for sub in ("", "problems", "problems2"):
+            candidate = os.path.join(directory, sub, problem_name)
+            if os.path.exists(candidate):
+                return candidate
+        directory = os.path.dirname(directory)
+    return None
+
+
+def stored_plans():
+    """(plan, dominio, problema) de todos los planes guardados en Practica-1."""
+    result = []
+    for root, _, files in os.walk(PRACTICA_DIR):
+        for f in sorted(files):
+            if f.endswith(".pddl.plan") or f.endswith(".SOL"):
+                plan = os.path.join(root, f)
+                problem = _find_problem(plan)
+                domain = _find_domain(os.path.dirname(problem)) if problem else None
+                result.append((plan, domain, problem))
+    return sorted(result)
+
+
+def validate_stored():
+    """Valida todos los planes guardados y escribe results/validacion.txt."""
+    header = f"{'Plan':<72} | {'Estado':<7} | {'Long.':>5} | {'Coste':>8} | {'Makespan':>8} | Error"
+    lines = [f"VALIDACIÓN DE PLANES GUARDADOS - {time.strftime('%Y-%m-%d %H:%M:%S')}", "", header, "-" * 120]
+
+    entries = stored_plans()
+    start = time.time()
+    for _, domain, problem in entries:
+        if domain and problem:
+            get_validator(domain, problem)
+    load_time = time.time() - start
+
+    plans = [(path, read_plan(path)) for path, _, _ in entries]
+    counts = {"VALID": 0, "INVALID": 0}
+    start = time.time()
+    rows = []
+    for (path, domain, problem), (_, plan) in zip(entries, plans):
+        if not (domain and problem):
+            result = {"valid": False, "length": len(plan), "cost": None, "makespan": None,
+                      "error": "no se encuentra el problema"}
+        else:
+            result = get_validator(domain, problem).validate(plan)
+        rows.append((path, result))
+    check_time = time.time() - start
+
+    for path, result in rows:
+        status = "VALID" if result["valid"] else "INVALID"
+        counts[status] += 1
+        cost = "-" if result["cost"] is None else result["cost"]
+        makespan = "-" if result["makespan"] is None else result["makespan"]
+        lines.append(f"{os.path.relpath(path, PRACTICA_DIR):<72} | {status:<7} | {result['length']:>5} | "
+                     f"{cost:>8} | {makespan:>8} | {result['error'] or ''}")
+
+    rate = len(rows) / check_time if check_time > 0 else float("inf")
+    lines += ["", f"{len(rows)} planes: {counts['VALID']} VALID, {counts['INVALID']} INVALID",
+              f"Lectura de dominios/problemas: {load_time:.3f}s | validación: {check_time:.4f}s "
+              f"({rate:.0f} planes/s)"]
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print("\n".join(lines[-2:]))
+    print(f"📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain", nargs="?")
+    parser.add_argument("problem", nargs="?")
+    parser.add_argument("plans", nargs="*")
+    parser.add_argument("--all", action="store_true", help="valida los planes guardados del repositorio")
+    args = parser.parse_args()
+
+    if args.all:
+        validate_stored()
+        return
+    if not (args.domain and args.problem and args.plans):
+        parser.error("hacen falta dominio, problema y al menos un plan")
+    ok = True
+    for path in args.plans:
+        result = validate_plan(args.domain, args.problem, path)
+        if result["valid"]:
+            print(f"VALID   {path} | cost {result['cost']} | makespan {result['makespan']} | {result['length']} acciones")
+        else:
+            ok = False
+            print(f"INVALID {path} | {result['error']}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
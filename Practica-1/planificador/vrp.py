@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Solver de rutas (CVRP) para los dominios emergencias.
+
+Con cientos de refugios ningún planificador PDDL termina, pero el problema es
+en el fondo un problema de rutas de vehículos con capacidad: cada viaje sale
+del punto donde están las cajas, reparte como mucho Q cajas y vuelve. Q es el
+número de garras del dron (dominio de Parte-1) o la capacidad del
+transportador n0..nK (Parte-2, donde el dron solo puede volar con la garra
+libre y por tanto siempre reparte con el transportador).
+
+    1. Construcción: ahorros de Clarke-Wright restringidos a los k vecinos
+       más cercanos de cada refugio.
+    2. Mejora: 2-opt dentro de cada ruta y relocate/swap entre rutas hasta
+       que no se mejora o se agota el presupuesto de tiempo.
+    3. Se emite el plan con la sintaxis de acciones del dominio.
+
+Un vuelo cuesta fly-cost si el dominio usa :action-costs y 1 si no. Como los
+fly-cost generados no cumplen la desigualdad triangular, entre dos paradas se
+vuela por el camino más barato (Floyd-Warshall con pocas localizaciones; con
+muchas, el mejor camino con un salto intermedio).
+
+El coste del plan es una cota superior para los planificadores óptimos
+(planner.py --vrp-bound).
+
+Uso:
+    python3 vrp.py [-t 0.5] dominio.pddl problema.pddl
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pddl import parse_domain, parse_problem
+
+NEIGHBOURS = 20
+FLOYD_LIMIT = 80
+INF = float("inf")
+
+
+class Graph:
+    """Costes de vuelo entre localizaciones y caminos mínimos."""
+
+    def __init__(self, locations, fly_cost):
+        self.locations = list(locations)
+        self.unit = fly_cost is None
+        self.direct = fly_cost or {}
+        self.next_hop = None
+        if not self.unit and len(self.locations) <= FLOYD_LIMIT:
+            self._floyd()
+        else:
+            self.dist = {}
+
+    def _floyd(self):
+        locs = self.locations
+        d = {a: {b: (0 if a == b else self.direct.get((a, b), INF)) for b in locs} for a in locs}
+        nxt = {a: {b: b for b in locs} for a in locs}
+        for k in locs:
+            dk = d[k]
+            for i in locs:
+                di = d[i]
+                dik = di[k]
+                if dik == INF:
+                    continue
+                ni = nxt[i]
+                nik = ni[k]
+                for j, dkj in dk.items():
+                    if dik + dkj < di[j]:
+                        di[j] = dik + dkj
+                        ni[j] = nik
+        self.dist = {(a, b): c for a, row in d.items() for b, c in row.items()}
+        self.next_hop = nxt
+
+    def cost(self, a, b):
+        if a == b:
+            return 0
+        if self.unit:
+            return 1
+        c = self.dist.get((a, b))
+        if c is None:
+            # Sin Floyd-Warshall: vuelo directo o con una escala
+            c = self.direct.get((a, b), INF)
+            for k in self.locations:
+                via = self.direct.get((a, k), INF) + self.direct.get((k, b), INF)
+                if via < c:
+                    c = via
+            self.dist[(a, b)] = c
+        return c
+
+    def quick_cost(self, a, b):
+        """Coste usado al construir rutas (evita el O(L) de cost sin Floyd)."""
+        if a == b:
+            return 0
+        if self.unit:
+            return 1
+        if self.next_hop is not None:
+            return self.dist[(a, b)]
+        return self.direct.get((a, b), INF)
+
+    def path(self, a, b):
+        """Localizaciones que se visitan al volar de a a b (sin incluir a)."""
+        if a == b:
+            return []
+        if self.unit:
+            return [b]
+        if self.next_hop is not None:
+            hops = []
+            while a != b:
+                a = self.next_hop[a][b]
+                hops.append(a)
+            return hops
+        best, hops = self.direct.get((a, b), INF), [b]
+        for k in self.locations:
+            via = self.direct.get((a, k), INF) + self.direct.get((k, b), INF)
+            if via < best:
+                best, hops = via, [k, b]
+        if best == INF:
+            raise ValueError(f"No hay camino de {a} a {b}")
+        return hops
+
+
+class Instance:
+    """Datos del problema que necesita el solver, leídos del PDDL."""
+
+    def __init__(self, domain_file, problem_file):
+        domain = parse_domain(domain_file)
+        problem = parse_problem(problem_file)
+        actions = {a["name"] for a in domain["actions"]}
+        self.carrier_variant = "put-in-carrier" in actions
+        costs = ":action-costs" in domain["requirements"]
+
+        objects = {}
+        for name, typ in problem["objects"]:
+            objects.setdefault(typ, []).append(name)
+        init = problem["init"]
+
+        self.drones = {}
+        self.boxes = {}
+        self.content = {}
+        self.persons = {}
+        self.carriers = {}
+        self.carrier_num = {}
+        self.free_grips = []
+        self.next_num = {}
+        done = set()
+        for atom in init:
+            pred = atom[0]
+            if pred == "at-dron":
+                self.drones[atom[1]] = atom[2]
+            elif pred == "at-box":
+                self.boxes[atom[1]] = atom[2]
+            elif pred == "box-has":
+                self.content[atom[1]] = atom[2]
+            elif pred == "at-person":
+                self.persons[atom[1]] = atom[2]
+            elif pred == "at-carrier":
+                self.carriers[atom[1]] = atom[2]
+            elif pred == "boxes-in-carrier":
+                self.carrier_num[atom[1]] = atom[2]
+            elif pred == "siguiente":
+                self.next_num[atom[1]] = atom[2]
+            elif pred == "free":
+                self.free_grips.append(atom[1])
+            elif pred == "person-has":
+                done.add((atom[1], atom[2]))
+        self.free_grips = sorted(g for g in self.free_grips if g in objects.get("grip", ()))
+
+        self.goals = [(atom[1], atom[2]) for atom in problem["goal"]
+                      if atom[0] == "person-has" and (atom[1], atom[2]) not in done]
+
+        locations = objects.get("location", [])
+        fly_cost = None
+        if costs:
+            fly_cost = {(k[1], k[2]): v for k, v in problem["numeric"].items() if k[0] == "fly-cost"}
+        self.graph = Graph(locations, fly_cost)
+
+    def capacity(self, carrier):
+        """Cajas que caben en el transportador desde su contador actual."""
+        n, steps = self.carrier_num.get(carrier), 0
+        while n in self.next_num:
+            n = self.next_num[n]
+            steps += 1
+        return steps
+
+    def num_chain(self, carrier):
+        n = self.carrier_num[carrier]
+        chain = [n]
+        while n in self.next_num:
+            n = self.next_num[n]
+            chain.append(n)
+        return chain
+
+
+# --------------------------------------------------------------------------
+# CVRP: construcción por ahorros + búsqueda local
+# --------------------------------------------------------------------------
+
+class Routing:
+    """
+    CVRP con un único depósito (hub). customers[i] = (localización, demanda).
+    Las rutas son listas de índices de clientes.
+    """
+
+    def __init__(self, graph, hub, customers, capacity):
+        self.graph = graph
+        self.hub = hub
+        self.customers = customers
+        self.capacity = capacity
+        self.locs = [loc for loc, _ in customers]
+        self.demand = [d for _, d in customers]
+
+    def d(self, a, b):
+        return self.graph.quick_cost(a, b)
+
+    def route_cost(self, route):
+        if not route:
+            return 0
+        d, locs = self.d, self.locs
+        cost = d(self.hub, locs[route[0]]) + d(locs[route[-1]], self.hub)
+        for a, b in zip(route, route[1:]):
+            cost += d(locs[a], locs[b])
+        return cost
+
+    def neighbours(self):
+        n = len(self.customers)
+        k = min(NEIGHBOURS, n - 1)
+        if k <= 0:
+            return [[] for _ in range(n)]
+        if self.graph.unit:
+            return [[(i + s) % n for s in range(1, k + 1)] for i in range(n)]
+        d, locs = self.d, self.locs
+        result = []
+        for i in range(n):
+            li = locs[i]
+            row = sorted((min(d(li, locs[j]), d(locs[j], li)), j) for j in range(n) if j != i)
+            result.append([j for _, j in row[:k]])
+        return result
+
+    def savings(self, near):
+        """Clarke-Wright (versión asimétrica): une el final de una ruta con el inicio de otra."""
+        d, locs, hub = self.d, self.locs, self.hub
+        pairs = []
+        for i, js in enumerate(near):
+            for j in js:
+                s = d(locs[i], hub) + d(hub, locs[j]) - d(locs[i], locs[j])
+                if s > 0:
+                    pairs.append((-s, i, j))
+        pairs.sort()
+        route_of = list(range(len(self.customers)))
+        routes = {i: [i] for i in range(len(self.customers))}
+        load = {i: self.demand[i] for i in range(len(self.customers))}
+        for _, i, j in pairs:
+            ri, rj = route_of[i], route_of[j]
+            if ri == rj or routes[ri][-1] != i or routes[rj][0] != j:
+                continue
+            if load[ri] + load[rj] > self.capacity:
+                continue
+            routes[ri].extend(routes[rj])
+            load[ri] += load.pop(rj)
+            for c in routes.pop(rj):
+                route_of[c] = ri
+        return list(routes.values())
+
+    def two_opt(self, route):
+        best = self.route_cost(route)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(route) - 1):
+                for j in range(i + 1, len(route)):
+                    candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                    cost = self.route_cost(candidate)
+                    if cost < best:
+                        route, best, improved = candidate, cost, True
+        return route
+
+    def local_search(self, routes, near, deadline):
+        """relocate y swap entre rutas vecinas; 2-opt en las rutas que cambian."""
+        routes = [self.two_opt(r) for r in routes]
+        route_of = {}
+        for r, route in enumerate(routes):
+            for c in route:
+                route_of[c] = r
+        costs = [self.route_cost(r) for r in routes]
+        loads = [sum(self.demand[c] for c in r) for r in routes]
+
+        improved = True
+        while improved and time.time() < deadline:
+            improved = False
+            for u in range(len(self.customers)):
+                if time.time() > deadline:
+                    break
+                ru = route_of[u]
+                for v in near[u]:
+                    rv = route_of[v]
+                    if rv == ru:
+                        continue
+                    a, b = routes[ru], routes[rv]
+                    base = costs[ru] + costs[rv]
+                    best = None
+                    # relocate u a la ruta de v (junto a v)
+                    if loads[rv] + self.demand[u] <= self.capacity:
+                        new_a = [c for c in a if c != u]
+                        pos = b.index(v)
+                        for new_b in (b[:pos] + [u] + b[pos:], b[:pos + 1] + [u] + b[pos + 1:]):
+                            delta = self.route_cost(new_a) + self.route_cost(new_b) - base
+                            if delta < -1e-9 and (best is None or delta < best[0]):
+                                best = (delta, new_a, new_b)
+                    # swap u <-> v
+                    du, dv = self.demand[u], self.demand[v]
+                    if loads[ru] - du + dv <= self.capacity and loads[rv] - dv + du <= self.capacity:
+                        new_a = [v if c == u else c for c in a]
+                        new_b = [u if c == v else c for c in b]
+                        delta = self.route_cost(new_a) + self.route_cost(new_b) - base
+                        if delta < -1e-9 and (best is None or delta < best[0]):
+                            best = (delta, new_a, new_b)
+                    if best is None:
+                        continue
+                    _, new_a, new_b = best
+                    routes[ru], routes[rv] = self.two_opt(new_a), self.two_opt(new_b)
+                    for r in (ru, rv):
+                        costs[r] = self.route_cost(routes[r])
+                        loads[r] = sum(self.demand[c] for c in routes[r])
+                        for c in routes[r]:
+                            route_of[c] = r
+                    improved = True
+                    break
+        return [r for r in routes if r]
+
+    def solve(self, deadline):
+        if not self.customers:
+            return []
+        near = self.neighbours()
+        routes = self.savings(near)
+        return self.local_search(routes, near, deadline)
+
+
+# --------------------------------------------------------------------------
+# Emisión del plan
+# --------------------------------------------------------------------------
+
+class PlanBuilder:
+    """Genera las acciones del dominio y acumula el coste del plan."""
+
+    def __init__(self, inst):
+        self.inst = inst
+        self.graph = inst.graph
+        self.steps = []
+        self.cost = 0
+        self.loc = dict(inst.drones)
+        self.trips = {d: 0 for d in inst.drones}
+
+    def act(self, text, cost=1):
+        self.steps.append(f"({text})")
+        self.cost += cost
+
+    def fly(self, drone, target, carrier=None):
+        here = self.loc[drone]
+        for hop in self.graph.path(here, target):
+            c = 1 if self.graph.unit else self.graph.direct[(here, hop)]
+            if carrier is None:
+                self.act(f"move {here} {hop} {drone}", c)
+            else:
+                self.act(f"move-carrier {here} {hop} {drone} {carrier}", c)
+            here = hop
+        self.loc[drone] = target
+
+
+def assign_boxes(inst):
+    """Elige una caja para cada objetivo, la más cercana a la persona."""
+    stock = {}
+    for box, loc in inst.boxes.items():
+        content = inst.content.get(box)
+        if content is not None:
+            stock.setdefault((content, loc), []).append(box)
+    deliveries = []
+    for person, content in inst.goals:
+        target = inst.persons[person]
+        options = [(inst.graph.quick_cost(loc, target), loc) for (c, loc), boxes in stock.items()
+                   if c == content and boxes]
+        if not options:
+            raise ValueError(f"No quedan cajas de {content} para {person}")
+        _, loc = min(options)
+        deliveries.append((loc, target, stock[(content, loc)].pop(), person, content))
+    return deliveries
+
+
+def drone_teams(inst):
+    """Dron -> recurso de carga: lista de garras o transportador."""
+    drones = sorted(inst.drones)
+    teams = {}
+    if inst.carrier_variant:
+        free = sorted(inst.carriers, key=lambda c: (inst.capacity(c) == 0, c))
+        for d in drones:
+            if not free:
+                break
+            # transportador más cercano al dron
+            c = min(free, key=lambda c: (inst.graph.quick_cost(inst.drones[d], inst.carriers[c]), c))
+            free.remove(c)
+            if inst.capacity(c) > 0:
+                teams[d] = c
+    else:
+        grips = list(inst.free_grips)
+        for d in drones:
+            own = [g for g in grips if g.startswith(d + "-")]
+            teams[d] = own
+            for g in own:
+                grips.remove(g)
+        i = 0
+        for g in grips:
+            # garras sin dueño por nombre: se reparten entre los drones
+            teams[drones[i % len(drones)]].append(g)
+            i += 1
+        teams = {d: g for d, g in teams.items() if g}
+    if not teams:
+        raise ValueError("Ningún dron puede transportar cajas")
+    return teams
+
+
+def solve_vrp(domain_file, problem_file, time_limit=0.5):
+    """
+    Resuelve el problema como CVRP y devuelve un plan válido.
+    Returns: {solved, plan (lista de acciones en texto), cost, routes, time}
+    """
+    start = time.time()
+    inst = Instance(domain_file, problem_file)
+    teams = drone_teams(inst)
+    if inst.carrier_variant:
+        capacity = min(inst.capacity(c) for c in teams.values())
+    else:
+        capacity = min(len(g) for g in teams.values())
+
+    deliveries = assign_boxes(inst)
+    by_hub = {}
+    for delivery in deliveries:
+        by_hub.setdefault(delivery[0], []).append(delivery)
+
+    builder = PlanBuilder(inst)
+    carrier_count = {c: 0 for c in inst.carriers}
+    n_routes = 0
+    hubs = sorted(by_hub, key=lambda h: -len(by_hub[h]))
+    deadline_step = time_limit / max(1, len(hubs))
+
+    for hub in hubs:
+        # Agrupar por localización; los grupos llenos son viajes directos
+        per_loc = {}
+        for delivery in by_hub[hub]:
+            per_loc.setdefault(delivery[1], []).append(delivery)
+        local = per_loc.pop(hub, [])
+        customers, loads = [], []
+        for loc in sorted(per_loc):
+            items = per_loc[loc]
+            for i in range(0, len(items), capacity):
+                chunk = items[i:i + capacity]
+                customers.append((loc, len(chunk)))
+                loads.append(chunk)
+
+        routing = Routing(inst.graph, hub, customers, capacity)
+        routes = routing.solve(time.time() + deadline_step)
+        routes.sort(key=routing.route_cost, reverse=True)
+        n_routes += len(routes)
+
+        trips = [[d for c in route for d in loads[c]] for route in routes]
+        if local:
+            trips = [[d] for d in local] + trips
+
+        for trip in trips:
+            # El dron que llega antes al hub; a igualdad, el que menos viajes lleva
+            drone = min(teams, key=lambda d: (inst.graph.quick_cost(builder.loc[d], hub), builder.trips[d], d))
+            builder.trips[drone] += 1
+            _emit_trip(inst, builder, drone, teams[drone], hub, trip, carrier_count)
+
+    return {
+        "solved": True,
+        "plan": builder.steps,
+        "cost": builder.cost,
+        "routes": n_routes,
+        "time": round(time.time() - start, 3),
+    }
+
+
+def _emit_trip(inst, builder, drone, resource, hub, trip, carrier_count):
+    """Recoger en el hub las cajas del viaje y repartirlas en orden."""
+    if inst.carrier_variant:
+        carrier = resource
+        chain = inst.num_chain(carrier)
+        if builder.loc[drone] != inst.carriers[carrier]:
+            builder.fly(drone, inst.carriers[carrier])
+        builder.fly(drone, hub, carrier)
+        inst.carriers[carrier] = hub
+        if all(target == hub for _, target, *_ in trip):
+            for _, _, box, person, content in trip:
+                builder.act(f"pick {box} {hub} {drone}")
+                builder.act(f"leave {box} {hub} {drone} {person} {content}")
+            return
+        for _, _, box, _, _ in trip:
+            k = carrier_count[carrier]
+            builder.act(f"pick {box} {hub} {drone}")
+            builder.act(f"put-in-carrier {box} {hub} {drone} {carrier} {chain[k]} {chain[k + 1]}")
+            carrier_count[carrier] = k + 1
+        for _, target, box, person, content in trip:
+            builder.fly(drone, target, carrier)
+            inst.carriers[carrier] = target
+            k = carrier_count[carrier]
+            builder.act(f"take-from-carrier {box} {target} {drone} {carrier} {chain[k - 1]} {chain[k]}")
+            builder.act(f"leave {box} {target} {drone} {person} {content}")
+            carrier_count[carrier] = k - 1
+    else:
+        grips = resource
+        builder.fly(drone, hub)
+        held = []
+        for (_, _, box, _, _), grip in zip(trip, grips):
+            builder.act(f"pick {box} {hub} {grip} {drone}")
+            held.append(grip)
+        for (_, target, box, person, content), grip in zip(trip, held):
+            builder.fly(drone, target)
+            builder.act(f"leave {box} {target} {grip} {drone} {person} {content}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problem")
+    parser.add_argument("-t", "--time-limit", type=float, default=0.5, help="presupuesto de la búsqueda local (s)")
+    args = parser.parse_args()
+
+    try:
+        result = solve_vrp(args.domain, args.problem, args.time_limit)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    with open(args.problem + ".soln", "w") as f:
+        for step in result["plan"]:
+            f.write(step + "\n")
+    cost = result["cost"]
+    print(f"Plan length: {len(result['plan'])} step(s).")
+    print(f"Plan cost: {int(cost) if float(cost).is_integer() else cost}")
+    print(f"Routes: {result['routes']}")
+    print(f"Search time: {result['time']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,20 @@
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
-# Listas para almacenar los datos
-eje_x_problemas = []
-eje_y_tiempos = []
-
-archivo_entrada = '/home/jorge/JSHOP2/JSHOP2/domains/emergencias/benchmark.txt'
-
-with open(archivo_entrada, 'r') as f:
-    for linea in f:
-        if 'Problema' in linea or '---' in linea or '|' not in linea:
-            continue
-        try:
-            partes = linea.split('|')
-            n_problema = int(partes[0].strip().replace('p', ''))
-            tiempo = float(partes[1].strip())
-            
-            eje_x_problemas.append(n_problema)
-            eje_y_tiempos.append(tiempo)
-        except (ValueError, IndexError):
-            continue
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))), "Practica-1", "planificador"))
+from runs import load
+
+# Última sesión de run_all_problems.py en el almacén de resultados (ya no se parte benchmark.txt)
+ejecuciones = load(benchmark="jshop2-emergencias", session="última", where="status = 'ok'")
+ejecuciones = [r for r in ejecuciones if "time_used" in r["extra"]]
+ejecuciones.sort(key=lambda r: r["params"]["n"])
+
+eje_x_problemas = [r["params"]["n"] for r in ejecuciones]
+eje_y_tiempos = [r["extra"]["time_used"] for r in ejecuciones]
 
 # Convertir a arrays de numpy para cálculos matemáticos
 x = np.array(eje_x_problemas)
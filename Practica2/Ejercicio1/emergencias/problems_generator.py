@@ -36,8 +36,9 @@ def generar_problema(n, nombre_fichero):
         f.write("  ((enviar-todo))\n")
         f.write(")\n")
 
-# Generar la batería de problemas
-for i in range(10, 501, 10):
-    generar_problema(i, f"p{i}")
+if __name__ == "__main__":
+    # Generar la batería de problemas
+    for i in range(10, 501, 10):
+        generar_problema(i, f"p{i}")
 
-print("Problemas generados.")
\ No newline at end of file
+    print("Problemas generados.")
\ No newline at end of file
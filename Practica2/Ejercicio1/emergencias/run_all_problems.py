@@ -1,77 +1,348 @@
+import argparse
 import os
 import subprocess
 import re
+import sys
 
-def ejecutar_experimento():
-    # 1. Configuración de rutas para Ubuntu/WSL
-    base_dir = "/home/jorge/JSHOP2/JSHOP2"
-    antlr_jar = os.path.join(base_dir, "jshop2-console", "antlr.jar")
-    jshop_jar = os.path.join(base_dir, "jshop2-console", "JSHOP2.jar")
-    
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))), "Practica-1", "planificador"))
+import anytime
+import searchstats
+from runs import Store, run_command
+
+# Límite de tiempo por problema (segundos)
+TIMEOUT = 300
+
+# 1. Configuración de rutas para Ubuntu/WSL
+BASE_DIR = "/home/jorge/JSHOP2/JSHOP2"
+ANTLR_JAR = os.path.join(BASE_DIR, "jshop2-console", "antlr.jar")
+JSHOP_JAR = os.path.join(BASE_DIR, "jshop2-console", "JSHOP2.jar")
+DOMINIO_DIR = "/home/jorge/JSHOP2/JSHOP2/domains/emergencias"
+DOMINIO = "emergencias"
+
+# Programa que traduce y ejecuta todos los problemas en una sola JVM.
+#   traducir dominio p1 p2 ...   -> JSHOP2.InternalDomain (-r1 para los problemas)
+#   ejecutar N p1 p2 ...         -> N ejecuciones de calentamiento del primero y
+#                                   después "@ problema estado segundos" por cada uno
+# La salida de cada problema va a plan_pXX.txt. Tras un fallo (pila, memoria,
+# tiempo) la JVM termina: Python la vuelve a lanzar con los problemas que faltan.
+# Sin probar todavía (no se ha compilado ni ejecutado con JSHOP2): solo se usa
+# con --lote; por defecto se sigue con una JVM por problema.
+LOTE = "LoteJSHOP2"
+LOTE_JAVA = r"""import java.io.*;
+import java.lang.reflect.*;
+import java.util.*;
+
+public class LoteJSHOP2
+{
+	static volatile Throwable fallo;
+
+	static String causa(Throwable e)
+	{
+		if (e instanceof StackOverflowError)
+			return "pila";
+		if (e instanceof OutOfMemoryError)
+			return "memoria";
+		return "otro";
+	}
+
+	static void invocar(String clase, String[] args) throws Throwable
+	{
+		try {
+			Class.forName(clase).getMethod("main", String[].class).invoke(null, (Object) args);
+		} catch (InvocationTargetException e) {
+			throw e.getCause();
+		}
+	}
+
+	public static void main(String[] args) throws Throwable
+	{
+		if (args[0].equals("traducir")) {
+			invocar("JSHOP2.InternalDomain", new String[] {args[1]});
+			for (int i = 2; i < args.length; i++)
+				invocar("JSHOP2.InternalDomain", new String[] {"-r1", args[i]});
+			return;
+		}
+
+		// Los fallos del SolverThread de JSHOP2 no llegan al hilo principal
+		Thread.setDefaultUncaughtExceptionHandler((hilo, e) -> fallo = e);
+		final PrintStream consola = System.out;
+		final long limite = (long) (Double.parseDouble(args[1]) * 1000);
+		int calentamiento = Integer.parseInt(args[2]);
+
+		System.setOut(new PrintStream(new ByteArrayOutputStream()));
+		for (int i = 0; i < calentamiento; i++)
+			invocar(args[3], new String[0]);
+		System.setOut(consola);
+
+		for (int i = 3; i < args.length; i++) {
+			final String problema = args[i];
+			fallo = null;
+			ByteArrayOutputStream salida = new ByteArrayOutputStream();
+			Timer reloj = new Timer(true);
+			reloj.schedule(new TimerTask() {
+				public void run() {
+					consola.println("@ " + problema + " tiempo " + limite / 1000.0);
+					consola.flush();
+					Runtime.getRuntime().halt(3);
+				}
+			}, limite);
+			System.setOut(new PrintStream(salida, true));
+			long inicio = System.nanoTime();
+			try {
+				invocar(problema, new String[0]);
+			} catch (Throwable e) {
+				fallo = e;
+			}
+			double segundos = (System.nanoTime() - inicio) / 1e9;
+			reloj.cancel();
+			System.setOut(consola);
+			try (FileOutputStream f = new FileOutputStream("plan_" + problema + ".txt")) {
+				salida.writeTo(f);
+			}
+			String estado = fallo == null ? "ok" : causa(fallo);
+			consola.println("@ " + problema + " " + estado + " " + segundos);
+			consola.flush();
+			if (fallo != null)
+				System.exit(2);
+		}
+	}
+}
+"""
+
+
+def causa_error(salida):
+    """Causa del fallo de la JVM según su salida de error."""
+    if "StackOverflowError" in salida:
+        return "pila"
+    if "OutOfMemoryError" in salida:
+        return "memoria"
+    return "otro"
+
+
+def preparar_entorno():
     # 2. Configurar el entorno de Java (CLASSPATH)
-    classpath = f".:{antlr_jar}:{jshop_jar}"
+    classpath = f".:{ANTLR_JAR}:{JSHOP_JAR}"
     env = os.environ.copy()
     env["CLASSPATH"] = classpath
 
     # 3. Carpeta de trabajo
-    dominio_dir = "/home/jorge/JSHOP2/JSHOP2/domains/emergencias"
-    os.chdir(dominio_dir)
+    os.chdir(DOMINIO_DIR)
 
     # 4. Obtener lista de problemas
     todos_los_ficheros = os.listdir('.')
     problemas = [f for f in todos_los_ficheros if re.fullmatch(r'p\d+', f)]
     problemas.sort(key=lambda x: int(re.search(r'\d+', x).group()))
+    return env, problemas
+
+
+def tiempo_used(texto):
+    match = re.search(r"Time Used\s*=\s*([\d\.]+)", texto)
+    return match.group(1) if match else "N/A"
+
+
+def datos_plan(texto):
+    """Longitud y coste del primer plan de la salida de JSHOP2 (None si no hay)."""
+    primero = texto.split("Plan #2:", 1)[0]
+    coste = re.search(r"Plan cost:\s*([\d\.]+)", primero)
+    if not coste:
+        return None, None
+    return sum(1 for l in primero.splitlines() if l.startswith("(!")), float(coste.group(1))
+
+
+def guardar(store, p, modo, estado, texto="", **medidas):
+    """Ejecución de un problema en el almacén de resultados."""
+    longitud, coste = datos_plan(texto) if estado == "ok" else (None, None)
+    if estado == "ok" and longitud is None:
+        estado = "sin plan"
+    tiempo = tiempo_used(texto)
+    extra = {} if tiempo == "N/A" else {"time_used": float(tiempo)}
+    # JSHOP2 no informa de nodos: solo Time Used frente al tiempo medido. La
+    # diferencia es arranque de la JVM y carga del problema, no traducción:
+    # va a overhead_time en lugar de translate_time
+    stats = searchstats.parse("jshop2", texto)
+    if estado == "ok":
+        # Primer plan como serie anytime (anytime.py), comparable con la de los demás planificadores
+        extra["series"] = anytime.jshop(texto)
+    if "search_time" in stats:
+        if medidas.get("wall") is not None:
+            stats["overhead_time"] = round(max(0.0, medidas["wall"] - stats["search_time"]), 3)
+        extra["stats"] = stats
+    store.add("jshop2", modo, p, estado, {"n": int(p[1:])}, length=longitud, cost=coste, **medidas, **extra)
+
+
+def escribir_benchmark(store, modo):
+    """benchmark.txt como consulta sobre la sesión: una línea por problema."""
+    if modo == "por-problema":
+        cabecera = f"{'Problema':<12} | {'Tiempo Used':<12}"
+    else:
+        cabecera = f"{'Problema':<12} | {'Tiempo Used':<12} | {'Búsqueda(s)':<12}"
+    lineas = [cabecera, "-" * (30 if modo == "por-problema" else len(cabecera))]
+    for run in sorted(store.query(), key=lambda r: r["params"]["n"]):
+        p = run["problem"]
+        if run["status"] != "ok":
+            lineas.append(f"{p:<12} | Error en ejecucion ({run['status']})")
+        elif modo == "por-problema":
+            lineas.append(f"{p:<12} | {run['extra'].get('time_used', 'N/A'):<12}")
+        else:
+            lineas.append(f"{p:<12} | {run['extra'].get('time_used', 'N/A'):<12} | {run['wall']:<12.4f}")
+    with open("benchmark.txt", "w") as b_file:
+        b_file.write("\n".join(lineas) + "\n")
+
+
+def limpiar(problema=None):
+    """Borra los ficheros generados por Java (NO los planes ni el benchmark)."""
+    for f in os.listdir('.'):
+        generado = f.endswith(".class") or f in (f"{DOMINIO}.java", f"{DOMINIO}.txt", f"{LOTE}.java")
+        if problema is None:
+            generado = generado or (re.fullmatch(r'p\d+\..*', f) and not f.endswith(".txt"))
+        else:
+            generado = generado or (f.startswith(f"{problema}.") and not f.endswith(".txt"))
+        if generado:
+            try: os.remove(f)
+            except OSError: pass
+
+
+def ejecutar_experimento(store):
+    """Un problema cada vez: traducción, javac y una JVM por problema."""
+    env, problemas = preparar_entorno()
 
     if not problemas:
         print("No se han encontrado archivos de problema (p10, p20...)")
         return
 
-    # Preparamos el archivo de benchmark (modo 'w' para que se limpie al empezar)
-    with open("benchmark.txt", "w") as b_file:
-        b_file.write(f"{'Problema':<12} | {'Tiempo Used':<12}\n")
-        b_file.write("-" * 30 + "\n")
-
     print(f"{'Problema':<12} | {'Tiempo Used':<12}")
     print("-" * 30)
 
     for p in problemas:
         try:
             # Paso A y B: Compilar con JSHOP2
-            subprocess.run(["java", "JSHOP2.InternalDomain", "emergencias"], env=env, check=True, capture_output=True)
+            subprocess.run(["java", "JSHOP2.InternalDomain", DOMINIO], env=env, check=True, capture_output=True)
             subprocess.run(["java", "JSHOP2.InternalDomain", "-r1", p], env=env, check=True, capture_output=True)
 
             # Paso C: Compilar Java
-            subprocess.run(["javac", "emergencias.java", f"{p}.java"], env=env, check=True)
-
-            # Paso D: Ejecutar y guardar el plan en un .txt individual
-            resultado = subprocess.run(["java", p], env=env, check=True, capture_output=True, text=True)
-            
-            # Guardamos el contenido completo en plan_pXX.txt
-            with open(f"plan_{p}.txt", "w") as plan_file:
-                plan_file.write(resultado.stdout)
-            
-            # Extraer el tiempo
-            match = re.search(r"Time Used\s*=\s*([\d\.]+)", resultado.stdout)
-            tiempo = match.group(1) if match else "N/A"
-            
-            linea = f"{p:<12} | {tiempo:<12}"
-            print(linea)
-            
-            # Guardar en el benchmark
-            with open("benchmark.txt", "a") as b_file:
-                b_file.write(linea + "\n")
+            subprocess.run(["javac", f"{DOMINIO}.java", f"{p}.java"], env=env, check=True)
+
+            # Paso D: Ejecutar (midiendo CPU y memoria de la JVM) y guardar el plan en un .txt individual
+            resultado = run_command(["java", p], timeout=TIMEOUT, env=env)
+            medidas = {k: resultado[k] for k in ("wall", "cpu", "rss")}
+            if resultado["timeout"]:
+                causa = "tiempo"
+            elif resultado["returncode"] != 0:
+                # Se separa la causa: pila, memoria (heap) u otro error
+                causa = causa_error(resultado["stderr"])
+            else:
+                causa = "ok"
+                # Guardamos el contenido completo en plan_pXX.txt
+                with open(f"plan_{p}.txt", "w") as plan_file:
+                    plan_file.write(resultado["stdout"])
+            guardar(store, p, "por-problema", causa, resultado["stdout"], **medidas)
 
         except subprocess.CalledProcessError as e:
-            msg_err = f"{p:<12} | Error en ejecucion"
-            print(msg_err)
-            with open("benchmark.txt", "a") as b_file:
-                b_file.write(msg_err + "\n")
-        
-        # Limpieza de archivos generados por Java (NO borramos los planes ni el benchmark)
-        for f in os.listdir('.'):
-            if f.endswith(".class") or f == "emergencias.java" or f == "emergencias.txt" or (f.startswith(f"{p}.") and not f.endswith(".txt")):
-                try: os.remove(f)
-                except: pass
+            salida = e.stderr or ""
+            causa = causa_error(salida if isinstance(salida, str) else salida.decode(errors="replace"))
+            guardar(store, p, "por-problema", causa)
+
+        if causa == "ok":
+            print(f"{p:<12} | {tiempo_used(resultado['stdout']):<12}")
+        else:
+            print(f"{p:<12} | Error en ejecucion ({causa})")
+        limpiar(p)
+
+    escribir_benchmark(store, "por-problema")
+
+
+def traducir_lote(env, problemas):
+    """Dominio y problemas traducidos en una JVM; los que falten, uno a uno."""
+    subprocess.run(["java", LOTE, "traducir", DOMINIO] + problemas, env=env, capture_output=True)
+    if not os.path.exists(f"{DOMINIO}.java"):
+        subprocess.run(["java", "JSHOP2.InternalDomain", DOMINIO], env=env, check=True, capture_output=True)
+    for p in problemas:
+        if not os.path.exists(f"{p}.java"):
+            subprocess.run(["java", "JSHOP2.InternalDomain", "-r1", p], env=env, check=True, capture_output=True)
+        # El main generado espera al SolverThread con sleep(500): join mide solo la búsqueda
+        with open(f"{p}.java") as f:
+            codigo = f.read()
+        codigo = re.sub(r"while \(thread\.isAlive\(\)\)\s*Thread\.sleep\(500\);", "thread.join();", codigo)
+        with open(f"{p}.java", "w") as f:
+            f.write(codigo)
+
+
+def ejecutar_lote(store, calentamiento=1, pila=None):
+    """
+    Traduce una vez, compila todo con un solo javac y ejecuta los problemas
+    en una JVM que mide cada búsqueda por separado (sin el arranque de la JVM).
+    La JVM es compartida, así que no hay CPU ni memoria por problema.
+    """
+    env, problemas = preparar_entorno()
+
+    if not problemas:
+        print("No se han encontrado archivos de problema (p10, p20...)")
+        return
+
+    with open(f"{LOTE}.java", "w") as f:
+        f.write(LOTE_JAVA)
+    subprocess.run(["javac", f"{LOTE}.java"], env=env, check=True)
+    traducir_lote(env, problemas)
+    subprocess.run(["javac", f"{DOMINIO}.java"] + [f"{p}.java" for p in problemas], env=env, check=True)
+
+    cabecera = f"{'Problema':<12} | {'Tiempo Used':<12} | {'Búsqueda(s)':<12}"
+    print(cabecera)
+    print("-" * len(cabecera))
+
+    java = ["java"] + ([f"-Xss{pila}"] if pila else [])
+    pendientes = list(problemas)
+    while pendientes:
+        proceso = subprocess.run(java + [LOTE, "ejecutar", str(TIMEOUT), str(calentamiento)] + pendientes,
+                                 env=env, capture_output=True, text=True)
+        hechos = {}
+        for linea in proceso.stdout.splitlines():
+            if linea.startswith("@ "):
+                _, p, estado, segundos = linea.split()
+                hechos[p] = (estado, segundos)
+        fallido = any(estado != "ok" for estado, _ in hechos.values())
+        if not fallido and len(hechos) < len(pendientes):
+            # La JVM cayó sin informar (p. ej. en el calentamiento): se culpa
+            # al primer problema sin resultado
+            primero = next(p for p in pendientes if p not in hechos)
+            hechos[primero] = (causa_error(proceso.stderr), "-")
+
+        for p in [p for p in pendientes if p in hechos]:
+            estado, segundos = hechos[p]
+            wall = None if segundos == "-" else float(segundos)
+            if estado == "ok":
+                with open(f"plan_{p}.txt") as plan_file:
+                    texto = plan_file.read()
+                guardar(store, p, "lote", estado, texto, wall=wall)
+                linea = f"{p:<12} | {tiempo_used(texto):<12} | {wall:<12.4f}"
+            else:
+                guardar(store, p, "lote", estado, wall=wall)
+                linea = f"{p:<12} | Error en ejecucion ({estado})"
+            print(linea)
+        # Tras un fallo se lanza una JVM nueva (con su calentamiento) para el resto
+        pendientes = [p for p in pendientes if p not in hechos]
+
+    escribir_benchmark(store, "lote")
+    limpiar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de JSHOP2 con los problemas pN de emergencias")
+    parser.add_argument("--lote", action="store_true",
+                        help="traducir y compilar una vez y ejecutar todo en una JVM (experimental, sin "
+                             "probar con JSHOP2); por defecto, una traducción, un javac y una JVM por problema")
+    parser.add_argument("--calentamiento", type=int, default=1,
+                        help="con --lote, ejecuciones descartadas del primer problema antes de medir")
+    parser.add_argument("--pila", default=None, help="con --lote, tamaño de pila de la JVM (-Xss), p. ej. 64m")
+    args = parser.parse_args()
+    # Cada ejecución va al almacén de resultados (benchmark "jshop2-emergencias");
+    # benchmark.txt se escribe al final consultándolo
+    with Store("jshop2-emergencias") as store:
+        if args.lote:
+            ejecutar_lote(store, args.calentamiento, args.pila)
+        else:
+            ejecutar_experimento(store)
+
 
 if __name__ == "__main__":
-    ejecutar_experimento()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark del mejor plan HTN (best.py) frente al primero (htn.py).
+
+Resuelve los problemas de Ejercicio2/avanzado y problemas generados con más
+localizaciones y transportadores (capacidades y necesidades aleatorias,
+semilla fija). Se anota el coste del primer plan, el del mejor, la mejora,
+si se demostró óptimo antes del deadline, el tiempo con un proceso y con el
+pool, y los nodos, podas por coste y aciertos de la memoria.
+
+El pool se lanza siempre con POOL_WORKERS = max(2, cpu_count) procesos:
+con el número por defecto, en una máquina de un núcleo find_best lo
+resolvería en secuencial y las dos columnas de tiempo medirían lo mismo.
+Con un solo núcleo los procesos se reparten la CPU, así que la columna del
+pool mide el coste de repartir, no una aceleración.
+
+Uso:
+    python3 benchmark_best.py [deadline]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+from best import find_best
+from htn import find_plans
+from jshop import parse_domain, parse_problem
+
+AVANZADO_DIR = os.path.join(PRACTICA_DIR, "Ejercicio2", "avanzado")
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "best.txt")
+
+PROBLEMS = ["problem", "problem_cajas_sueltas", "problem_multi-drop", "problem_necesidad_masiva"]
+# (localizaciones, transportadores)
+GENERATED = [(3, 2), (4, 2), (5, 3), (6, 3), (7, 4)]
+POOL_WORKERS = max(2, os.cpu_count() or 1)
+
+
+def generate_problem(locations, transporters, seed):
+    """Problema de avanzado con necesidades 0..6 y capacidades 5..40."""
+    rnd = random.Random(seed)
+    lines = ["(defproblem problem avanzado", "  (", "    (at-dron d1 loc-base)", "    (capacidad d1 0)",
+             "    (carga d1 medicina 0)", "    (carga d1 comida 0)", "    (coste-total 0)"]
+    for i in range(1, transporters + 1):
+        lines += [f"    (trans-en t{i} loc-base)", f"    (capacidad-trans t{i} {rnd.choice([5, 10, 20, 40])})"]
+    lines += ["    (cajas-en loc-almacen medicina 100)", "    (cajas-en loc-almacen comida 100)"]
+    for i in range(1, locations + 1):
+        lines += [f"    (necesidad loc{i} medicina {rnd.randint(0, 6)})",
+                  f"    (necesidad loc{i} comida {rnd.randint(0, 6)})"]
+    lines += ["  )", "  ((enviar-todo-avanzado))", ")"]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    deadline = float(sys.argv[1]) if len(sys.argv) > 1 else 120
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Problema':<26} | {'Primero':>8} | {'Mejor':>8} | {'Mejora':>7} | {'Óptimo':>6} | "
+              f"{'T 1p(s)':>8} | {f'T {POOL_WORKERS}p(s)':>9} | {'Trab.':>5} | {'Nodos':>8} | {'Podas':>7} | {'Memo':>7}")
+    lines = [f"BENCHMARK MEJOR PLAN HTN - {time.strftime('%Y-%m-%d %H:%M:%S')} (cpu_count={os.cpu_count()}, "
+             f"deadline {deadline}s, pool de {POOL_WORKERS} procesos)", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    domain = parse_domain(os.path.join(AVANZADO_DIR, "avanzado"))
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = [(name, os.path.join(AVANZADO_DIR, name)) for name in PROBLEMS]
+        for locations, transporters in GENERATED:
+            path = os.path.join(tmp, f"gen_{locations}loc_{transporters}trans")
+            with open(path, "w") as f:
+                f.write(generate_problem(locations, transporters, seed=locations))
+            cases.append((os.path.basename(path), path))
+
+        for name, path in cases:
+            problem = parse_problem(path)
+            first = find_plans(domain, problem)
+            sequential = find_best(domain, problem, deadline, workers=1)
+            result = find_best(domain, problem, deadline, workers=POOL_WORKERS)
+            first_cost = first["plans"][0][1] if first["plans"] else None
+            if result["solved"] and first_cost:
+                gain = f"{100 * (first_cost - result['cost']) / first_cost:.1f}%"
+                part = f"{first_cost:>8} | {result['cost']:>8} | {gain:>7}"
+            else:
+                part = f"{first_cost or '-':>8} | {'-':>8} | {'-':>7}"
+            line = (f"{name:<26} | {part} | {'sí' if result['optimal'] else 'no':>6} | "
+                    f"{sequential['time']:>8} | {result['time']:>9} | {result['jobs']:>5} | "
+                    f"{result['nodes']:>8} | {result['pruned']:>7} | {result['hits']:>7}")
+            print(line)
+            lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark cruzado de planificadores sobre las mismas instancias de emergencias.
+
+Cada instancia se resuelve en su formato PDDL (Parte-1) con FF, pyperplan,
+Fast Downward (lama-first) y el motor propio (planner.py, gbfs), y pasada a
+JSHOP2 (convert.py), con htn.py. El plan HTN se vuelve a pasar a PDDL y
+todos los planes se validan con validate.py sobre el dominio PDDL, así que
+la comparación es entre planes válidos de la misma instancia:
+
+    - Instancias: problem_sizeN.pddl de la Parte-1 y problemas pN de
+      Ejercicio1/emergencias pasados a PDDL (el dron empieza en base).
+    - Tiempo: de pared, incluido el arranque del proceso en todos menos
+      htn.py, que se llama en proceso con la conversión de ida y vuelta. Se da también en ms por
+      objetivo (person-has) para comparar tamaños distintos.
+    - Los planificadores que no están instalados salen como "no disponible".
+
+Con un número impar de cajas el dominio JSHOP2 no tiene plan: en el último
+viaje CargarDos de llenar-brazos unifica las dos garras con la misma caja, la
+rama falla y la vuelta atrás recorre todas las combinaciones anteriores
+(problem_size5 agota el timeout; problem_size1 falla en el acto y no se
+incluye). Los pN del repositorio (múltiplos de 10) tienen un número par.
+
+Uso:
+    python3 benchmark_cross.py [timeout]
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+REPO_DIR = os.path.dirname(PRACTICA_DIR)
+PLANIFICADOR_DIR = os.path.join(REPO_DIR, "Practica-1", "planificador")
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, PLANIFICADOR_DIR)
+from convert import jshop_to_pddl, pddl_to_jshop, plan_steps, plan_to_pddl
+from htn import find_plans
+from jshop import parse_domain, parse_problem
+from validate import validate_plan
+
+EMERGENCIAS_DIR = os.path.join(PRACTICA_DIR, "Ejercicio1", "emergencias")
+PDDL_DIR = os.path.join(REPO_DIR, "Practica-1", "Parte-1", "Ejercicio3")
+PDDL_DOMAIN = os.path.join(PDDL_DIR, "domainemergencias.pddl")
+OWN_PLANNER = os.path.join(PLANIFICADOR_DIR, "planner.py")
+DOWNWARD_SIF = os.path.join(REPO_DIR, "Practica-1", "Parte-2", "Ejercicio2", "downward.sif")
+PYPERPLAN = shutil.which("pyperplan") or os.path.expanduser("~/planutils-venv/bin/pyperplan")
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "cross.txt")
+
+PDDL_SIZES = [2, 5, 10, 20, 30]
+JSHOP_PROBLEMS = ["p10", "p50", "p100"]
+PLANNERS = ["htn", "propio-gbfs", "ff", "pyperplan", "fd-lama"]
+
+
+def external_command(planner, problem):
+    """Comando del planificador, o None si no está instalado."""
+    if planner == "propio-gbfs":
+        # En otro proceso: planner.py no corta gbfs por tiempo
+        return [sys.executable, OWN_PLANNER, "-s", "gbfs", "-H", "emergencias", PDDL_DOMAIN, problem]
+    if planner == "ff":
+        return ["planutils", "run", "ff", PDDL_DOMAIN, problem] if shutil.which("planutils") else None
+    if planner == "pyperplan":
+        if not os.path.exists(PYPERPLAN):
+            return None
+        return [PYPERPLAN, "-s", "gbfs", "-H", "hff", PDDL_DOMAIN, problem]
+    if planner == "fd-lama":
+        if not os.path.exists(DOWNWARD_SIF):
+            return None
+        return [DOWNWARD_SIF, "--alias", "lama-first", PDDL_DOMAIN, problem]
+    raise ValueError(f"planificador desconocido: {planner}")
+
+
+def run_external(planner, problem, timeout):
+    """Plan (líneas PDDL) y tiempo de un planificador en otro proceso, o None si no está."""
+    command = external_command(planner, problem)
+    if command is None:
+        return None
+    workdir = os.path.dirname(problem)
+    start = time.time()
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout, cwd=workdir)
+    except subprocess.TimeoutExpired:
+        return {"plan": None, "time": timeout, "status": "tiempo"}
+    elapsed = time.time() - start
+    # planner.py y pyperplan escriben <problema>.soln y Fast Downward sas_plan;
+    # FF solo la salida
+    lines = result.stdout.splitlines()
+    for plan_file in (problem + ".soln", os.path.join(workdir, "sas_plan")):
+        if os.path.exists(plan_file):
+            with open(plan_file) as f:
+                lines = f.read().splitlines()
+            os.remove(plan_file)
+    steps = plan_steps(lines)
+    return {"plan": ["(" + " ".join(step) + ")" for step in steps] or None, "time": elapsed,
+            "status": "ok" if steps else "sin plan"}
+
+
+def run_htn(domain, problem_text, timeout):
+    """Conversión a JSHOP2, htn.py y conversión del plan a PDDL."""
+    start = time.time()
+    jshop_text, names = pddl_to_jshop(problem_text)
+    with tempfile.NamedTemporaryFile("w", suffix=".jshop", delete=False) as f:
+        f.write(jshop_text)
+    try:
+        result = find_plans(domain, parse_problem(f.name), timeout=timeout)
+    finally:
+        os.remove(f.name)
+    if not result["plans"]:
+        return {"plan": None, "time": time.time() - start, "status": "tiempo" if result["timeout"] else "sin plan"}
+    plan = plan_to_pddl(result["plans"][0][0], names)
+    return {"plan": plan, "time": time.time() - start, "status": "ok"}
+
+
+def goals(problem_text):
+    return problem_text.count("(person-has")
+
+
+def main():
+    timeout = float(sys.argv[1]) if len(sys.argv) > 1 else 60
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Instancia':<18} | {'Obj.':>5} | {'Planificador':<12} | {'Estado':<14} | "
+              f"{'Longitud':>8} | {'Tiempo(s)':>9} | {'ms/obj.':>8}")
+    lines = [f"BENCHMARK CRUZADO PDDL/JSHOP2 - {time.strftime('%Y-%m-%d %H:%M:%S')} (timeout {timeout:g}s)",
+             "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    domain = parse_domain(os.path.join(EMERGENCIAS_DIR, "emergencias"))
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = []
+        for n in PDDL_SIZES:
+            path = os.path.join(tmp, f"problem_size{n}.pddl")
+            shutil.copy(os.path.join(PDDL_DIR, "problems", f"problem_size{n}.pddl"), path)
+            cases.append((f"problem_size{n}", path))
+        for name in JSHOP_PROBLEMS:
+            with open(os.path.join(EMERGENCIAS_DIR, name), encoding="utf-8") as f:
+                text, _ = jshop_to_pddl(f.read())
+            path = os.path.join(tmp, f"{name}.pddl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            cases.append((name, path))
+
+        for label, path in cases:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            n_goals = goals(text)
+            for planner in PLANNERS:
+                if planner == "htn":
+                    result = run_htn(domain, text, timeout)
+                else:
+                    result = run_external(planner, path, timeout)
+                if result is None:
+                    line = f"{label:<18} | {n_goals:>5} | {planner:<12} | {'no disponible':<14} | {'-':>8} | {'-':>9} | {'-':>8}"
+                else:
+                    status, length = result["status"], "-"
+                    if result["plan"]:
+                        check = validate_plan(PDDL_DOMAIN, path, result["plan"])
+                        status = "ok" if check["valid"] else "inválido"
+                        length = check["length"]
+                    line = (f"{label:<18} | {n_goals:>5} | {planner:<12} | {status:<14} | {length:>8} | "
+                            f"{result['time']:>9.3f} | {1000 * result['time'] / n_goals:>8.2f}")
+                print(line)
+                lines.append(line)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los almacenes de hechos de htn.py (facts.py).
+
+Genera problemas de emergencias con problems_generator.py (N personas y N
+cajas, semilla N) y los resuelve con la lista por predicado (ListStore) y
+con los índices por argumento (FactStore). Se anota el tiempo de búsqueda,
+los microsegundos por acción del plan (constantes si el coste es lineal) y
+si los dos planes coinciden. La lista se omite por encima de LIST_MAX.
+
+Uso:
+    python3 benchmark_facts.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+EMERGENCIAS_DIR = os.path.join(PRACTICA_DIR, "Ejercicio1", "emergencias")
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, EMERGENCIAS_DIR)
+from htn import find_plans
+from jshop import parse_domain, parse_problem
+from problems_generator import generar_problema
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "facts.txt")
+
+SIZES = [10, 100, 500, 1000, 2000, 5000, 10000, 20000, 50000]
+LIST_MAX = 2000
+
+
+def solve(domain, problem, store):
+    result = find_plans(domain, problem, store=store)
+    if not result["plans"]:
+        return None, result["time"]
+    return result["plans"][0][0], result["time"]
+
+
+def benchmark(lines):
+    domain = parse_domain(os.path.join(EMERGENCIAS_DIR, "emergencias"))
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for n in SIZES:
+                random.seed(n)
+                generar_problema(n, f"p{n}")
+                problem = parse_problem(f"p{n}")
+                plan, index_time = solve(domain, problem, "index")
+                if plan is None:
+                    line = f"{'p' + str(n):<8} | {'-':>8} | {'-':>9} | {index_time:>9} | {'-':>9} | {'-':>9} | sin plan"
+                else:
+                    per_action = 1e6 * index_time / len(plan)
+                    if n <= LIST_MAX:
+                        list_plan, list_time = solve(domain, problem, "list")
+                        same = "sí" if list_plan == plan else "NO"
+                        list_part = f"{list_time:>9} | {1e6 * list_time / len(plan):>9.1f}"
+                    else:
+                        same = "-"
+                        list_part = f"{'-':>9} | {'-':>9}"
+                    line = (f"{'p' + str(n):<8} | {len(plan):>8} | {list_part} | "
+                            f"{index_time:>9} | {per_action:>9.1f} | {same}")
+                print(line)
+                lines.append(line)
+        finally:
+            os.chdir(cwd)
+
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Problema':<8} | {'Acciones':>8} | {'Lista(s)':>9} | {'µs/acc.':>9} | "
+              f"{'Índice(s)':>9} | {'µs/acc.':>9} | Mismo plan")
+    lines = [f"BENCHMARK ALMACÉN DE HECHOS - {time.strftime('%Y-%m-%d %H:%M:%S')}", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    benchmark(lines)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark del planificador HTN en Python (htn.py) frente a JSHOP2.
+
+Resuelve los problemas pN de Ejercicio1/emergencias y los de
+Ejercicio2/avanzado en el mismo proceso, sin generar ni compilar Java, y
+compara cada plan con el que guardó JSHOP2 (plan_pN.txt) cuando existe.
+Se anota el tiempo de lectura del dominio y del problema, el de búsqueda y
+el "Time Used" de JSHOP2 (o "error" si benchmark.txt dice que falló; su
+plan_pN.txt es entonces de otra ejecución y no se compara).
+
+Los fallos se separan por causa: "pila" (RecursionError), "memoria"
+(MemoryError) y "tiempo" (más de timeout segundos).
+
+Uso:
+    python3 benchmark_htn.py [timeout]
+"""
+
+import os
+import re
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+from htn import find_plans
+from jshop import parse_domain, parse_problem
+
+EMERGENCIAS_DIR = os.path.join(PRACTICA_DIR, "Ejercicio1", "emergencias")
+AVANZADO_DIR = os.path.join(PRACTICA_DIR, "Ejercicio2", "avanzado")
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "htn.txt")
+JSHOP_BENCHMARK = os.path.join(EMERGENCIAS_DIR, "benchmark.txt")
+
+
+def jshop_errors():
+    """Problemas que JSHOP2 no resolvió según benchmark.txt."""
+    if not os.path.exists(JSHOP_BENCHMARK):
+        return set()
+    with open(JSHOP_BENCHMARK) as f:
+        return {line.split("|")[0].strip() for line in f if "Error" in line}
+
+
+def reference(path):
+    """Plan y Time Used de una salida de JSHOP2 (o None si no hay)."""
+    if not os.path.exists(path):
+        return None, None
+    with open(path) as f:
+        text = f.read()
+    steps = [line.strip() for line in text.splitlines() if line.strip().startswith("(!")]
+    used = re.search(r"Time Used\s*=\s*([\d.]+)", text)
+    return steps, used.group(1) if used else "-"
+
+
+def run(domain, problem_file, expected, timeout):
+    start = time.time()
+    problem = parse_problem(problem_file)
+    parse_time = time.time() - start
+    try:
+        result = find_plans(domain, problem, timeout=timeout)
+    except RecursionError:
+        return parse_time, None, None, "pila"
+    except MemoryError:
+        return parse_time, None, None, "memoria"
+    if result["timeout"]:
+        return parse_time, result["time"], None, "tiempo"
+    if not result["plans"]:
+        return parse_time, result["time"], None, "sin plan"
+    plan, cost = result["plans"][0]
+    if expected is None:
+        status = "-"
+    else:
+        status = "igual" if plan == expected else "DISTINTO"
+    return parse_time, result["time"], (len(plan), cost), status
+
+
+def main():
+    timeout = float(sys.argv[1]) if len(sys.argv) > 1 else 300
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Problema':<53} | {'Lectura(s)':>10} | {'Búsqueda(s)':>11} | {'Acciones':>8} | "
+              f"{'Coste':>7} | {'JSHOP2(s)':>9} | Plan JSHOP2")
+    lines = [f"BENCHMARK HTN - {time.strftime('%Y-%m-%d %H:%M:%S')} (timeout {timeout}s)", "", header,
+             "-" * len(header)]
+    print("\n".join(lines))
+
+    cases = []
+    errors = jshop_errors()
+    start = time.time()
+    emergencias = parse_domain(os.path.join(EMERGENCIAS_DIR, "emergencias"))
+    problems = sorted((f for f in os.listdir(EMERGENCIAS_DIR) if re.fullmatch(r"p\d+", f)),
+                      key=lambda f: int(f[1:]))
+    for name in problems:
+        plan_file = "error" if name in errors else os.path.join(EMERGENCIAS_DIR, f"plan_{name}.txt")
+        cases.append((name, emergencias, os.path.join(EMERGENCIAS_DIR, name), plan_file))
+    for domain_name in ("avanzado", "avanzado_costes_sin_corregir"):
+        domain = parse_domain(os.path.join(AVANZADO_DIR, domain_name))
+        for name in sorted(f for f in os.listdir(AVANZADO_DIR) if f.startswith("problem")):
+            cases.append((f"{domain_name}/{name}", domain, os.path.join(AVANZADO_DIR, name), None))
+    domain_time = time.time() - start
+
+    for label, domain, problem_file, plan_file in cases:
+        if plan_file == "error":
+            expected, jshop_time = None, "error"
+        else:
+            expected, jshop_time = reference(plan_file) if plan_file else (None, None)
+        parse_time, search_time, plan, status = run(domain, problem_file, expected, timeout)
+        search = "-" if search_time is None else f"{search_time:.3f}"
+        length, cost = plan if plan else ("-", "-")
+        line = (f"{label:<53} | {parse_time:>10.4f} | {search:>11} | {length:>8} | {cost:>7} | "
+                f"{jshop_time or '-':>9} | {status}")
+        print(line)
+        lines.append(line)
+
+    lines += ["", f"Lectura de los dominios: {domain_time:.4f}s"]
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la tabla de subtareas (table.py).
+
+Resuelve con y sin tabla problemas de emergencias generados con
+problems_generator.py (primer plan) y problemas de avanzado generados como
+en benchmark_best.py, enumerando hasta PLANS planes (la vuelta atrás repite
+las mismas subtareas con el mismo estado). Se comprueba que los planes son
+los mismos y se anotan tiempos, aciertos, fallos, tareas omitidas (lecturas
+de más de SLICE_MAX hechos), acciones repetidas desde la tabla y tareas que
+se dejaron de tablar.
+
+Uso:
+    python3 benchmark_table.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRACTICA_DIR = os.path.dirname(BASE_DIR)
+EMERGENCIAS_DIR = os.path.join(PRACTICA_DIR, "Ejercicio1", "emergencias")
+AVANZADO_DIR = os.path.join(PRACTICA_DIR, "Ejercicio2", "avanzado")
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, EMERGENCIAS_DIR)
+from benchmark_best import generate_problem
+from htn import find_plans
+from jshop import parse_domain, parse_problem
+from problems_generator import generar_problema
+
+RESULTS_DIR = os.path.join(BASE_DIR, "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "table.txt")
+
+EMERGENCIAS_SIZES = [100, 1000, 5000, 10000]
+# (localizaciones, transportadores)
+AVANZADO_SIZES = [(4, 2), (5, 3), (6, 3)]
+PLANS = 3000
+
+
+def run(label, domain, problem, limit):
+    plain = find_plans(domain, problem, limit)
+    tabled = find_plans(domain, problem, limit, table=True)
+    stats = tabled["table"]
+    speedup = plain["time"] / tabled["time"] if tabled["time"] else float("inf")
+    return (f"{label:<24} | {len(plain['plans']):>6} | {plain['time']:>9} | {tabled['time']:>9} | "
+            f"{speedup:>5.2f}x | {stats['hits']:>8} | {stats['misses']:>7} | {stats['skipped']:>7} | "
+            f"{stats['replayed']:>8} | {'sí' if plain['plans'] == tabled['plans'] else 'NO':>4} | "
+            f"{', '.join(stats['disabled']) or '-'}")
+
+
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    header = (f"{'Problema':<24} | {'Planes':>6} | {'Sin(s)':>9} | {'Tabla(s)':>9} | {'Acel.':>6} | "
+              f"{'Aciertos':>8} | {'Fallos':>7} | {'Omitid.':>7} | {'Repet.':>8} | {'Igual':>4} | Desactivadas")
+    lines = [f"BENCHMARK TABLA DE SUBTAREAS - {time.strftime('%Y-%m-%d %H:%M:%S')}", "", header, "-" * len(header)]
+    print("\n".join(lines))
+
+    emergencias = parse_domain(os.path.join(EMERGENCIAS_DIR, "emergencias"))
+    avanzado = parse_domain(os.path.join(AVANZADO_DIR, "avanzado"))
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for n in EMERGENCIAS_SIZES:
+                random.seed(n)
+                generar_problema(n, f"p{n}")
+                line = run(f"emergencias p{n}", emergencias, parse_problem(f"p{n}"), 1)
+                print(line)
+                lines.append(line)
+            for locations, transporters in AVANZADO_SIZES:
+                name = f"gen_{locations}loc_{transporters}trans"
+                with open(name, "w") as f:
+                    f.write(generate_problem(locations, transporters, seed=locations))
+                line = run(f"avanzado {name}", avanzado, parse_problem(name), PLANS)
+                print(line)
+                lines.append(line)
+        finally:
+            os.chdir(cwd)
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"\n📄 Resultados guardados en: {RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
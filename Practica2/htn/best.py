@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Plan HTN de coste mínimo por ramificación y poda.
+
+JSHOP2 (y htn.py) devuelve el primer plan que encuentra. En avanzado el
+coste está en los operadores (!volar cuesta 50 + cap/10) y el primer plan
+no tiene por qué ser el más barato: dependen de qué localización atiende
+antes enviar-todo-avanzado, qué transportador elige preparar-envio o a qué
+pueblo lleva las sobras cargar-para-otro. Aquí se recorren todas las
+alternativas (todos los unificadores de la rama elegida de cada método y
+todos los operadores aplicables) y se devuelve el plan más barato.
+
+Las ramas siguen siendo if-then-else, como en JSHOP2: probar también las
+siguientes no tiene sentido en HTN, donde no hay objetivo que comprobar;
+la rama "terminar" de enviar-todo-avanzado daría el plan vacío (coste 0).
+
+    - Poda por coste: un nodo cuyo coste acumulado ya iguala o supera el del
+      mejor plan se abandona (los costes de los operadores son >= 0).
+    - Memoria de subtareas: para cada par (agenda pendiente, estado) se
+      guarda el menor coste con el que se ha llegado. La descomposición a
+      partir de ahí no depende del camino, así que si se vuelve con un coste
+      igual o mayor se poda (también corta los ciclos).
+    - Procesos: se avanza desde la raíz mientras haya una sola alternativa y
+      las del primer punto de elección se reparten en un pool de procesos.
+      La cota del mejor plan se comparte entre ellos (mp.Value con cerrojo:
+      comparar y escribir se hace dentro de get_lock(), si no dos procesos
+      podrían pisarse y dejar la cota peor de las dos); sin pool,
+      los trabajos se resuelven uno tras otro con la misma cota, así el plan
+      del primero ya poda los siguientes.
+    - deadline: al llegar, cada proceso se detiene y se devuelve el mejor
+      plan encontrado hasta entonces (optimal = False).
+    - Traza anytime: cada plan que mejora al mejor de su proceso se anota
+      con su instante; find_best devuelve los que mejoran a todos los
+      anteriores (solutions: [(s desde el inicio, coste, longitud)]), como
+      las series de Practica-1/planificador/anytime.py.
+
+Uso:
+    python3 best.py dominio problema [-t 60] [-j 4]
+"""
+
+import argparse
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from facts import FactStore
+from htn import Planner, format_plans, make_agenda
+from jshop import parse_domain, parse_problem
+
+MEMO_MAX = 1000000
+
+
+class BestPlanner(Planner):
+    """Planner que poda por coste y por pares (agenda, estado) ya vistos."""
+
+    def __init__(self, domain, store=FactStore, shared=None):
+        super().__init__(domain, store)
+        self.best = math.inf
+        self.shared = shared
+        self.memo = {}
+        self.nodes = 0
+        self.pruned = 0
+        self.hits = 0
+
+    def bound(self):
+        if self.shared is None:
+            return self.best
+        return min(self.best, self.shared.value)
+
+    def improve(self, cost):
+        self.best = cost
+        if self.shared is None:
+            return
+        if not hasattr(self.shared, "get_lock"):
+            self.shared.value = min(self.shared.value, cost)
+            return
+        with self.shared.get_lock():
+            if cost < self.shared.value:
+                self.shared.value = cost
+
+    def prune(self, agenda, state, cost):
+        self.nodes += 1
+        if cost >= self.bound():
+            self.pruned += 1
+            return True
+        key = (agenda, state.frozen())
+        seen = self.memo.get(key)
+        if seen is not None and seen <= cost:
+            self.hits += 1
+            return True
+        if seen is not None or len(self.memo) < MEMO_MAX:
+            self.memo[key] = cost
+        return False
+
+
+def frontier(planner, problem):
+    """
+    Avanza desde la raíz mientras haya una sola alternativa.
+    Returns: trabajos [(hechos, agenda, plan, coste)], uno por alternativa
+    """
+    state = planner.store(problem.state)
+    agenda = make_agenda(problem.tasks)
+    plan, cost = [], 0.0
+    options = []
+    while agenda is not None:
+        options = list(planner._options(agenda, state))
+        if len(options) != 1:
+            break
+        op, bindings, agenda = options[0]
+        if op is not None:
+            _, step, step_cost = planner.take(op, bindings, state)
+            plan.append(step)
+            cost += step_cost
+    if agenda is None:
+        return [(state.atoms(), None, plan, cost)]
+    jobs = []
+    for op, bindings, following in options:
+        if op is None:
+            jobs.append((state.atoms(), following, plan, cost))
+            continue
+        changes, step, step_cost = planner.take(op, bindings, state)
+        jobs.append((state.atoms(), following, plan + [step], cost + step_cost))
+        state.undo(changes)
+    return jobs
+
+
+def solve_job(domain, job, end, shared=None):
+    """Mejor plan a partir de un trabajo de frontier antes de end (o sin límite)."""
+    facts, agenda, plan, cost = job
+    planner = BestPlanner(domain, shared=shared)
+    best = None
+    trace = []
+    complete = True
+    deadline = None if end is None else max(0.0, end - time.time())
+    try:
+        for found, found_cost in planner.search(agenda, planner.store(facts), deadline, plan, cost):
+            if found_cost < planner.best:
+                best = (found, found_cost)
+                trace.append((time.time(), found_cost, len(found)))
+                planner.improve(found_cost)
+    except TimeoutError:
+        complete = False
+    return {"plan": best, "trace": trace, "complete": complete, "nodes": planner.nodes,
+            "pruned": planner.pruned, "hits": planner.hits}
+
+
+_worker = {}
+
+
+def _init_worker(domain, end, shared):
+    _worker.update(domain=domain, end=end, shared=shared)
+
+
+def _solve_job(job):
+    return solve_job(_worker["domain"], job, _worker["end"], _worker["shared"])
+
+
+def _pool_context():
+    return mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+
+
+def find_best(domain, problem, deadline=None, workers=None):
+    """
+    Plan de coste mínimo (entre los que admite la semántica de JSHOP2).
+    Returns: {solved, plan, cost, optimal, time, solutions, jobs, nodes, pruned, hits}
+    """
+    start = time.time()
+    end = None if deadline is None else start + deadline
+    jobs = frontier(BestPlanner(domain), problem)
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) == 1:
+        shared = types.SimpleNamespace(value=math.inf)
+        results = [solve_job(domain, job, end, shared) for job in jobs]
+    else:
+        context = _pool_context()
+        shared = context.Value("d", math.inf)
+        with context.Pool(workers, _init_worker, (domain, end, shared)) as pool:
+            results = pool.map(_solve_job, jobs, chunksize=1)
+
+    plans = [r["plan"] for r in results if r["plan"] is not None]
+    best = min(plans, key=lambda p: p[1]) if plans else None
+    solutions = []
+    for stamp, cost, length in sorted(s for r in results for s in r["trace"]):
+        if not solutions or cost < solutions[-1][1]:
+            solutions.append((round(stamp - start, 3), cost, length))
+    return {
+        "solved": best is not None,
+        "plan": best[0] if best else None,
+        "cost": best[1] if best else None,
+        "optimal": all(r["complete"] for r in results),
+        "time": round(time.time() - start, 3),
+        "solutions": solutions,
+        "jobs": len(jobs),
+        "nodes": sum(r["nodes"] for r in results),
+        "pruned": sum(r["pruned"] for r in results),
+        "hits": sum(r["hits"] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problem")
+    parser.add_argument("-t", "--deadline", type=float, default=None, help="límite de tiempo (s)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="procesos del pool")
+    args = parser.parse_args()
+
+    try:
+        result = find_best(parse_domain(args.domain), parse_problem(args.problem), args.deadline, args.workers)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not result["solved"]:
+        print(f"❌ Ningún plan en {result['time']}s")
+        sys.exit(1)
+    print(format_plans({"plans": [(result["plan"], result["cost"])], "time": result["time"]}))
+    print(f"Optimal: {'yes' if result['optimal'] else 'no (deadline)'}")
+    print("Solutions: " + " ".join(f"{cost:g}@{stamp}s({length})" for stamp, cost, length in result["solutions"]))
+    print(f"Jobs: {result['jobs']}  Nodes: {result['nodes']}  Pruned: {result['pruned']}  "
+          f"Memo hits: {result['hits']}")
+
+
+if __name__ == "__main__":
+    main()
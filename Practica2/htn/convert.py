@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Conversión de problemas y planes de emergencias entre PDDL y JSHOP2.
+
+Los problemas de la Practica-1 (problem_sizeN.pddl) y los de la Practica2
+(pN) salen de generadores distintos y con otros nombres; aquí se pasa de un
+formato a otro para resolver la misma instancia con FF, pyperplan, Fast
+Downward, planner.py y htn.py:
+
+    PDDL (Parte-1)                 JSHOP2 (emergencias)
+    deposito                       loc-almacen (cajas y dron)
+    base                           loc-base (solo si el dron empieza ahí)
+    refugioN / personN / boxN      locN / pN / bN
+    dron1, dron1-izq, dron1-der    d1, g1, g2
+    goal (person-has p c)          hecho (necesita p c), tarea (enviar-todo)
+    (move from to d)               (!move d from to)
+    (pick b l g d)                 (!pick d g b l)
+    (leave b l g d p c)            (!leave d g b l p c)
+
+Los nombres que no siguen ninguna regla se quedan igual. El dominio JSHOP2
+tiene las garras g1 y g2 fijas, así que solo se admite un dron.
+
+Los ficheros se recorren en streaming: cada lista sin sublistas (un átomo o
+la lista de :objects) se emite al cerrarse, con la ruta de listas que la
+contienen, sin construir el árbol completo.
+
+Uso:
+    python3 convert.py pddl2jshop problema.pddl [-o pN] [-n pN]
+    python3 convert.py jshop2pddl pN [-o problema.pddl]
+    python3 convert.py plan2pddl plan_pN.txt [-o plan.soln]
+    python3 convert.py plan2jshop problema.pddl.soln [-o plan.txt]
+"""
+
+import argparse
+import re
+import sys
+
+TOKEN_RE = re.compile(r";[^\n]*|\(|\)|[^\s();]+")
+
+# Reglas PDDL -> JSHOP2 (y al revés)
+TO_JSHOP = [
+    (re.compile(r"^deposito$"), "loc-almacen"),
+    (re.compile(r"^base$"), "loc-base"),
+    (re.compile(r"^refugio(\d+)$"), r"loc\1"),
+    (re.compile(r"^person(\d+)$"), r"p\1"),
+    (re.compile(r"^box(\d+)$"), r"b\1"),
+    (re.compile(r"^dron1-izq$"), "g1"),
+    (re.compile(r"^dron1-der$"), "g2"),
+    (re.compile(r"^dron(\d+)$"), r"d\1"),
+]
+TO_PDDL = [
+    (re.compile(r"^loc-almacen$"), "deposito"),
+    (re.compile(r"^loc-base$"), "base"),
+    (re.compile(r"^loc(\d+)$"), r"refugio\1"),
+    (re.compile(r"^p(\d+)$"), r"person\1"),
+    (re.compile(r"^b(\d+)$"), r"box\1"),
+    (re.compile(r"^g1$"), "dron1-izq"),
+    (re.compile(r"^g2$"), "dron1-der"),
+    (re.compile(r"^d(\d+)$"), r"dron\1"),
+]
+
+# Acción PDDL -> (operador JSHOP2, posición PDDL de cada argumento JSHOP2)
+ACTIONS = {
+    "move": ("!move", (2, 0, 1)),
+    "pick": ("!pick", (3, 2, 0, 1)),
+    "leave": ("!leave", (3, 2, 0, 1, 4, 5)),
+}
+OPERATORS = {op: (action, tuple(order.index(i) for i in range(len(order))))
+             for action, (op, order) in ACTIONS.items()}
+
+# Tipo PDDL de cada argumento de los predicados (para :objects)
+PREDICATE_TYPES = {
+    "at-dron": ("dron", "location"),
+    "at-box": ("box", "location"),
+    "at-person": ("person", "location"),
+    "box-has": ("box", "bcontent"),
+    "person-has": ("person", "bcontent"),
+    "necesita": ("person", "bcontent"),
+    "free": ("grip",),
+    "carrying": ("dron", "grip", "box"),
+}
+TYPE_ORDER = ["dron", "location", "box", "bcontent", "person", "grip"]
+
+
+class NameMap:
+    """Nombres de objetos entre PDDL y JSHOP2 según las reglas (y cacheados)."""
+
+    def __init__(self):
+        self.to_jshop = {}
+        self.to_pddl = {}
+
+    @staticmethod
+    def _apply(rules, name):
+        for pattern, replacement in rules:
+            if pattern.match(name):
+                return pattern.sub(replacement, name)
+        return name
+
+    def jshop(self, name):
+        mapped = self.to_jshop.get(name)
+        if mapped is None:
+            mapped = self.to_jshop[name] = self._apply(TO_JSHOP, name)
+            self.to_pddl.setdefault(mapped, name)
+        return mapped
+
+    def pddl(self, name):
+        mapped = self.to_pddl.get(name)
+        if mapped is None:
+            mapped = self.to_pddl[name] = self._apply(TO_PDDL, name)
+            self.to_jshop.setdefault(mapped, name)
+        return mapped
+
+
+# --------------------------------------------------------------------------
+# Lectura en streaming
+# --------------------------------------------------------------------------
+
+def flat_lists(text):
+    """
+    Genera (ruta, tokens) por cada lista sin sublistas, al cerrarse.
+    ruta: por cada lista que la contiene, (posición entre las sublistas de su
+    madre, tokens anteriores a su primera sublista).
+    """
+    path = []
+    counts = [0]
+    current = None
+    for match in TOKEN_RE.finditer(text):
+        tok = match.group()
+        if tok[0] == ";":
+            continue
+        if tok == "(":
+            if current is not None:
+                path.append((counts[-1], tuple(current)))
+                counts.append(0)
+            current = []
+        elif tok == ")":
+            if current is not None:
+                yield tuple(path), current
+                current = None
+            elif path:
+                path.pop()
+                counts.pop()
+            else:
+                raise ValueError("paréntesis de cierre sin apertura")
+            counts[-1] += 1
+        elif current is not None:
+            current.append(tok.lower())
+    if path or current is not None:
+        raise ValueError("paréntesis sin cerrar")
+
+
+def typed_objects(items):
+    """Lista tipada de :objects ("a b - t c - u") como {objeto: tipo}."""
+    objects, pending = {}, []
+    tokens = iter(items)
+    for tok in tokens:
+        if tok == "-":
+            kind = next(tokens, "object")
+            objects.update((obj, kind) for obj in pending)
+            pending = []
+        else:
+            pending.append(tok)
+    objects.update((obj, "object") for obj in pending)
+    return objects
+
+
+# --------------------------------------------------------------------------
+# Problemas
+# --------------------------------------------------------------------------
+
+def pddl_to_jshop(text, name=None, names=None):
+    """
+    Problema PDDL de emergencias (Parte-1) como defproblem de JSHOP2.
+    Returns: (texto, NameMap)
+    """
+    names = names or NameMap()
+    problem_name = None
+    objects = {}
+    facts, needs = [], []
+    for path, tokens in flat_lists(text):
+        sections = [head[0] for _, head in path if head]
+        if tokens[:1] == ["problem"]:
+            problem_name = tokens[1]
+        elif tokens[:1] == [":objects"]:
+            objects.update(typed_objects(tokens[1:]))
+        elif ":init" in sections:
+            facts.append((tokens[0],) + tuple(names.jshop(t) for t in tokens[1:]))
+        elif ":goal" in sections:
+            if tokens[0] != "person-has":
+                raise ValueError(f"objetivo no soportado en JSHOP2: ({' '.join(tokens)})")
+            needs.append(("necesita",) + tuple(names.jshop(t) for t in tokens[1:]))
+    drones = [obj for obj, kind in objects.items() if kind == "dron"]
+    if len(drones) > 1:
+        raise ValueError(f"el dominio JSHOP2 de emergencias admite un solo dron (hay {len(drones)})")
+    # Los nombres de defproblem acaban siendo clases de Java
+    name = re.sub(r"\W", "_", name or problem_name or "problema")
+    lines = [f"(defproblem {name} emergencias", "  ("]
+    lines += ["    (" + " ".join(fact) + ")" for fact in facts + needs]
+    lines += ["  )", "  ((enviar-todo))", ")"]
+    return "\n".join(lines) + "\n", names
+
+
+def _natural(name):
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def jshop_to_pddl(text, name=None, names=None):
+    """
+    defproblem de emergencias como problema PDDL de la Parte-1. Los tipos de
+    los objetos salen de los predicados en los que aparecen.
+    Returns: (texto, NameMap)
+    """
+    names = names or NameMap()
+    problem_name = None
+    objects = {}
+    init, goals = [], []
+    for path, tokens in flat_lists(text):
+        if len(path) != 2 or path[0][1][:1] != ("defproblem",):
+            continue
+        problem_name = path[0][1][1] if len(path[0][1]) > 1 else None
+        if path[1][0] == 1:
+            if tokens != ["enviar-todo"]:
+                raise ValueError(f"tarea no soportada en PDDL: ({' '.join(tokens)})")
+            continue
+        atom = (tokens[0],) + tuple(names.pddl(t) for t in tokens[1:])
+        for obj, kind in zip(atom[1:], PREDICATE_TYPES.get(atom[0], ())):
+            objects.setdefault(obj, kind)
+        if atom[0] == "necesita":
+            goals.append(("person-has",) + atom[1:])
+        else:
+            init.append(atom)
+    by_type = {}
+    for obj, kind in objects.items():
+        by_type.setdefault(kind, []).append(obj)
+    lines = [f"(define (problem {name or problem_name or 'problema'})", "(:domain emergencias)", "(:objects"]
+    lines += [f"\t{' '.join(sorted(by_type[kind], key=_natural))} - {kind}" for kind in TYPE_ORDER if kind in by_type]
+    lines += [")", "", "(:init"]
+    lines += ["\t(" + " ".join(atom) + ")" for atom in init]
+    lines += [")", "", "(:goal (and"]
+    lines += ["\t(" + " ".join(atom) + ")" for atom in goals]
+    lines += ["))", ")"]
+    return "\n".join(lines) + "\n", names
+
+
+# --------------------------------------------------------------------------
+# Planes
+# --------------------------------------------------------------------------
+
+STEP_RE = re.compile(r"^\s*(?:step\s*)?[\d.]+\s*:\s*|\s*\[[\d.]+\]\s*$", re.IGNORECASE)
+
+
+def plan_steps(lines):
+    """
+    Pasos de un plan como tuplas en minúsculas. Acepta "(move a b dron1)",
+    "0.000: (move a b dron1) [1.000]", "step 0: MOVE A B DRON1" y la salida
+    de JSHOP2/htn.py (solo el primer plan).
+    """
+    steps = []
+    for line in lines:
+        line = line.split(";", 1)[0].strip()
+        if line.startswith("-----") and steps:
+            break
+        line = STEP_RE.sub("", line).strip()
+        if line.startswith("(") and line.endswith(")"):
+            line = line[1:-1]
+        elif not line or not line[0].isalpha() or ":" in line or line.endswith("found:"):
+            continue
+        tokens = line.lower().split()
+        if tokens and (tokens[0] in ACTIONS or tokens[0] in OPERATORS):
+            steps.append(tuple(tokens))
+    return steps
+
+
+def step_to_jshop(step, names):
+    op, order = ACTIONS[step[0]]
+    args = step[1:]
+    return "(" + " ".join([op] + [names.jshop(args[i]) for i in order]) + ")"
+
+
+def step_to_pddl(step, names):
+    action, order = OPERATORS[step[0]]
+    args = step[1:]
+    return "(" + " ".join([action] + [names.pddl(args[i]) for i in order]) + ")"
+
+
+def plan_to_pddl(lines, names=None):
+    """Plan de JSHOP2 (!move d from to) como líneas PDDL (move from to d)."""
+    names = names or NameMap()
+    return [step_to_pddl(step, names) for step in plan_steps(lines) if step[0] in OPERATORS]
+
+
+def plan_to_jshop(lines, names=None):
+    """Plan PDDL (move from to d) como líneas de JSHOP2 (!move d from to)."""
+    names = names or NameMap()
+    return [step_to_jshop(step, names) for step in plan_steps(lines) if step[0] in ACTIONS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["pddl2jshop", "jshop2pddl", "plan2pddl", "plan2jshop"])
+    parser.add_argument("input")
+    parser.add_argument("-o", "--output", default=None, help="fichero de salida (por defecto, stdout)")
+    parser.add_argument("-n", "--name", default=None, help="nombre del problema convertido")
+    args = parser.parse_args()
+
+    try:
+        with open(args.input, encoding="utf-8") as f:
+            text = f.read()
+        if args.mode == "pddl2jshop":
+            out, _ = pddl_to_jshop(text, args.name)
+        elif args.mode == "jshop2pddl":
+            out, _ = jshop_to_pddl(text, args.name)
+        elif args.mode == "plan2pddl":
+            out = "".join(step + "\n" for step in plan_to_pddl(text.splitlines()))
+        else:
+            out = "".join(step + "\n" for step in plan_to_jshop(text.splitlines()))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        sys.stdout.write(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Almacenes de hechos para htn.py.
+
+Los métodos de emergencias unen (necesita ?p ?c) (box-has ?b ?c)
+(at-box ?b ?lb) (at-dron ?d ?pos) en cada recursión de enviar-todo y
+repartir-carga. Con una lista por predicado cada átomo recorre todos los
+hechos del predicado y cada borrado busca su posición, así que el tiempo
+crece de forma superlineal con personas y cajas.
+
+    - ListStore: una lista por predicado en orden de inserción (el estado de
+      JSHOP2, tal cual). Se deja como referencia para los benchmarks.
+    - FactStore: además de la lista por predicado, un índice hash por
+      (predicado, posición, valor). Cada hecho es una entrada con un sello
+      creciente; todas las listas están ordenadas por sello, así que recorrer
+      cualquier índice da los hechos en el mismo orden que JSHOP2.
+      Borrar marca la entrada como muerta (O(1) por índice); deshacer el
+      borrado la revive en su sitio. Las listas se compactan cuando la mitad
+      de sus entradas están muertas y cada lista recuerda dónde empieza su
+      primera entrada viva, así que buscar el primer hecho de un predicado
+      no recorre los ya borrados.
+
+Los índices se mantienen con las listas de añadidos y borrados de cada
+operador; deshacer (al volver atrás) sigue el orden inverso.
+"""
+
+from bisect import bisect_left
+
+COMPACT_MIN = 64
+
+
+class ListStore:
+    """Hechos agrupados por predicado, en orden de inserción."""
+
+    def __init__(self, atoms=()):
+        self.facts = {}
+        self.present = set()
+        for atom in atoms:
+            self.add(atom)
+
+    def add(self, atom):
+        if atom in self.present:
+            return False
+        self.present.add(atom)
+        self.facts.setdefault(atom[0], []).append(atom[1:])
+        return True
+
+    def delete(self, atom):
+        """Quita el hecho y devuelve con qué deshacerlo (su posición) o None."""
+        if atom not in self.present:
+            return None
+        self.present.discard(atom)
+        args = self.facts[atom[0]]
+        i = args.index(atom[1:])
+        del args[i]
+        return i
+
+    def undo(self, changes):
+        for kind, atom, token in reversed(changes):
+            if kind == "add":
+                self.present.discard(atom)
+                self.facts[atom[0]].pop()
+            else:
+                self.present.add(atom)
+                self.facts[atom[0]].insert(token, atom[1:])
+
+    def atoms(self):
+        """Hechos actuales (cada predicado en su orden)."""
+        return [(pred,) + args for pred, facts in self.facts.items() for args in facts]
+
+    def frozen(self):
+        return frozenset(self.present)
+
+    def candidates(self, pred, pattern, bindings):
+        """Argumentos de los hechos de pred que pueden unificar con pattern."""
+        return self.facts.get(pred, ())
+
+    def estimate(self, pred, pattern, bindings):
+        """Cota superior de los hechos que unifican (sin índices, el total)."""
+        return len(self.facts.get(pred, ()))
+
+
+class _Entry:
+    __slots__ = ("args", "stamp", "alive")
+
+    def __init__(self, args, stamp):
+        self.args = args
+        self.stamp = stamp
+        self.alive = True
+
+
+class _Bucket:
+    """Entradas ordenadas por sello; start es la primera posible viva."""
+
+    __slots__ = ("entries", "members", "dead", "start")
+
+    def __init__(self):
+        self.entries = []
+        self.members = set()
+        self.dead = 0
+        self.start = 0
+
+    def size(self):
+        return len(self.entries) - self.dead
+
+
+def _stamp(entry):
+    return entry.stamp
+
+
+class FactStore:
+    """Hechos con índices por predicado y por (predicado, posición, valor)."""
+
+    def __init__(self, atoms=()):
+        self.current = {}
+        self.by_pred = {}
+        self.index = {}
+        self.stamp = 0
+        for atom in atoms:
+            self.add(atom)
+
+    def _buckets(self, atom, create=False):
+        pred = atom[0]
+        keys = [(pred, i, v) for i, v in enumerate(atom[1:])]
+        if create:
+            yield self.by_pred.setdefault(pred, _Bucket())
+            for key in keys:
+                bucket = self.index.get(key)
+                if bucket is None:
+                    bucket = self.index[key] = _Bucket()
+                yield bucket
+        else:
+            yield self.by_pred[pred]
+            for key in keys:
+                yield self.index[key]
+
+    def __contains__(self, atom):
+        return atom in self.current
+
+    def add(self, atom):
+        if atom in self.current:
+            return False
+        entry = _Entry(atom[1:], self.stamp)
+        self.stamp += 1
+        for bucket in self._buckets(atom, create=True):
+            bucket.entries.append(entry)
+            bucket.members.add(entry)
+        self.current[atom] = entry
+        return True
+
+    def delete(self, atom):
+        """Marca el hecho como borrado y devuelve su entrada (o None)."""
+        entry = self.current.pop(atom, None)
+        if entry is None:
+            return None
+        entry.alive = False
+        for bucket in self._buckets(atom):
+            bucket.dead += 1
+            if bucket.dead > COMPACT_MIN and 2 * bucket.dead > len(bucket.entries):
+                # Lista nueva: los recorridos en curso siguen con la antigua
+                alive = [e for e in bucket.entries if e.alive]
+                bucket.entries = alive
+                bucket.members = set(alive)
+                bucket.dead = 0
+                bucket.start = 0
+        return entry
+
+    def undo(self, changes):
+        for kind, atom, entry in reversed(changes):
+            if kind == "add":
+                entry = self.current.pop(atom)
+                entry.alive = False
+                for bucket in self._buckets(atom):
+                    bucket.entries.pop()
+                    bucket.members.discard(entry)
+                    if bucket.start > len(bucket.entries):
+                        bucket.start = len(bucket.entries)
+            else:
+                entry.alive = True
+                self.current[atom] = entry
+                for bucket in self._buckets(atom):
+                    i = bisect_left(bucket.entries, entry.stamp, key=_stamp)
+                    if entry in bucket.members:
+                        bucket.dead -= 1
+                    else:
+                        bucket.entries.insert(i, entry)
+                        bucket.members.add(entry)
+                    if i < bucket.start:
+                        bucket.start = i
+
+    def atoms(self):
+        """Hechos actuales en orden de inserción."""
+        return sorted(self.current, key=lambda atom: self.current[atom].stamp)
+
+    def frozen(self):
+        return frozenset(self.current)
+
+    def _best(self, pred, pattern, bindings):
+        """Índice más pequeño entre las posiciones ya instanciadas."""
+        best = self.by_pred.get(pred)
+        if best is None:
+            return None
+        for i, term in enumerate(pattern):
+            if isinstance(term, str) and term[:1] == "?":
+                term = bindings.get(term)
+                if term is None:
+                    continue
+            elif not isinstance(term, (str, float)):
+                continue
+            bucket = self.index.get((pred, i, term))
+            if bucket is None:
+                return None
+            if bucket.size() < best.size():
+                best = bucket
+        return best
+
+    def candidates(self, pred, pattern, bindings):
+        """Argumentos de los hechos vivos del índice más selectivo, en orden."""
+        bucket = self._best(pred, pattern, bindings)
+        if bucket is None:
+            return
+        entries = bucket.entries
+        start = bucket.start
+        while start < len(entries) and not entries[start].alive:
+            start += 1
+        bucket.start = start
+        for i in range(start, len(entries)):
+            entry = entries[i]
+            if entry.alive:
+                yield entry.args
+
+    def estimate(self, pred, pattern, bindings):
+        """Cota superior de los hechos que unifican con pattern."""
+        bucket = self._best(pred, pattern, bindings)
+        return 0 if bucket is None else bucket.size()
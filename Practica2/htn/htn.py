@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Planificador HTN en Python para los dominios JSHOP2 de la práctica.
+
+run_all_problems.py genera código Java con JSHOP2.InternalDomain, lo compila
+con javac y arranca una JVM por problema: para p10 el plan tarda 0.009s y la
+cadena de compilación varios segundos. Este planificador lee directamente
+los ficheros defdomain / defproblem (jshop.py) y reproduce la búsqueda de
+JSHOP2:
+
+    - Descomposición total-order hacia delante: se toma la primera tarea
+      pendiente; si es primitiva (!op) se aplica el operador, si no se
+      prueba cada método con esa cabeza.
+    - Ramas de los métodos como if-then-else: se usa la primera rama cuya
+      precondición se cumple y solo se vuelve atrás sobre sus unificadores,
+      nunca a las ramas siguientes.
+    - Los hechos de cada predicado se recorren en orden de inserción y los
+      añadidos van al final, como el estado de JSHOP2; así los unificadores
+      salen en el mismo orden y el plan es el mismo.
+    - Precondiciones con not, and, or, imply, call y assign; términos call en
+      efectos, costes y tareas. Los números son reales (3 -> 3.0).
+    - El coste del operador es su último campo (1 si no tiene).
+
+El estado es un facts.FactStore con índices por posición de argumento. En
+cada conjunción se adelanta un átomo si el índice dice que, con las
+variables ya ligadas, lo cumple a lo sumo un hecho (y se corta si ninguno):
+así no cambian ni los unificadores ni su orden.
+
+La búsqueda no usa la recursión de Python (ni la pila, como JSHOP2, que
+desborda a partir de p390): la agenda es una lista enlazada de tareas
+pendientes, los cambios aplicados van a un registro (trail) y solo se
+guarda un punto de elección cuando a la tarea le queda otra alternativa
+(se mira una por adelantado). Las descomposiciones deterministas, como
+enviar-todo -> preparar-viaje -> enviar-todo, sustituyen la tarea en la
+agenda sin apilar nada, así que la memoria crece con las tareas pendientes
+y los cambios del plan, no con la profundidad de la recursión.
+
+Uso:
+    python3 htn.py dominio problema [-n N]     # N planes (0 = todos)
+    python3 htn.py --store list dominio problema   # sin índices
+    python3 htn.py -t 60 dominio problema          # límite de tiempo
+    python3 htn.py --table dominio problema        # tablar subtareas (table.py)
+
+La salida tiene el mismo formato que la de JSHOP2 (Plan cost, Time Used).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from facts import FactStore, ListStore
+from jshop import Call, atom_to_str, parse_domain, parse_problem
+from table import Table
+
+CONNECTIVES = {"not", "and", "or", "imply", "call", "assign"}
+
+
+# --------------------------------------------------------------------------
+# Términos y unificación
+# --------------------------------------------------------------------------
+
+def _is_var(term):
+    return isinstance(term, str) and term[:1] == "?"
+
+
+def _num(x):
+    if not isinstance(x, float):
+        raise ValueError(f"se esperaba un número: {x}")
+    return x
+
+
+def _compare(op):
+    return lambda a, b: True if op(_num(a), _num(b)) else None
+
+
+FUNCTIONS = {
+    "+": lambda *xs: sum(_num(x) for x in xs),
+    "-": lambda a, *xs: -_num(a) if not xs else _num(a) - sum(_num(x) for x in xs),
+    "*": lambda *xs: _product(xs),
+    "/": lambda a, b: _num(a) / _num(b),
+    "<": _compare(lambda a, b: a < b),
+    "<=": _compare(lambda a, b: a <= b),
+    ">": _compare(lambda a, b: a > b),
+    ">=": _compare(lambda a, b: a >= b),
+    "=": lambda a, b: True if a == b else None,
+    "!=": lambda a, b: True if a != b else None,
+}
+
+
+def _product(xs):
+    result = 1.0
+    for x in xs:
+        result *= _num(x)
+    return result
+
+
+def ground(term, bindings):
+    """Sustituye variables y evalúa las llamadas (call)."""
+    if isinstance(term, str):
+        return bindings.get(term, term) if term[:1] == "?" else term
+    if isinstance(term, Call):
+        fn = FUNCTIONS.get(term.fn)
+        if fn is None:
+            raise ValueError(f"función desconocida: {term.fn}")
+        return fn(*(ground(a, bindings) for a in term.args))
+    if isinstance(term, tuple):
+        return tuple(ground(t, bindings) for t in term)
+    return term
+
+
+def ground_atom(atom, bindings):
+    return (atom[0],) + tuple(ground(t, bindings) for t in atom[1:])
+
+
+def unify(pattern, values, bindings):
+    """Extiende bindings para que pattern coincida con values (o None)."""
+    extended = bindings
+    for p, v in zip(pattern, values):
+        if _is_var(p):
+            bound = extended.get(p, p)
+            if bound is p:
+                if extended is bindings:
+                    extended = dict(bindings)
+                extended[p] = v
+            elif bound != v:
+                return None
+        elif isinstance(p, Call):
+            if ground(p, extended) != v:
+                return None
+        elif p != v:
+            return None
+    return extended
+
+
+# --------------------------------------------------------------------------
+# Precondiciones
+# --------------------------------------------------------------------------
+
+def _is_atom(cond):
+    return cond[0] not in CONNECTIVES or (cond[0] == "call" and not isinstance(cond[1], Call))
+
+
+def _reorder(conds, i, bindings, state):
+    """
+    Adelanta al puesto i un átomo de conds[i:] que a lo sumo cumple un hecho.
+    Returns: conds (quizá reordenada) o None si algún átomo no tiene hechos.
+    """
+    for j in range(i, len(conds)):
+        cond = conds[j]
+        if not _is_atom(cond):
+            continue
+        n = state.estimate(cond[0], cond[1:], bindings)
+        if n == 0:
+            return None
+        if n == 1 and j > i:
+            return conds[:i] + [cond] + conds[i:j] + conds[j + 1:]
+    return conds
+
+
+def satisfiers(conds, bindings, state, i=0):
+    """Unificadores de la conjunción conds[i:], en el orden de JSHOP2."""
+    if i == len(conds):
+        yield bindings
+        return
+    if len(conds) - i > 1:
+        conds = _reorder(conds, i, bindings, state)
+        if conds is None:
+            return
+    cond = conds[i]
+    kind = cond[0]
+    if not _is_atom(cond):
+        if kind == "not":
+            if next(satisfiers(cond[1], bindings, state), None) is None:
+                yield from satisfiers(conds, bindings, state, i + 1)
+        elif kind == "and":
+            for b in satisfiers(cond[1], bindings, state):
+                yield from satisfiers(conds, b, state, i + 1)
+        elif kind == "or":
+            for alternative in cond[1]:
+                for b in satisfiers(alternative, bindings, state):
+                    yield from satisfiers(conds, b, state, i + 1)
+        elif kind == "imply":
+            if (next(satisfiers(cond[1], bindings, state), None) is None
+                    or next(satisfiers(cond[2], bindings, state), None) is not None):
+                yield from satisfiers(conds, bindings, state, i + 1)
+        elif kind == "call":
+            if ground(cond[1], bindings) is not None:
+                yield from satisfiers(conds, bindings, state, i + 1)
+        else:
+            b = unify((cond[1],), (ground(cond[2], bindings),), bindings)
+            if b is not None:
+                yield from satisfiers(conds, b, state, i + 1)
+        return
+    pattern = cond[1:]
+    for args in state.candidates(kind, pattern, bindings):
+        if len(args) != len(pattern):
+            continue
+        b = unify(pattern, args, bindings)
+        if b is not None:
+            yield from satisfiers(conds, b, state, i + 1)
+
+
+def first_satisfiers(conds, first, bindings, state):
+    gen = satisfiers(conds, bindings, state)
+    if first:
+        b = next(gen, None)
+        return iter(()) if b is None else iter((b,))
+    return gen
+
+
+# --------------------------------------------------------------------------
+# Búsqueda
+# --------------------------------------------------------------------------
+
+class Planner:
+    """Descompone la red de tareas de un problema con los métodos del dominio."""
+
+    def __init__(self, domain, store=FactStore, table=None):
+        self.domain = domain
+        self.store = store
+        self.table = table
+
+    def apply(self, op, bindings, state):
+        """Aplica el operador (borrados y después añadidos). Returns: cambios."""
+        changes = []
+        for atom in op.delete:
+            atom = ground_atom(atom, bindings)
+            token = state.delete(atom)
+            if token is not None:
+                changes.append(("del", atom, token))
+        for atom in op.add:
+            atom = ground_atom(atom, bindings)
+            if state.add(atom):
+                changes.append(("add", atom, None))
+        return changes
+
+    def take(self, op, bindings, state):
+        """Aplica una alternativa de operador. Returns: (cambios, paso, coste)."""
+        step_cost = ground(op.cost, bindings)
+        changes = self.apply(op, bindings, state)
+        return changes, atom_to_str(ground_atom(op.head, bindings)), step_cost
+
+    def prune(self, agenda, state, cost):
+        """Si se abandona el nodo antes de expandirlo (nunca, en JSHOP2)."""
+        return False
+
+    def plans(self, problem, deadline=None):
+        """
+        Genera (plan, coste) en el orden en que los encuentra JSHOP2.
+        deadline (segundos) corta la búsqueda con TimeoutError.
+        """
+        return self.search(make_agenda(problem.tasks), self.store(problem.state), deadline)
+
+    def search(self, agenda, state, deadline=None, plan=(), cost=0.0):
+        """Planes que completan plan (de coste cost) descomponiendo agenda."""
+        start = time.time()
+        table = self.table
+        plan = list(plan)
+        taken = [None] * len(plan)
+        trail = []
+        choices = []
+        frames = []
+        steps = 0
+        while True:
+            option = None
+            if agenda is None:
+                yield list(plan), cost
+            elif not self.prune(agenda, state, cost):
+                if table is not None and not agenda[0][0].startswith("!"):
+                    # Subtarea tablada: se repite o se abre un marco para guardarla
+                    key = table.key(ground_atom(agenda[0], {}), state)
+                    if key is not None:
+                        replay = table.lookup(key)
+                        if replay is not None:
+                            option = (_REPLAY, replay, agenda[1])
+                        else:
+                            frames.append((agenda[1], key, len(plan), len(choices)))
+                if option is None:
+                    options = self._options(agenda, state)
+                    option = next(options, None)
+                    if option is not None:
+                        following = next(options, None)
+                        if following is not None:
+                            choices.append([following, options, cost, len(plan), len(trail)])
+            if option is None:
+                # Vuelta atrás al último punto de elección
+                if not choices:
+                    return
+                while frames and frames[-1][3] >= len(choices):
+                    frames.pop()
+                choice = choices[-1]
+                option, options, cost, length, mark = choice
+                state.undo(trail[mark:])
+                del trail[mark:]
+                del plan[length:]
+                del taken[length:]
+                following = next(options, None)
+                if following is None:
+                    choices.pop()
+                else:
+                    choice[0] = following
+            op, bindings, agenda = option
+            if op is _REPLAY:
+                for op, bindings in bindings:
+                    changes, step, step_cost = self.take(op, bindings, state)
+                    trail.extend(changes)
+                    plan.append(step)
+                    taken.append((op, bindings))
+                    cost += step_cost
+            elif op is not None:
+                changes, step, step_cost = self.take(op, bindings, state)
+                trail.extend(changes)
+                plan.append(step)
+                cost += step_cost
+                if table is not None:
+                    taken.append((op, bindings))
+            while frames and frames[-1][0] is agenda:
+                # Subtarea terminada; se guarda si no dejó alternativas dentro
+                _, key, length, depth = frames.pop()
+                if len(choices) == depth:
+                    table.store(key, taken[length:])
+            steps += 1
+            if deadline is not None and steps % 1024 == 0 and time.time() - start > deadline:
+                raise TimeoutError
+
+    def _options(self, agenda, state):
+        """
+        Alternativas para la primera tarea de agenda, en el orden de JSHOP2:
+        (operador, unificador, agenda siguiente) o (None, None, agenda con
+        las subtareas del método delante).
+        """
+        task, rest = agenda
+        task = ground_atom(task, {})
+        if task[0].startswith("!"):
+            for op in self.domain.operators.get(task[0], ()):
+                if len(op.head) != len(task):
+                    continue
+                b = unify(op.head[1:], task[1:], {})
+                if b is None:
+                    continue
+                for b in first_satisfiers(op.pre, op.first, b, state):
+                    yield op, b, rest
+            return
+        methods = self.domain.methods.get(task[0])
+        if methods is None:
+            raise ValueError(f"no hay método ni operador para {task[0]}")
+        for method in methods:
+            if len(method.head) != len(task):
+                continue
+            b = unify(method.head[1:], task[1:], {})
+            if b is None:
+                continue
+            for _, pre, first, subtasks in method.branches:
+                options = first_satisfiers(pre, first, b, state)
+                chosen = next(options, None)
+                if chosen is None:
+                    continue
+                for option in _chain(chosen, options):
+                    new = rest
+                    for sub in reversed(subtasks):
+                        new = (ground_atom(sub, option), new)
+                    yield None, None, new
+                break
+
+
+def make_agenda(tasks):
+    """Lista enlazada (tarea, resto) con tasks en orden."""
+    agenda = None
+    for task in reversed(tasks):
+        agenda = (task, agenda)
+    return agenda
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+_REPLAY = object()
+
+STORES = {"index": FactStore, "list": ListStore}
+
+
+def find_plans(domain, problem, limit=1, store="index", timeout=None, table=False):
+    """
+    Busca hasta limit planes (0 = todos) en como mucho timeout segundos.
+    Con table se tablan las descomposiciones de las subtareas (table.py).
+    Returns: {plans [(plan, coste)], time, timeout, table (estadísticas o None)}
+    """
+    start = time.time()
+    found = []
+    timed_out = False
+    planner = Planner(domain, STORES[store], Table(domain) if table else None)
+    try:
+        for plan, cost in planner.plans(problem, timeout):
+            found.append((plan, cost))
+            if limit and len(found) >= limit:
+                break
+    except TimeoutError:
+        timed_out = True
+    return {"plans": found, "time": round(time.time() - start, 3), "timeout": timed_out,
+            "table": planner.table.stats() if table else None}
+
+
+def format_plans(result):
+    """Texto con el formato de salida de JSHOP2."""
+    lines = ["", f"{len(result['plans'])} plan(s) were found:", ""]
+    for i, (plan, cost) in enumerate(result["plans"], 1):
+        lines += [f"Plan #{i}:", f"Plan cost: {cost!r}", ""]
+        lines += plan
+        lines += ["--------------------", ""]
+    lines += [f"Time Used = {result['time']}", ""]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("domain")
+    parser.add_argument("problem")
+    parser.add_argument("-n", "--plans", type=int, default=1, help="número de planes (0 = todos)")
+    parser.add_argument("--store", default="index", choices=sorted(STORES), help="almacén de hechos")
+    parser.add_argument("-t", "--timeout", type=float, default=None, help="límite de tiempo (s)")
+    parser.add_argument("--table", action="store_true", help="tablar las descomposiciones de subtareas")
+    args = parser.parse_args()
+
+    try:
+        domain = parse_domain(args.domain)
+        problem = parse_problem(args.problem)
+        result = find_plans(domain, problem, args.plans, args.store, args.timeout, args.table)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    except MemoryError:
+        print("❌ Memoria agotada")
+        sys.exit(1)
+    if result["timeout"] and not result["plans"]:
+        print(f"❌ Tiempo agotado ({result['time']}s)")
+        sys.exit(1)
+    print(format_plans(result))
+    if result["table"]:
+        print("Tabla: " + "  ".join(f"{k}={v}" for k, v in result["table"].items()))
+
+
+if __name__ == "__main__":
+    main()
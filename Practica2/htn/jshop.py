@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Lector de ficheros JSHOP2 (defdomain / defproblem).
+
+Convierte el texto en estructuras de Python que usa htn.py, sin generar ni
+compilar código Java:
+
+    - Átomos y tareas: tuplas (nombre, término, ...).
+    - Términos: variables ("?x"), constantes (str), números (float, como los
+      TermNumber de JSHOP2) y expresiones Call(función, argumentos).
+    - Precondiciones: lista de condiciones; cada condición es un átomo o una
+      tupla ("not", conds), ("and", conds), ("or", [conds, ...]),
+      ("imply", conds, conds), ("call", Call), ("assign", var, término).
+      Un ":first" al principio se guarda aparte (solo el primer unificador).
+    - Listas de tareas: lista de tareas en orden (":ordered" se aplana);
+      ":unordered" no está soportado.
+
+Se aceptan operadores (:operator cabeza pre del add [coste]) y métodos
+(:method cabeza [nombre] pre tareas [nombre] pre tareas ...).
+"""
+
+import re
+
+TOKEN_RE = re.compile(r"\(|\)|[^\s()]+")
+NUMBER_RE = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+
+class Call:
+    """Expresión (call f a1 a2 ...) sin evaluar."""
+
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = tuple(args)
+
+    def __repr__(self):
+        return "(call " + " ".join([self.fn] + [term_to_str(a) for a in self.args]) + ")"
+
+
+class Operator:
+    __slots__ = ("head", "pre", "first", "delete", "add", "cost")
+
+    def __init__(self, head, pre, first, delete, add, cost):
+        self.head = head
+        self.pre = pre
+        self.first = first
+        self.delete = delete
+        self.add = add
+        self.cost = cost
+
+
+class Method:
+    """Método con sus ramas (nombre, precondición, :first, tareas) en orden."""
+
+    __slots__ = ("head", "branches")
+
+    def __init__(self, head, branches):
+        self.head = head
+        self.branches = branches
+
+
+class Domain:
+    def __init__(self, name, operators, methods):
+        self.name = name
+        self.operators = {}
+        for op in operators:
+            self.operators.setdefault(op.head[0], []).append(op)
+        self.methods = {}
+        for m in methods:
+            self.methods.setdefault(m.head[0], []).append(m)
+
+
+class Problem:
+    def __init__(self, name, domain, state, tasks):
+        self.name = name
+        self.domain = domain
+        self.state = state
+        self.tasks = tasks
+
+
+def tokenize(text):
+    """Tokens del fichero, sin comentarios (;)."""
+    return TOKEN_RE.findall(re.sub(r";[^\n]*", "", text))
+
+
+def parse_sexpr(tokens):
+    """Lista de expresiones de primer nivel (listas anidadas)."""
+    stack = [[]]
+    for tok in tokens:
+        if tok == "(":
+            stack.append([])
+        elif tok == ")":
+            if len(stack) == 1:
+                raise ValueError("Paréntesis de cierre sin apertura")
+            expr = stack.pop()
+            stack[-1].append(expr)
+        else:
+            stack[-1].append(tok)
+    if len(stack) != 1:
+        raise ValueError("Paréntesis sin cerrar")
+    return stack[0]
+
+
+def read_sexpr(path):
+    with open(path) as f:
+        exprs = parse_sexpr(tokenize(f.read()))
+    if len(exprs) != 1:
+        raise ValueError(f"{path}: se esperaba una única expresión")
+    return exprs[0]
+
+
+def parse_term(expr):
+    if isinstance(expr, list):
+        if expr and expr[0] == "call":
+            return Call(expr[1], [parse_term(a) for a in expr[2:]])
+        if not expr or expr == ["nil"]:
+            return ()
+        # Listas como término (poco habituales): se guardan como tupla
+        return tuple(parse_term(a) for a in expr)
+    if NUMBER_RE.match(expr):
+        return float(expr)
+    return expr
+
+
+def parse_atom(expr):
+    if not isinstance(expr, list) or not expr or isinstance(expr[0], list):
+        raise ValueError(f"átomo no válido: {expr}")
+    return (expr[0],) + tuple(parse_term(a) for a in expr[1:])
+
+
+def _is_nil(expr):
+    return expr == "nil" or expr == []
+
+
+def parse_condition(expr):
+    head = expr[0] if expr else None
+    if head == "not":
+        return ("not", parse_conditions(expr[1:]))
+    if head == "and":
+        return ("and", parse_conditions(expr[1:]))
+    if head == "or":
+        return ("or", [[parse_condition(e)] for e in expr[1:]])
+    if head == "imply":
+        return ("imply", [parse_condition(expr[1])], [parse_condition(expr[2])])
+    if head == "call":
+        return ("call", parse_term(expr))
+    if head == "assign":
+        return ("assign", expr[1], parse_term(expr[2]))
+    if head == "forall":
+        raise ValueError("forall no está soportado en las precondiciones")
+    return parse_atom(expr)
+
+
+def parse_conditions(exprs):
+    return [parse_condition(e) for e in exprs]
+
+
+def parse_precondition(expr):
+    """Returns: (condiciones, solo_primero)"""
+    if _is_nil(expr):
+        return [], False
+    first = False
+    if expr and expr[0] == ":first":
+        first = True
+        expr = expr[1:]
+    elif expr and expr[0] == ":sort-by":
+        raise ValueError(":sort-by no está soportado")
+    return parse_conditions(expr), first
+
+
+def parse_tasks(expr):
+    """Lista de tareas en orden."""
+    if _is_nil(expr):
+        return []
+    if expr[0] == ":unordered":
+        raise ValueError(":unordered no está soportado")
+    if expr[0] == ":ordered":
+        expr = expr[1:]
+    elif isinstance(expr[0], str):
+        # Una sola tarea sin la lista exterior
+        expr = [expr]
+    tasks = []
+    for task in expr:
+        if task and task[0] in (":ordered", ":unordered"):
+            tasks.extend(parse_tasks(task))
+        elif task and task[0] == ":immediate":
+            tasks.append(parse_atom(task[1:]))
+        else:
+            tasks.append(parse_atom(task))
+    return tasks
+
+
+def parse_operator(expr):
+    if len(expr) not in (5, 6):
+        raise ValueError(f"operador mal formado: {expr[1]}")
+    pre, first = parse_precondition(expr[2])
+    delete = [] if _is_nil(expr[3]) else [parse_atom(a) for a in expr[3]]
+    add = [] if _is_nil(expr[4]) else [parse_atom(a) for a in expr[4]]
+    cost = parse_term(expr[5]) if len(expr) == 6 else 1.0
+    return Operator(parse_atom(expr[1]), pre, first, delete, add, cost)
+
+
+def parse_method(expr):
+    head = parse_atom(expr[1])
+    rest = expr[2:]
+    branches = []
+    i = 0
+    while i < len(rest):
+        name = None
+        if isinstance(rest[i], str) and rest[i] != "nil":
+            name = rest[i]
+            i += 1
+        if i + 1 >= len(rest):
+            raise ValueError(f"método {head[0]}: rama sin precondición o tareas")
+        pre, first = parse_precondition(rest[i])
+        tasks = parse_tasks(rest[i + 1])
+        branches.append((name or f"{head[0]}_{len(branches)}", pre, first, tasks))
+        i += 2
+    return Method(head, branches)
+
+
+def parse_domain(path):
+    expr = read_sexpr(path)
+    if expr[0] != "defdomain":
+        raise ValueError(f"{path}: no es un defdomain")
+    items = expr[2] if len(expr) == 3 else expr[2:]
+    operators, methods = [], []
+    for item in items:
+        if item[0] == ":operator":
+            operators.append(parse_operator(item))
+        elif item[0] == ":method":
+            methods.append(parse_method(item))
+        elif item[0] == ":-":
+            raise ValueError("los axiomas (:-) no están soportados")
+        else:
+            raise ValueError(f"elemento desconocido en el dominio: {item[0]}")
+    return Domain(expr[1], operators, methods)
+
+
+def parse_problem(path):
+    expr = read_sexpr(path)
+    if expr[0] != "defproblem":
+        raise ValueError(f"{path}: no es un defproblem")
+    state = [] if _is_nil(expr[3]) else [parse_atom(a) for a in expr[3]]
+    return Problem(expr[1], expr[2], state, parse_tasks(expr[4]))
+
+
+def term_to_str(term):
+    """Como JSHOP2: los números siempre con decimales (3 -> 3.0)."""
+    if isinstance(term, float):
+        return repr(term)
+    if isinstance(term, tuple):
+        return "(" + " ".join(term_to_str(t) for t in term) + ")"
+    return str(term)
+
+
+def atom_to_str(atom):
+    return "(" + " ".join([atom[0]] + [term_to_str(t) for t in atom[1:]]) + ")"
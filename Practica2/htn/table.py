@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tabla de descomposiciones de subtareas para htn.py.
+
+Subtareas como (navegar ?d ?from ?to) o (cargar-tipo ?dron ?tipo ?nec) se
+descomponen una y otra vez con los mismos argumentos. Su descomposición
+solo depende de la tarea y de los hechos que leen sus métodos y operadores,
+así que se guarda y se repite:
+
+    - Lecturas (análisis estático del dominio, punto fijo): para cada tarea,
+      los patrones (predicado, argumentos) de las precondiciones (también
+      dentro de not/or/imply) y de las listas de borrado de todo lo que puede
+      llegar a descomponer. Cada argumento es una posición de la cabeza de
+      la tarea, una constante o None (cualquier valor, p. ej. una variable
+      local de un método).
+    - Clave: la tarea y, por cada patrón, los hechos que casan con él en el
+      orden del almacén (el orden decide los unificadores de JSHOP2). Si
+      algún patrón casa con más de SLICE_MAX hechos la tarea no se tabla
+      (p. ej. (necesita ?p ?c) en emergencias crece con el problema).
+    - Invalidación: la clave es el propio contenido de los hechos leídos,
+      así que los efectos de un operador sobre esos hechos dan otra clave y
+      la entrada vieja no vuelve a casar; nunca hace falta borrarla.
+    - Valor: los operadores (con sus unificadores) de la primera
+      descomposición completa. Solo se guarda si al terminar la subtarea no
+      queda ningún punto de elección dentro de ella: así, repetirla sin
+      volver a descomponer da exactamente los mismos planes que JSHOP2.
+    - Calcular la clave cuesta casi tanto como descomponer una tarea pequeña:
+      tras ADAPT_MIN intentos, las tareas que aciertan menos de ADAPT_RATE
+      de las veces (o no se pueden tablar) dejan de intentarse.
+
+Planner.search usa la tabla cuando se le pasa (htn.py --table).
+"""
+
+from jshop import Call
+
+SLICE_MAX = 32
+TABLE_MAX = 200000
+ADAPT_MIN = 64
+ADAPT_RATE = 0.25
+
+
+def _is_var(term):
+    return isinstance(term, str) and term[:1] == "?"
+
+
+def _atoms(conds):
+    """Átomos que leen las condiciones (recorre not, and, or e imply)."""
+    for cond in conds:
+        kind = cond[0]
+        if kind in ("not", "and"):
+            yield from _atoms(cond[1])
+        elif kind == "or":
+            for alternative in cond[1]:
+                yield from _atoms(alternative)
+        elif kind == "imply":
+            yield from _atoms(cond[1])
+            yield from _atoms(cond[2])
+        elif kind == "assign" or (kind == "call" and isinstance(cond[1], Call)):
+            continue
+        else:
+            yield cond
+
+
+def _spec(term, head):
+    """Posición de la cabeza, constante o None (desconocido)."""
+    if _is_var(term):
+        return head.get(term)
+    if isinstance(term, (str, float)):
+        return ("const", term)
+    return None
+
+
+def read_patterns(domain):
+    """
+    Patrones que lee cada tarea, en términos de las posiciones de su cabeza.
+    Returns: {nombre: set((predicado, (spec, ...)))}
+    """
+    reads = {name: set() for name in list(domain.operators) + list(domain.methods)}
+
+    def own(head, atoms):
+        index = {term: i for i, term in enumerate(head[1:]) if _is_var(term)}
+        return index, {(atom[0], tuple(_spec(t, index) for t in atom[1:])) for atom in atoms}
+
+    for name, ops in domain.operators.items():
+        for op in ops:
+            _, patterns = own(op.head, list(_atoms(op.pre)) + list(op.delete))
+            reads[name] |= patterns
+
+    changed = True
+    while changed:
+        changed = False
+        for name, methods in domain.methods.items():
+            for method in methods:
+                patterns = set()
+                for _, pre, _, subtasks in method.branches:
+                    index, local = own(method.head, _atoms(pre))
+                    patterns |= local
+                    for sub in subtasks:
+                        args = [_spec(t, index) for t in sub[1:]]
+                        for pred, spec in reads.get(sub[0], ()):
+                            patterns.add((pred, tuple(_substitute(s, args) for s in spec)))
+                if not patterns <= reads[name]:
+                    reads[name] |= patterns
+                    changed = True
+    return reads
+
+
+def _substitute(spec, args):
+    if isinstance(spec, int):
+        return args[spec] if spec < len(args) else None
+    return spec
+
+
+class Table:
+    """Descomposiciones guardadas y sus estadísticas (aciertos, fallos...)."""
+
+    def __init__(self, domain):
+        # Primero los patrones con menos argumentos conocidos: son los que
+        # suelen superar SLICE_MAX y descartan la tarea antes
+        self.reads = {name: sorted(patterns, key=lambda p: (sum(s is not None for s in p[1]), repr(p)))
+                      for name, patterns in read_patterns(domain).items()}
+        self.entries = {}
+        self.tries = {}
+        self.disabled = set()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.stored = 0
+        self.replayed = 0
+
+    def key(self, task, state):
+        """Clave de task en el estado actual o None si no se tabla."""
+        name = task[0]
+        if name in self.disabled:
+            return None
+        tries, hits = self.tries.get(name, (0, 0))
+        if tries >= ADAPT_MIN and hits < ADAPT_RATE * tries:
+            self.disabled.add(name)
+            return None
+        self.tries[name] = (tries + 1, hits)
+        slices = []
+        for pred, spec in self.reads.get(name, ()):
+            pattern = []
+            for s in spec:
+                if s is None:
+                    pattern.append("?")
+                elif isinstance(s, int):
+                    pattern.append(task[1 + s] if s + 1 < len(task) else "?")
+                else:
+                    pattern.append(s[1])
+            if state.estimate(pred, pattern, {}) > SLICE_MAX:
+                self.skipped += 1
+                return None
+            slices.append(tuple(args for args in state.candidates(pred, pattern, {})
+                                if all(p == "?" or p == a for p, a in zip(pattern, args))))
+        return task, tuple(slices)
+
+    def lookup(self, key):
+        steps = self.entries.get(key)
+        if steps is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.replayed += len(steps)
+            tries, hits = self.tries[key[0][0]]
+            self.tries[key[0][0]] = (tries, hits + 1)
+        return steps
+
+    def store(self, key, steps):
+        if len(self.entries) >= TABLE_MAX:
+            self.entries.clear()
+        self.entries[key] = steps
+        self.stored += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "skipped": self.skipped,
+                "stored": self.stored, "replayed": self.replayed, "entries": len(self.entries),
+                "disabled": sorted(self.disabled)}